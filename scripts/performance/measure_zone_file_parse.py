@@ -0,0 +1,93 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+"""
+Measure how long parsing generated DNS zone files takes.
+
+To compare with another version of the parser, extract it and pass it with --compare-to:
+
+    git show <revision>:src/command_modules/azure-cli-network/azure/cli/command_modules/network/zone_file/parse_zone_file.py > old_parser.py
+    python scripts/performance/measure_zone_file_parse.py --compare-to old_parser.py
+"""
+
+from __future__ import print_function
+
+import argparse
+import timeit
+
+from azure.cli.command_modules.network.zone_file.parse_zone_file import parse_zone_file
+
+ZONE_NAME = 'example.com'
+
+
+def generate_zone(num_lines):
+    lines = [
+        '$ORIGIN {}.'.format(ZONE_NAME),
+        '$TTL 1h',
+        '@ IN SOA ns1.{0}. hostmaster.{0}. ('.format(ZONE_NAME),
+        '        2018010101 ; serial',
+        '        12h ; refresh',
+        '        15m ; retry',
+        '        3w ; expire',
+        '        3h ) ; minimum',
+        '@ 172800 IN NS ns1.{}.'.format(ZONE_NAME),
+        '  172800 IN NS ns2.{}.'.format(ZONE_NAME)
+    ]
+    templates = [
+        'a{0} 300 IN A 10.{1}.{2}.{3}',
+        '     300 IN A 10.{3}.{2}.{1} ; second record of the set',
+        'aaaa{0} IN AAAA 2001:db8::{1:x}:{2:x}',
+        'cname{0} 3600 IN CNAME a{0}',
+        'mx{0} IN MX 10 mail{0}.{4}.',
+        'txt{0} 600 IN TXT "v=spf1 include:spf{0}.{4} -all" "second string"',
+        '_sip._tcp.srv{0} IN SRV 10 20 5060 sip{0}',
+        'caa{0} IN CAA 0 issue "ca{0}.{4}"',
+        'ptr{0} IN PTR host{0}.{4}.',
+        'long{0} IN TXT ( "{5}"',
+        '                 "{5}" )'
+    ]
+    long_text = 'x' * 200
+    i = 0
+    while len(lines) < num_lines:
+        for template in templates:
+            lines.append(template.format(i, i % 250, (i // 250) % 250, (i // 62500) % 250, ZONE_NAME, long_text))
+        i += 1
+    return '\n'.join(lines) + '\n'
+
+
+def measure(parse, text, runs):
+    times = []
+    for _ in range(runs):
+        start = timeit.default_timer()
+        parse(text, ZONE_NAME)
+        times.append(timeit.default_timer() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the DNS zone file parser.')
+    parser.add_argument('--lines', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='The number of lines of the generated zone files.')
+    parser.add_argument('--runs', type=int, default=3, help='The number of runs, of which the fastest is reported.')
+    parser.add_argument('--compare-to', help='The path of another parse_zone_file.py to measure.')
+    args = parser.parse_args()
+
+    parsers = [('current', parse_zone_file)]
+    if args.compare_to:
+        namespace = {}
+        with open(args.compare_to) as f:
+            exec(compile(f.read(), args.compare_to, 'exec'), namespace)  # pylint: disable=exec-used
+        parsers.append((args.compare_to, namespace['parse_zone_file']))
+
+    print('{:<40} {:>10} {:>12} {:>14}'.format('Parser', 'Lines', 'Seconds', 'Lines/second'))
+    for num_lines in args.lines:
+        text = generate_zone(num_lines)
+        for name, parse in parsers:
+            seconds = measure(parse, text, args.runs)
+            print('{:<40} {:>10} {:>12.3f} {:>14.0f}'.format(name, num_lines, seconds, num_lines / seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -31,12 +31,15 @@ EVENT_FAILED_EXTENSION_LOAD = 'MainLoader.OnFailedExtensionLoad'
 class AzCli(CLI):
 
     def __init__(self, **kwargs):
+        from azure.cli.core._output import AzOutputProducer
+        kwargs.setdefault('output_cls', AzOutputProducer)
         super(AzCli, self).__init__(**kwargs)
 
         from azure.cli.core.commands.arm import add_id_parameters, register_global_subscription_parameter
         from azure.cli.core.cloud import get_active_cloud
         from azure.cli.core.extensions import register_extensions
-        from azure.cli.core._session import ACCOUNT, CONFIG, SESSION
+        from azure.cli.core._session import ACCOUNT, CONFIG, SESSION, INDEX
+        from azure.cli.core import profiler
 
         import knack.events as events
         from knack.util import ensure_dir
@@ -49,13 +52,17 @@ class AzCli(CLI):
 
         azure_folder = self.config.config_dir
         ensure_dir(azure_folder)
-        ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
-        CONFIG.load(os.path.join(azure_folder, 'az.json'))
-        SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
-        self.cloud = get_active_cloud(self)
+        with profiler.phase('load sessions'):
+            ACCOUNT.load(os.path.join(azure_folder, 'azureProfile.json'))
+            CONFIG.load(os.path.join(azure_folder, 'az.json'))
+            SESSION.load(os.path.join(azure_folder, 'az.sess'), max_age=3600)
+            INDEX.load(os.path.join(azure_folder, 'commandIndex.json'))
+        with profiler.phase('resolve cloud'):
+            self.cloud = get_active_cloud(self)
         logger.debug('Current cloud config:\n%s', str(self.cloud.name))
 
-        register_extensions(self)
+        with profiler.phase('register core extensions'):
+            register_extensions(self)
         self.register_event(events.EVENT_INVOKER_POST_CMD_TBL_CREATE, add_id_parameters)
         register_global_subscription_parameter(self)
 
@@ -104,7 +111,13 @@ class MainCommandsLoader(CLICommandsLoader):
                 loader.command_table = self.command_table
                 loader._update_command_definitions()  # pylint: disable=protected-access
 
-    def load_command_table(self, args):
+    def _reset_command_tables(self):
+        self.command_table = {}
+        self.command_group_table = {}
+        self.cmd_to_loader_map = {}
+        self.loaders = []
+
+    def load_command_table(self, args):  # pylint: disable=too-many-statements
         from importlib import import_module
         import pkgutil
         import traceback
@@ -112,26 +125,30 @@ class MainCommandsLoader(CLICommandsLoader):
             _load_module_command_loader, _load_extension_command_loader, BLACKLISTED_MODS, ExtensionCommandSource)
         from azure.cli.core.extension import (
             get_extensions, get_extension_path, get_extension_modname)
+        from azure.cli.core import profiler
 
-        def _update_command_table_from_modules(args):
-            '''Loads command table(s)
-            When `module_name` is specified, only commands from that module will be loaded.
-            If the module is not found, all commands are loaded.
-            '''
+        def _get_installed_command_modules():
             installed_command_modules = []
             try:
                 mods_ns_pkg = import_module('azure.cli.command_modules')
-                installed_command_modules = [modname for _, modname, _ in
+                installed_command_modules = [(modname, getattr(importer, 'path', None)) for importer, modname, _ in
                                              pkgutil.iter_modules(mods_ns_pkg.__path__)
                                              if modname not in BLACKLISTED_MODS]
             except ImportError:
                 pass
-            logger.debug('Installed command modules %s', installed_command_modules)
+            logger.debug('Installed command modules %s', [mod for mod, _ in installed_command_modules])
+            return installed_command_modules
+
+        def _update_command_table_from_modules(args, command_modules):
+            '''Loads command table(s)
+            Only the command modules in `command_modules` are loaded.
+            '''
             cumulative_elapsed_time = 0
-            for mod in [m for m in installed_command_modules if m not in BLACKLISTED_MODS]:
+            for mod in [m for m in command_modules if m not in BLACKLISTED_MODS]:
                 try:
                     start_time = timeit.default_timer()
-                    module_command_table, module_group_table = _load_module_command_loader(self, args, mod)
+                    with profiler.phase("load module '{}'".format(mod)):
+                        module_command_table, module_group_table = _load_module_command_loader(self, args, mod)
                     for cmd in module_command_table.values():
                         cmd.command_source = mod
                     self.command_table.update(module_command_table)
@@ -151,7 +168,7 @@ class MainCommandsLoader(CLICommandsLoader):
                          "(note: there's always an overhead with the first module loaded)",
                          cumulative_elapsed_time)
 
-        def _update_command_table_from_extensions(ext_suppressions):
+        def _update_command_table_from_extensions(ext_suppressions, extensions):
 
             def _handle_extension_suppressions(extensions):
                 filtered_extensions = []
@@ -164,7 +181,6 @@ class MainCommandsLoader(CLICommandsLoader):
                         filtered_extensions.append(ext)
                 return filtered_extensions
 
-            extensions = get_extensions()
             if extensions:
                 logger.debug("Found %s extensions: %s", len(extensions), [e.name for e in extensions])
                 allowed_extensions = _handle_extension_suppressions(extensions)
@@ -179,8 +195,9 @@ class MainCommandsLoader(CLICommandsLoader):
                         # from an extension requires this map to be up-to-date.
                         # self._mod_to_ext_map[ext_mod] = ext_name
                         start_time = timeit.default_timer()
-                        extension_command_table, extension_group_table = \
-                            _load_extension_command_loader(self, args, ext_mod)
+                        with profiler.phase("load extension '{}'".format(ext_name)):
+                            extension_command_table, extension_group_table = \
+                                _load_extension_command_loader(self, args, ext_mod)
 
                         for cmd_name, cmd in extension_command_table.items():
                             cmd.command_source = ExtensionCommandSource(
@@ -223,15 +240,48 @@ class MainCommandsLoader(CLICommandsLoader):
                     res.append(sup)
             return res
 
-        _update_command_table_from_modules(args)
-        try:
-            ext_suppressions = _get_extension_suppressions(self.loaders)
-            # We always load extensions even if the appropriate module has been loaded
-            # as an extension could override the commands already loaded.
-            _update_command_table_from_extensions(ext_suppressions)
-        except Exception:  # pylint: disable=broad-except
-            logger.warning("Unable to load extensions. Use --debug for more information.")
-            logger.debug(traceback.format_exc())
+        def _update_command_table_from_extensions_safe(extensions):
+            try:
+                ext_suppressions = _get_extension_suppressions(self.loaders)
+                # We always load extensions even if the appropriate module has been loaded
+                # as an extension could override the commands already loaded.
+                _update_command_table_from_extensions(ext_suppressions, extensions)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Unable to load extensions. Use --debug for more information.")
+                logger.debug(traceback.format_exc())
+
+        def _get_extensions_safe():
+            try:
+                with profiler.phase('discover extensions'):
+                    return get_extensions()
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Unable to load extensions. Use --debug for more information.")
+                logger.debug(traceback.format_exc())
+            return []
+
+        with profiler.phase('discover command modules'):
+            installed_command_modules = _get_installed_command_modules()
+        extensions = _get_extensions_safe()
+
+        command_index = CommandIndex(self.cli_ctx)
+        index_key = None
+        if command_index.enabled:
+            index_key = command_index.get_index_key(installed_command_modules, extensions)
+            index_result = command_index.get(args, index_key)
+            if index_result:
+                index_modules, index_extensions = index_result
+                _update_command_table_from_modules(args, index_modules)
+                _update_command_table_from_extensions_safe([e for e in extensions if e.name in index_extensions])
+                if self.command_table:
+                    return self.command_table
+                logger.debug('Command index did not resolve any commands. Loading all command modules.')
+                self._reset_command_tables()
+
+        _update_command_table_from_modules(args, [mod for mod, _ in installed_command_modules])
+        _update_command_table_from_extensions_safe(extensions)
+
+        if index_key:
+            command_index.update(self.command_table, index_key)
 
         return self.command_table
 
@@ -257,6 +307,110 @@ class MainCommandsLoader(CLICommandsLoader):
                 loader._update_command_definitions()  # pylint: disable=protected-access
 
 
+class CommandIndex(object):
+    """ Persistent index of the command modules and extensions which provide each top-level command.
+
+    The index is stored in the configuration directory and is keyed on the core version, the active cloud profile,
+    the installed command modules and the installed extensions. When the key no longer matches, the index is
+    considered stale and is rebuilt the next time the full command table is loaded.
+    """
+
+    _INDEX_KEY = 'indexKey'
+    _COMMAND_INDEX = 'commandIndex'
+
+    def __init__(self, cli_ctx=None):
+        from azure.cli.core._session import INDEX
+        self.cli_ctx = cli_ctx
+        self.index = INDEX
+
+    @property
+    def enabled(self):
+        return bool(self.cli_ctx and self.index.filename) and \
+            self.cli_ctx.config.getboolean('core', 'use_command_index', fallback=True)
+
+    def get_index_key(self, installed_command_modules, extensions):
+        """ Build the key which identifies the set of installed command modules and extensions.
+
+        :param installed_command_modules: (name, path) tuples of the installed command modules
+        :param extensions: the installed extensions
+        :rtype: dict
+        """
+        from azure.cli.core.extension import get_extension_path
+
+        def _get_mtime(paths):
+            mtimes = []
+            for path in paths:
+                try:
+                    mtimes.append(os.path.getmtime(path))
+                except OSError:
+                    pass
+            return max(mtimes) if mtimes else None
+
+        modules = {}
+        for mod, path in installed_command_modules:
+            mod_dir = os.path.join(path, mod) if path else None
+            modules[mod] = _get_mtime([os.path.join(mod_dir, '__init__.py'),
+                                       os.path.join(mod_dir, 'commands.py')]) if mod_dir else None
+
+        ext_mtimes = {}
+        for ext in extensions:
+            ext_dir = get_extension_path(ext.name)
+            try:
+                dist_info_dirs = [os.path.join(ext_dir, f) for f in os.listdir(ext_dir)
+                                  if f.endswith(('.dist-info', '.egg-info'))]
+            except OSError:
+                dist_info_dirs = []
+            ext_mtimes[ext.name] = _get_mtime(dist_info_dirs)
+
+        return {
+            'version': __version__,
+            'cloudProfile': self.cli_ctx.cloud.profile,
+            'modules': modules,
+            'extensions': ext_mtimes
+        }
+
+    def get(self, args, index_key):
+        """ Look up the command modules and extensions which provide the command in `args`.
+
+        :return: a tuple of (module names, extension names) or None if the command cannot be
+                 resolved from the index
+        """
+        if not args or not args[0] or args[0].startswith('-'):
+            return None
+        if self.index.get(self._INDEX_KEY) != index_key:
+            logger.debug('Command index is stale or missing and will be rebuilt.')
+            return None
+        entry = self.index.get(self._COMMAND_INDEX, {}).get(args[0])
+        if not entry:
+            logger.debug("Command '%s' not found in the command index.", args[0])
+            return None
+        logger.debug("Command index resolved '%s' to modules %s and extensions %s.", args[0],
+                     entry.get('modules', []), entry.get('extensions', []))
+        return entry.get('modules', []), entry.get('extensions', [])
+
+    def update(self, command_table, index_key):
+        """ Rebuild the index from a fully loaded command table. """
+        from azure.cli.core.commands import ExtensionCommandSource
+
+        command_index = {}
+        for cmd_name, cmd in command_table.items():
+            entry = command_index.setdefault(cmd_name.split()[0], {'modules': [], 'extensions': []})
+            source = cmd.command_source
+            if isinstance(source, ExtensionCommandSource):
+                source_list, source_name = entry['extensions'], source.extension_name
+            else:
+                source_list, source_name = entry['modules'], source
+            if source_name and source_name not in source_list:
+                source_list.append(source_name)
+
+        if self.index.get(self._INDEX_KEY) == index_key and self.index.get(self._COMMAND_INDEX) == command_index:
+            return
+        logger.debug('Updating command index.')
+        with self.index.transaction():
+            self.index[self._INDEX_KEY] = index_key
+            self.index[self._COMMAND_INDEX] = command_index
+
+
 class ModExtensionSuppress(object):  # pylint: disable=too-few-public-methods
 
     def __init__(self, mod_name, suppress_extension_name, suppress_up_to_version, reason=None, recommend_remove=False):
@@ -11,7 +11,9 @@ import platform
 from six import StringIO
 import colorama
 
-from knack.output import format_json, format_json_color, format_table, format_tsv
+from knack.output import (format_json, format_json_color, format_table, format_tsv,
+                          OutputProducer as KnackOutputProducer)
+from knack.util import CommandResultItem
 
 
 def format_text(obj):
@@ -42,6 +44,9 @@ class OutputProducer(object):  # pylint: disable=too-few-public-methods
         self.file = file
 
     def out(self, obj):
+        if isinstance(obj.result, StreamedResult):
+            obj = CommandResultItem(obj.result.to_list(), table_transformer=obj.table_transformer,
+                                    is_query_active=obj.is_query_active)
         if platform.system() == 'Windows':
             self.file = colorama.AnsiToWin32(self.file).stream
         output = self.formatter(obj)
@@ -61,6 +66,143 @@ class OutputProducer(object):  # pylint: disable=too-few-public-methods
         return OutputProducer.format_dict.get(format_type)
 
 
+class StreamedResult(object):
+    """ The result of a command which is converted and printed one page at a time.
+
+    :param pages: Iterable of the pages of the result, each a list of items ready to be formatted
+    """
+
+    def __init__(self, pages):
+        self._pages = pages
+
+    def pages(self):
+        return iter(self._pages)
+
+    def to_list(self):
+        return [item for page in self.pages() for item in page]
+
+
+def _format_json_stream(obj):
+    # produces the same output as format_json for the whole list
+    separator = '\n  '
+    yield '['
+    for page in obj.result.pages():
+        for item in page:
+            yield separator + format_json(CommandResultItem(item)).rstrip('\n').replace('\n', '\n  ')
+            separator = ',\n  '
+    yield ']\n' if separator == '\n  ' else '\n]\n'
+
+
+def _format_tsv_stream(obj):
+    for page in obj.result.pages():
+        yield format_tsv(CommandResultItem(page))
+
+
+def _get_table_rows(obj, page):
+    """ Returns the headers and the rows of the cells of a page, as format_table lays them out. """
+    from collections import OrderedDict
+    from knack.output import _TableOutput
+    result = page
+    if obj.table_transformer and not obj.is_query_active:
+        if isinstance(obj.table_transformer, str):
+            from jmespath import compile as compile_jmes, Options
+            result = compile_jmes(obj.table_transformer).search(result, Options(OrderedDict))
+        else:
+            result = obj.table_transformer(result)
+    result_list = result if isinstance(result, list) else [result]
+    table_data = _TableOutput(not obj.is_query_active and not obj.table_transformer)._auto_table(result_list)
+    headers = []
+    for item in table_data:
+        headers.extend(key for key in item if key not in headers)
+    return headers, [[item.get(header) for header in headers] for item in table_data]
+
+
+def _is_number(value):
+    if isinstance(value, bool):
+        return False
+    try:
+        float(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _format_table_cell(value):
+    if value is None:
+        return ''
+    return format(value, 'g') if isinstance(value, float) else '{}'.format(value)
+
+
+def _format_table_stream(obj):
+    """ Formats the first page as a table and lays out the rows of the later pages in its columns. """
+    headers = widths = right_aligned = None
+    empty = True
+    for page in obj.result.pages():
+        if not page:
+            continue
+        empty = False
+        page_headers, rows = _get_table_rows(obj, page)
+        if page_headers != headers:
+            # tabulate pads the headers by at least two spaces and right aligns the numeric columns
+            headers = page_headers
+            columns = list(zip(*rows))
+            widths = [max([len(header) + 2] + [len(_format_table_cell(cell)) for cell in column])
+                      for header, column in zip(headers, columns)]
+            right_aligned = [all(_is_number(cell) for cell in column if cell is not None) for column in columns]
+            yield format_table(CommandResultItem(page, table_transformer=obj.table_transformer,
+                                                 is_query_active=obj.is_query_active))
+            continue
+        lines = []
+        for row in rows:
+            cells = [_format_table_cell(cell) for cell in row]
+            lines.append('  '.join(cell.rjust(width) if right else cell.ljust(width)
+                                   for cell, width, right in zip(cells, widths, right_aligned)).rstrip())
+        yield '\n'.join(lines) + '\n'
+    if empty:
+        yield format_table(CommandResultItem([]))
+
+
+class AzOutputProducer(KnackOutputProducer):
+    """ Prints a StreamedResult page by page for the output formats which support it. """
+
+    STREAMING_FORMATS = ['json', 'table', 'tsv']
+
+    _STREAM_FORMATTERS = {
+        format_json: _format_json_stream,
+        format_table: _format_table_stream,
+        format_tsv: _format_tsv_stream,
+    }
+
+    def out(self, obj, formatter=None, out_file=None):
+        from azure.cli.core import profiler
+        with profiler.phase('write output'):
+            return self._out(obj, formatter=formatter, out_file=out_file)
+
+    def _out(self, obj, formatter=None, out_file=None):
+        if not isinstance(obj, CommandResultItem) or not isinstance(obj.result, StreamedResult):
+            return super(AzOutputProducer, self).out(obj, formatter=formatter, out_file=out_file)
+
+        stream_formatter = AzOutputProducer._STREAM_FORMATTERS.get(formatter)
+        if not stream_formatter:
+            obj = CommandResultItem(obj.result.to_list(), table_transformer=obj.table_transformer,
+                                    is_query_active=obj.is_query_active)
+            return super(AzOutputProducer, self).out(obj, formatter=formatter, out_file=out_file)
+
+        if platform.system() == 'Windows':
+            out_file = colorama.AnsiToWin32(out_file).stream
+        for output in stream_formatter(obj):
+            try:
+                print(output, file=out_file, end='')
+            except IOError as ex:
+                if ex.errno == errno.EPIPE:
+                    return None
+                raise
+            except UnicodeEncodeError:
+                print(output.encode('ascii', 'ignore').decode('utf-8', 'ignore'),
+                      file=out_file, end='')
+        return None
+
+
 class TextOutput(object):
 
     def __init__(self):
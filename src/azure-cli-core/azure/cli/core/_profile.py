@@ -10,6 +10,8 @@ import errno
 import json
 import os
 import os.path
+import threading
+from contextlib import contextmanager
 from copy import deepcopy
 from enum import Enum
 from six.moves import BaseHTTPServer
@@ -19,7 +21,8 @@ from knack.util import CLIError
 
 from azure.cli.core._environment import get_config_dir
 from azure.cli.core._session import ACCOUNT
-from azure.cli.core.util import get_file_json, in_cloud_console, open_page_in_browser, can_launch_browser
+from azure.cli.core.util import (get_file_json, in_cloud_console, open_page_in_browser, can_launch_browser,
+                                 write_file_atomically, FileLock)
 from azure.cli.core.cloud import get_active_cloud, set_cloud_subscription
 
 logger = get_logger(__name__)
@@ -48,6 +51,9 @@ _SERVICE_PRINCIPAL_CERT_FILE = 'certificateFile'
 _SERVICE_PRINCIPAL_CERT_THUMBPRINT = 'thumbprint'
 _TOKEN_ENTRY_USER_ID = 'userId'
 _TOKEN_ENTRY_TOKEN_TYPE = 'tokenType'
+_TOKEN_ENTRY_EXPIRES_ON = 'expiresOn'
+# same as the clock skew allowance of ADAL
+_TOKEN_EXPIRY_BUFFER_MINUTES = 5
 # This could mean either real access token, or client secret of a service principal
 # This naming is no good, but can't change because xplat-cli does so.
 _ACCESS_TOKEN = 'accessToken'
@@ -98,6 +104,29 @@ def _load_tokens_from_file(file_path):
     return []
 
 
+def _get_cred_entry_key(entry):
+    if entry.get(_SERVICE_PRINCIPAL_ID):
+        return (entry[_SERVICE_PRINCIPAL_ID], entry.get(_SERVICE_PRINCIPAL_TENANT))
+    # the fields which identify an entry of the ADAL token cache
+    return tuple((entry.get(k) or '').lower() for k in ('_authority', 'resource', '_clientId', _TOKEN_ENTRY_USER_ID))
+
+
+def _get_token_expiry(token_entry):
+    from dateutil import parser
+    try:
+        return parser.parse(token_entry[_TOKEN_ENTRY_EXPIRES_ON])
+    except (KeyError, TypeError, ValueError, OverflowError):
+        return None
+
+
+def _is_token_newer(token_entry, other_token_entry):
+    expiry, other_expiry = _get_token_expiry(token_entry), _get_token_expiry(other_token_entry)
+    try:
+        return bool(expiry) and (not other_expiry or expiry > other_expiry)
+    except TypeError:  # only one of them has a time zone
+        return False
+
+
 def _delete_file(file_path):
     try:
         os.remove(file_path)
@@ -819,6 +848,12 @@ class CredsCache(object):
         self._should_flush_to_disk = False
         self._async_persist = async_persist
         self._ctx = cli_ctx
+        # unexpired access tokens by (user or service principal, tenant, resource)
+        self._token_memo = {}
+        # entries removed in this process, which must not be merged back from the token file
+        self._removed_entry_keys = set()
+        self._lock = threading.RLock()
+        self._token_file_lock_depth = 0
         if async_persist:
             import atexit
             atexit.register(self.flush_to_disk)
@@ -830,9 +865,12 @@ class CredsCache(object):
         self.adal_token_cache.has_state_changed = False
 
     def flush_to_disk(self):
-        if self._should_flush_to_disk:
-            with os.fdopen(os.open(self._token_file, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600),
-                           'w+') as cred_file:
+        with self._lock:
+            if not self._should_flush_to_disk:
+                return
+            with self._token_file_lock():
+                # keep the tokens other CLI processes saved since this one loaded the file
+                self._merge_token_file()
                 items = self.adal_token_cache.read_items()
                 all_creds = [entry for _, entry in items]
 
@@ -842,30 +880,110 @@ class CredsCache(object):
                         i.pop(key, None)
 
                 all_creds.extend(self._service_principal_creds)
-                cred_file.write(json.dumps(all_creds))
+                write_file_atomically(self._token_file, json.dumps(all_creds), permissions=0o600)
+                self._should_flush_to_disk = False
+
+    @contextmanager
+    def _token_file_lock(self):
+        """ Lock the token file against other CLI processes. Reentrant within the process holding self._lock. """
+        if self._token_file_lock_depth:
+            self._token_file_lock_depth += 1
+            try:
+                yield
+            finally:
+                self._token_file_lock_depth -= 1
+            return
+        with FileLock(self._token_file + '.lock'):
+            self._token_file_lock_depth = 1
+            try:
+                yield
+            finally:
+                self._token_file_lock_depth = 0
 
-    def retrieve_token_for_user(self, username, tenant, resource):
-        context = self._auth_ctx_factory(self._ctx, tenant, cache=self.adal_token_cache)
-        token_entry = context.acquire_token(resource, username, _CLIENT_ID)
-        if not token_entry:
-            raise CLIError("Could not retrieve token from local cache.{}".format(
-                " Please run 'az login'." if not in_cloud_console() else ''))
+    def _merge_token_file(self):
+        """ Add the entries which other CLI processes saved to the token file to the ones in memory. """
+        if self._adal_token_cache_attr is None:
+            self.load_adal_token_cache()  # nothing to merge with
+            return
+        file_entries = _load_tokens_from_file(self._token_file)
+
+        known_sps = [_get_cred_entry_key(x) for x in self._service_principal_creds]
+        for entry in file_entries:
+            key = _get_cred_entry_key(entry)
+            if entry.get(_SERVICE_PRINCIPAL_ID) and key not in known_sps and key not in self._removed_entry_keys:
+                self._service_principal_creds.append(entry)
+
+        has_state_changed = self._adal_token_cache_attr.has_state_changed
+        cached_tokens = {_get_cred_entry_key(entry): entry for _, entry in self._adal_token_cache_attr.read_items()}
+        for entry in file_entries:
+            key = _get_cred_entry_key(entry)
+            if entry.get(_SERVICE_PRINCIPAL_ID) or key in self._removed_entry_keys:
+                continue
+            cached = cached_tokens.get(key)
+            if cached is None:
+                self._adal_token_cache_attr.add([entry])
+            elif _is_token_newer(entry, cached):
+                # another process refreshed the token
+                self._adal_token_cache_attr.remove([cached])
+                self._adal_token_cache_attr.add([entry])
+        self._adal_token_cache_attr.has_state_changed = has_state_changed
+
+    def _get_memoized_token(self, key):
+        from datetime import datetime, timedelta
+        token, expiry = self._token_memo.get(key, (None, None))
+        if token and datetime.now(expiry.tzinfo) + timedelta(minutes=_TOKEN_EXPIRY_BUFFER_MINUTES) < expiry:
+            return token
+        return None
+
+    def _memoize_token(self, key, token):
+        expiry = _get_token_expiry(token[2])
+        if expiry:
+            self._token_memo[key] = token, expiry
 
-        if self.adal_token_cache.has_state_changed:
-            self.persist_cached_creds()
-        return (token_entry[_TOKEN_ENTRY_TOKEN_TYPE], token_entry[_ACCESS_TOKEN], token_entry)
+    def retrieve_token_for_user(self, username, tenant, resource):
+        memo_key = (username, tenant, resource)
+        with self._lock:
+            token = self._get_memoized_token(memo_key)
+            if token:
+                return token
+
+            # Hold the token file while the token is looked up, so that the CLI processes which need to refresh it
+            # at the same time wait for the first one to save the refreshed token rather than all refreshing it.
+            with self._token_file_lock():
+                self._merge_token_file()
+                context = self._auth_ctx_factory(self._ctx, tenant, cache=self.adal_token_cache)
+                token_entry = context.acquire_token(resource, username, _CLIENT_ID)
+                if not token_entry:
+                    raise CLIError("Could not retrieve token from local cache.{}".format(
+                        " Please run 'az login'." if not in_cloud_console() else ''))
+
+                if self.adal_token_cache.has_state_changed:
+                    self.persist_cached_creds()
+                    self.flush_to_disk()
+
+            token = (token_entry[_TOKEN_ENTRY_TOKEN_TYPE], token_entry[_ACCESS_TOKEN], token_entry)
+            self._memoize_token(memo_key, token)
+            return token
 
     def retrieve_token_for_service_principal(self, sp_id, resource):
-        self.load_adal_token_cache()
-        matched = [x for x in self._service_principal_creds if sp_id == x[_SERVICE_PRINCIPAL_ID]]
-        if not matched:
-            raise CLIError("Please run 'az account set' to select active account.")
-        cred = matched[0]
-        context = self._auth_ctx_factory(self._ctx, cred[_SERVICE_PRINCIPAL_TENANT], None)
-        sp_auth = ServicePrincipalAuth(cred.get(_ACCESS_TOKEN, None) or
-                                       cred.get(_SERVICE_PRINCIPAL_CERT_FILE, None))
-        token_entry = sp_auth.acquire_token(context, resource, sp_id)
-        return (token_entry[_TOKEN_ENTRY_TOKEN_TYPE], token_entry[_ACCESS_TOKEN], token_entry)
+        memo_key = (sp_id, None, resource)
+        with self._lock:
+            token = self._get_memoized_token(memo_key)
+            if token:
+                return token
+
+            self.load_adal_token_cache()
+            matched = [x for x in self._service_principal_creds if sp_id == x[_SERVICE_PRINCIPAL_ID]]
+            if not matched:
+                raise CLIError("Please run 'az account set' to select active account.")
+            cred = matched[0]
+            context = self._auth_ctx_factory(self._ctx, cred[_SERVICE_PRINCIPAL_TENANT], None)
+            sp_auth = ServicePrincipalAuth(cred.get(_ACCESS_TOKEN, None) or
+                                           cred.get(_SERVICE_PRINCIPAL_CERT_FILE, None))
+            token_entry = sp_auth.acquire_token(context, resource, sp_id)
+            token = (token_entry[_TOKEN_ENTRY_TOKEN_TYPE], token_entry[_ACCESS_TOKEN], token_entry)
+            self._memoize_token(memo_key, token)
+            return token
 
     def retrieve_secret_of_service_principal(self, sp_id):
         self.load_adal_token_cache()
@@ -916,11 +1034,13 @@ class CredsCache(object):
 
     def remove_cached_creds(self, user_or_sp):
         state_changed = False
+        self._token_memo = {k: v for k, v in self._token_memo.items() if k[0] != user_or_sp}
         # clear AAD tokens
         tokens = self.adal_token_cache.find({_TOKEN_ENTRY_USER_ID: user_or_sp})
         if tokens:
             state_changed = True
             self.adal_token_cache.remove(tokens)
+            self._removed_entry_keys.update(_get_cred_entry_key(x) for x in tokens)
 
         # clear service principal creds
         matched = [x for x in self._service_principal_creds
@@ -929,11 +1049,13 @@ class CredsCache(object):
             state_changed = True
             self._service_principal_creds = [x for x in self._service_principal_creds
                                              if x not in matched]
+            self._removed_entry_keys.update(_get_cred_entry_key(x) for x in matched)
 
         if state_changed:
             self.persist_cached_creds()
 
     def remove_all_cached_creds(self):
+        self._token_memo = {}
         # we can clear file contents, but deleting it is simpler
         _delete_file(self._token_file)
 
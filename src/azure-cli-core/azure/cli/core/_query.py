@@ -0,0 +1,143 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+"""Conversion of command results limited to the fields a JMESPath query reads.
+
+`get_query_selection` works out from the syntax tree of a query which fields of the result the query may read and
+`todict_selected` only converts these fields of the SDK models, so that a query which picks a few fields of a large
+result does not pay for converting all of it.
+
+A selection is either None, meaning the whole value, or a dict of the fields of the value which are read, mapped to
+their own selection. The field '*' stands for all the fields. Lists are transparent: the selection of a list applies
+to its items. Selections are conservative: whenever the query may depend on a value as a whole, e.g. because it
+compares it, tests whether it is empty or passes it to a function, all of the value is selected.
+"""
+
+from knack.util import todict, to_camel_case
+
+ALL_FIELDS = '*'
+
+_PASS_THROUGH_NODES = ['identity', 'current', 'index', 'slice']
+_CHAINED_NODES = ['subexpression', 'pipe', 'index_expression', 'projection', 'flatten']
+_WHOLE_VALUE_NODES = ['comparator', 'not_expression']
+_SORT_FUNCTIONS = ['sort_by', 'max_by', 'min_by']
+
+
+def merge_selections(first, second):
+    if first is None or second is None:
+        return None
+    merged = dict(first)
+    for key, selection in second.items():
+        merged[key] = merge_selections(merged[key], selection) if key in merged else selection
+    return merged
+
+
+def _get_field_selection(selection, key):
+    """ Returns the selection of a field of a value, or False if the field is not read. """
+    if selection is None:
+        return None
+    selections = [selection[k] for k in (key, ALL_FIELDS) if k in selection]
+    if not selections:
+        return False
+    return selections[0] if len(selections) == 1 else merge_selections(*selections)
+
+
+def _get_expref(node):
+    return node['children'][0] if node['type'] == 'expref' else None
+
+
+def _get_input_selection(node, selection):  # pylint: disable=too-many-return-statements,too-many-branches
+    """ Returns the selection of the input of the node, given the selection of its output. """
+    node_type = node['type']
+    children = node['children']
+    if node_type in _PASS_THROUGH_NODES:
+        return selection
+    if node_type == 'literal':
+        return {}
+    if node_type == 'field':
+        return {node['value']: selection}
+    if node_type in _CHAINED_NODES:
+        for child in reversed(children):
+            selection = _get_input_selection(child, selection)
+        return selection
+    if node_type == 'value_projection':
+        return _get_input_selection(children[0], {ALL_FIELDS: _get_input_selection(children[1], selection)})
+    if node_type == 'filter_projection':
+        item_selection = merge_selections(_get_input_selection(children[1], selection),
+                                          _get_input_selection(children[2], None))
+        return _get_input_selection(children[0], item_selection)
+    if node_type == 'multi_select_dict':
+        result = {}
+        for child in children:
+            child_selection = _get_field_selection(selection, child['value'])
+            if child_selection is not False:
+                result = merge_selections(result, _get_input_selection(child['children'][0], child_selection))
+        return result
+    if node_type == 'multi_select_list':
+        result = {}
+        for child in children:
+            result = merge_selections(result, _get_input_selection(child, selection))
+        return result
+    if node_type in ['or_expression', 'and_expression']:
+        # the left operand is tested, the result is either operand
+        return merge_selections(_get_input_selection(children[0], None), _get_input_selection(children[1], selection))
+    if node_type in _WHOLE_VALUE_NODES:
+        result = {}
+        for child in children:
+            result = merge_selections(result, _get_input_selection(child, None))
+        return result
+    if node_type == 'function_expression':
+        name = node['value']
+        if name in _SORT_FUNCTIONS and len(children) == 2 and _get_expref(children[1]):
+            # returns items of the array, the key of which is compared
+            item_selection = merge_selections(selection, _get_input_selection(_get_expref(children[1]), None))
+            return _get_input_selection(children[0], item_selection)
+        if name == 'map' and len(children) == 2 and _get_expref(children[0]):
+            return _get_input_selection(children[1], _get_input_selection(_get_expref(children[0]), selection))
+        result = {}
+        for child in children:
+            result = merge_selections(result, _get_input_selection(child, None))
+        return result
+    return None
+
+
+def get_query_selection(query_expression):
+    """ Returns the selection of the result a compiled JMESPath expression reads, None if it may read all of it. """
+    return _get_input_selection(query_expression.parsed, None)
+
+
+def todict_selected(obj, selection, post_processor=None, dependencies=None):
+    """ Converts the selected fields of an object like `knack.util.todict` converts the whole object.
+
+    :param dependencies: The fields which post processors compute, mapped to the fields they are computed from.
+    """
+    if selection is None:
+        return todict(obj, post_processor)
+    if isinstance(obj, list):
+        return [todict_selected(a, selection, post_processor, dependencies) for a in obj]
+    if isinstance(obj, dict):
+        items = obj.items()
+    elif not hasattr(obj, '_asdict') and hasattr(obj, '__dict__') and not _is_value_type(obj):
+        items = [(to_camel_case(k), v) for k, v in obj.__dict__.items() if not callable(v) and not k.startswith('_')]
+    else:
+        return todict(obj, post_processor)
+
+    for field, sources in (dependencies or {}).items():
+        if field in selection:
+            selection = merge_selections(selection, {source: None for source in sources})
+    result = {}
+    for k, v in items:
+        field_selection = _get_field_selection(selection, k)
+        if k == 'additionalProperties' and isinstance(v, dict):
+            # the post processor may move the additional properties to the object itself
+            field_selection = selection if field_selection is False else merge_selections(field_selection, selection)
+        if field_selection is not False:
+            result[k] = todict_selected(v, field_selection, post_processor, dependencies)
+    return post_processor(obj, result) if post_processor else result
+
+
+def _is_value_type(obj):
+    from datetime import date, time, datetime, timedelta
+    from enum import Enum
+    return isinstance(obj, (Enum, date, time, datetime, timedelta))
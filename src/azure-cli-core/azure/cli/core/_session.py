@@ -6,6 +6,7 @@
 import json
 import os
 import time
+from contextlib import contextmanager
 try:
     import collections.abc as collections
 except ImportError:
@@ -18,8 +19,15 @@ from codecs import open as codecs_open
 class Session(collections.MutableMapping):
     '''A simple dict-like class that is backed by a JSON file.
 
-    All direct modifications will save the file. Indirect modifications should
-    be followed by a call to `save_with_retry` or `save`.
+    All direct modifications will save the file, unless they are made within a
+    `transaction`. Indirect modifications should be followed by a call to
+    `save_with_retry` or `save`.
+
+    The file is replaced atomically while holding a lock shared with the other
+    CLI processes, so that they never read a partially written file. When
+    another process changed the file since it was last read or written, the
+    keys this session left unchanged take the values of the file, so that
+    processes updating different keys do not lose each other's updates.
     '''
 
     def __init__(self, encoding=None):
@@ -27,24 +35,71 @@ class Session(collections.MutableMapping):
         self.filename = None
         self.data = {}
         self._encoding = encoding if encoding else 'utf-8-sig'
+        # identifies the version of the file which self.data was last read from or written to
+        self._file_stamp = None
+        # the serialized values of the keys in that version of the file
+        self._file_values = {}
+        self._transaction_depth = 0
+        self._modified_in_transaction = False
+
+    def _get_file_stamp(self):
+        st = os.stat(self.filename)
+        return st.st_ino, st.st_size, st.st_mtime
 
     def load(self, filename, max_age=0):
+        if filename != self.filename:
+            self._file_stamp = None
         self.filename = filename
-        self.data = {}
         try:
             if max_age > 0:
                 st = os.stat(self.filename)
                 if st.st_mtime + max_age < time.clock():
-                    self.save()
+                    self.data = {}
+                    self._save(merge=False)
+            file_stamp = self._get_file_stamp()
+            if file_stamp == self._file_stamp:
+                # unchanged since it was last read or written
+                return
             with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
                 self.data = json.load(f)
+            self._file_stamp = file_stamp
+            self._file_values = _serialize_values(self.data)
         except (OSError, IOError):
-            self.save()
+            self.data = {}
+            self._save(merge=False)
 
     def save(self):
+        self._save(merge=True)
+
+    def _save(self, merge):
         if self.filename:
-            with codecs_open(self.filename, 'w', encoding=self._encoding) as f:
-                json.dump(self.data, f)
+            from azure.cli.core.util import write_file_atomically, FileLock
+            with FileLock(self.filename + '.lock'):
+                if merge:
+                    self._merge_file_changes()
+                write_file_atomically(self.filename, json.dumps(self.data), encoding=self._encoding)
+                self._file_stamp = self._get_file_stamp()
+                self._file_values = _serialize_values(self.data)
+
+    def _merge_file_changes(self):
+        '''Take the changes another process made to the file since it was last read or written, for the keys
+        which were not changed here.'''
+        try:
+            if self._get_file_stamp() == self._file_stamp:
+                return
+            with codecs_open(self.filename, 'r', encoding=self._encoding) as f:
+                file_data = json.load(f)
+        except (OSError, IOError, ValueError):
+            return
+        values = _serialize_values(self.data)
+        for key in set(file_data) | set(self.data):
+            if values.get(key) != self._file_values.get(key):
+                # changed or deleted here
+                continue
+            if key in file_data:
+                self.data[key] = file_data[key]
+            else:
+                del self.data[key]
 
     def save_with_retry(self, retries=5):
         for _ in range(retries - 1):
@@ -56,6 +111,24 @@ class Session(collections.MutableMapping):
         else:
             self.save()
 
+    @contextmanager
+    def transaction(self):
+        '''Save the file once at the end of the block, rather than after each modification made within it.'''
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+            if not self._transaction_depth and self._modified_in_transaction:
+                self._modified_in_transaction = False
+                self.save_with_retry()
+
+    def _save_modification(self):
+        if self._transaction_depth:
+            self._modified_in_transaction = True
+        else:
+            self.save_with_retry()
+
     def get(self, key, default=None):
         return self.data.get(key, default)
 
@@ -64,11 +137,11 @@ class Session(collections.MutableMapping):
 
     def __setitem__(self, key, value):
         self.data[key] = value
-        self.save_with_retry()
+        self._save_modification()
 
     def __delitem__(self, key):
         del self.data[key]
-        self.save_with_retry()
+        self._save_modification()
 
     def __iter__(self):
         return iter(self.data)
@@ -77,6 +150,10 @@ class Session(collections.MutableMapping):
         return len(self.data)
 
 
+def _serialize_values(data):
+    return {key: json.dumps(value, sort_keys=True) for key, value in data.items()}
+
+
 # ACCOUNT contains subscriptions information
 ACCOUNT = Session()
 
@@ -85,3 +162,9 @@ CONFIG = Session()
 
 # SESSION provides read-write session variables
 SESSION = Session()
+
+# INDEX contains the command index used to load only the command modules needed for a command
+INDEX = Session()
+
+# PROVIDER_CACHE contains the API versions of the resource types of resource providers
+PROVIDER_CACHE = Session()
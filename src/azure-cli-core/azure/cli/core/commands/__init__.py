@@ -10,7 +10,9 @@ import json
 import logging as logs
 import os
 import sys
+import threading
 import time
+import timeit
 from importlib import import_module
 import six
 
@@ -56,9 +58,16 @@ def _explode_list_args(args):
             new_ns = argparse.Namespace(**vars(args))
             for key_index, key in enumerate(list_args.keys()):
                 setattr(new_ns, key, value[key_index])
+            setattr(new_ns, '_list_arg_names', list(list_args))
             yield new_ns
 
 
+def _describe_expanded_arg(expanded_arg):
+    ''' Describes the resource of an argument namespace exploded by _explode_list_args. '''
+    list_arg_names = getattr(expanded_arg, '_list_arg_names', None) or []
+    return ', '.join('{}={}'.format(name, getattr(expanded_arg, name, None)) for name in list_arg_names)
+
+
 def _expand_file_prefixed_files(args):
     def _load_file(path):
         if path == '-':
@@ -97,7 +106,9 @@ def _expand_file_prefixed_files(args):
 
 
 def _pre_command_table_create(cli_ctx, args):
+    from azure.cli.core.commands.client_factory import clear_mgmt_service_client_cache
     cli_ctx.refresh_request_id()
+    clear_mgmt_service_client_cache(cli_ctx)
     return _expand_file_prefixed_files(args)
 
 
@@ -208,18 +219,19 @@ class AzCliCommandInvoker(CommandInvoker):
     def execute(self, args):
         from knack.events import (EVENT_INVOKER_PRE_CMD_TBL_CREATE, EVENT_INVOKER_POST_CMD_TBL_CREATE,
                                   EVENT_INVOKER_CMD_TBL_LOADED, EVENT_INVOKER_PRE_PARSE_ARGS,
-                                  EVENT_INVOKER_POST_PARSE_ARGS, EVENT_INVOKER_TRANSFORM_RESULT,
-                                  EVENT_INVOKER_FILTER_RESULT)
-        from knack.util import CommandResultItem, todict
+                                  EVENT_INVOKER_POST_PARSE_ARGS, EVENT_INVOKER_FILTER_RESULT)
+        from knack.util import CommandResultItem
         from azure.cli.core.commands.events import EVENT_INVOKER_PRE_CMD_TBL_TRUNCATE
+        from azure.cli.core import profiler
 
         # TODO: Can't simply be invoked as an event because args are transformed
         args = _pre_command_table_create(self.cli_ctx, args)
 
         self.cli_ctx.raise_event(EVENT_INVOKER_PRE_CMD_TBL_CREATE, args=args)
-        self.commands_loader.load_command_table(args)
-        self.cli_ctx.raise_event(EVENT_INVOKER_PRE_CMD_TBL_TRUNCATE,
-                                 load_cmd_tbl_func=self.commands_loader.load_command_table, args=args)
+        with profiler.phase('load command table'):
+            self.commands_loader.load_command_table(args)
+            self.cli_ctx.raise_event(EVENT_INVOKER_PRE_CMD_TBL_TRUNCATE,
+                                     load_cmd_tbl_func=self.commands_loader.load_command_table, args=args)
         command = self._rudimentary_get_command(args)
         telemetry.set_raw_command_name(command)
 
@@ -259,10 +271,12 @@ class AzCliCommandInvoker(CommandInvoker):
 
         self.commands_loader.command_table = self.commands_loader.command_table  # update with the truncated table
         self.commands_loader.command_name = command
-        self.commands_loader.load_arguments(command)
-        self.cli_ctx.raise_event(EVENT_INVOKER_POST_CMD_TBL_CREATE, commands_loader=self.commands_loader)
+        with profiler.phase('load arguments'):
+            self.commands_loader.load_arguments(command)
+            self.cli_ctx.raise_event(EVENT_INVOKER_POST_CMD_TBL_CREATE, commands_loader=self.commands_loader)
         self.parser.cli_ctx = self.cli_ctx
-        self.parser.load_command_table(self.commands_loader)
+        with profiler.phase('build parser'):
+            self.parser.load_command_table(self.commands_loader)
 
         self.cli_ctx.raise_event(EVENT_INVOKER_CMD_TBL_LOADED, cmd_tbl=self.commands_loader.command_table,
                                  parser=self.parser)
@@ -283,13 +297,18 @@ class AzCliCommandInvoker(CommandInvoker):
         self.parser.enable_autocomplete()
 
         self.cli_ctx.raise_event(EVENT_INVOKER_PRE_PARSE_ARGS, args=args)
-        parsed_args = self.parser.parse_args(args)
+        with profiler.phase('parse arguments'):
+            parsed_args = self.parser.parse_args(args)
+        self.data['query_selection'] = self._get_query_selection(getattr(parsed_args, '_jmespath_query', None))
         self.cli_ctx.raise_event(EVENT_INVOKER_POST_PARSE_ARGS, command=parsed_args.command, args=parsed_args)
 
         # TODO: This fundamentally alters the way Knack.invocation works here. Cannot be customized
         # with an event. Would need to be customized via inheritance.
         results = []
-        for expanded_arg in _explode_list_args(parsed_args):
+        jobs = []
+        expanded_args = list(_explode_list_args(parsed_args))
+        max_workers = get_ids_max_workers(self.cli_ctx) if len(expanded_args) > 1 else 1
+        for expanded_arg in expanded_args:
             cmd = expanded_arg.func
             if hasattr(expanded_arg, 'cmd'):
                 expanded_arg.cmd = cmd
@@ -339,27 +358,17 @@ class AzCliCommandInvoker(CommandInvoker):
             for d in deprecations:
                 logger.warning(d.message)
 
+            if max_workers > 1:
+                jobs.append((cmd, expanded_arg, params))
+                continue
+
             try:
-                result = cmd(params)
-                if cmd.supports_no_wait and getattr(expanded_arg, 'no_wait', False):
-                    result = None
-                elif cmd.no_wait_param and getattr(expanded_arg, cmd.no_wait_param, False):
-                    result = None
-
-                transform_op = cmd.command_kwargs.get('transform', None)
-                if transform_op:
-                    result = transform_op(result)
-
-                if _is_poller(result):
-                    result = LongRunningOperation(self.cli_ctx, 'Starting {}'.format(cmd.name))(result)
-                elif _is_paged(result):
-                    result = list(result)
-
-                result = todict(result, AzCliCommandInvoker.remove_additional_prop_layer)
-                event_data = {'result': result}
-                self.cli_ctx.raise_event(EVENT_INVOKER_TRANSFORM_RESULT, event_data=event_data)
-                result = event_data['result']
-                results.append(result)
+                with profiler.phase('run command'):
+                    result = self._run_job(cmd, expanded_arg, params)
+                    if _is_paged(result) and len(expanded_args) == 1 and self._should_stream_result():
+                        results.append(self._stream_paged_result(cmd, result))
+                    else:
+                        results.append(self._complete_job(cmd, result))
 
             except Exception as ex:  # pylint: disable=broad-except
                 if cmd.exception_handler:
@@ -368,6 +377,10 @@ class AzCliCommandInvoker(CommandInvoker):
                 else:
                     six.reraise(*sys.exc_info())
 
+        if jobs:
+            with profiler.phase('run command'):
+                results = self._run_jobs_concurrently(jobs, max_workers)
+
         if results and len(results) == 1:
             results = results[0]
 
@@ -379,6 +392,122 @@ class AzCliCommandInvoker(CommandInvoker):
             table_transformer=self.commands_loader.command_table[parsed_args.command].table_transformer,
             is_query_active=self.data['query_active'])
 
+    @staticmethod
+    def _run_job(cmd, expanded_arg, params):
+        result = cmd(params)
+        if cmd.supports_no_wait and getattr(expanded_arg, 'no_wait', False):
+            result = None
+        elif cmd.no_wait_param and getattr(expanded_arg, cmd.no_wait_param, False):
+            result = None
+
+        transform_op = cmd.command_kwargs.get('transform', None)
+        if transform_op:
+            result = transform_op(result)
+        return result
+
+    def _complete_job(self, cmd, result):
+        if _is_poller(result) or _is_poller_list(result):
+            result = LongRunningOperation(self.cli_ctx, 'Starting {}'.format(cmd.name))(result)
+        elif _is_paged(result):
+            result = list(result)
+        return self._transform_result(result)
+
+    def _run_jobs_concurrently(self, jobs, max_workers):
+        """ Runs the command for all the resources of --ids on a thread pool.
+
+        The long running operations the workers start are waited for in the order of the resources while all of them
+        run, so the results keep the order of --ids. A failure does not stop the other resources from being processed,
+        the failures are reported once all the resources are done.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def _start(job):
+            cmd, expanded_arg, params = job
+            try:
+                return self._run_job(cmd, expanded_arg, params), None
+            except Exception as ex:  # pylint: disable=broad-except
+                return None, ex
+
+        results = []
+        failure_count = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for (cmd, expanded_arg, _), (result, error) in zip(jobs, executor.map(_start, jobs)):
+                if error is None:
+                    try:
+                        results.append(self._complete_job(cmd, result))
+                        continue
+                    except Exception as ex:  # pylint: disable=broad-except
+                        error = ex
+                if cmd.exception_handler:
+                    try:
+                        cmd.exception_handler(error)
+                        continue  # the error was handled
+                    except Exception as ex:  # pylint: disable=broad-except
+                        error = ex
+                failure_count += 1
+                logger.error('%s: %s', _describe_expanded_arg(expanded_arg), error)
+        if failure_count:
+            raise CLIError('{} of {} resources failed.'.format(failure_count, len(jobs)))
+        return results
+
+    def _get_query_selection(self, query_expression):
+        """ Returns the fields of the result the query reads, or None if all of the result must be converted. """
+        from knack.events import EVENT_INVOKER_TRANSFORM_RESULT
+        from azure.cli.core._query import get_query_selection
+        from azure.cli.core.extensions.transform import is_transform
+
+        if query_expression is None:
+            return None
+        # other handlers may read any field of the result
+        handlers = self.cli_ctx._event_handlers[EVENT_INVOKER_TRANSFORM_RESULT]  # pylint: disable=protected-access
+        if not all(is_transform(handler) for handler in handlers):
+            return None
+        return get_query_selection(query_expression)
+
+    def _transform_result(self, result):
+        from knack.events import EVENT_INVOKER_TRANSFORM_RESULT
+        from knack.util import todict
+        query_selection = self.data.get('query_selection')
+        if query_selection is not None:
+            from azure.cli.core._query import todict_selected
+            from azure.cli.core.extensions.transform import TRANSFORMED_FIELDS
+            # only convert the fields the query reads
+            result = todict_selected(result, query_selection, AzCliCommandInvoker.remove_additional_prop_layer,
+                                     TRANSFORMED_FIELDS)
+        else:
+            result = todict(result, AzCliCommandInvoker.remove_additional_prop_layer)
+        event_data = {'result': result}
+        self.cli_ctx.raise_event(EVENT_INVOKER_TRANSFORM_RESULT, event_data=event_data)
+        return event_data['result']
+
+    def _should_stream_result(self):
+        """ A paged result is printed page by page unless a query or the output format needs all of it at once. """
+        from azure.cli.core._output import AzOutputProducer
+        return (isinstance(self.cli_ctx.output, AzOutputProducer) and not self.data['query_active'] and
+                self.data.get('output') in AzOutputProducer.STREAMING_FORMATS)
+
+    def _stream_paged_result(self, cmd, paged):
+        from azure.cli.core._output import StreamedResult
+
+        # retrieve the first page now, so that most errors are reported before anything is printed
+        first_page = paged.advance_page()
+
+        def _pages():
+            page = first_page
+            while True:
+                yield [self._transform_result(item) for item in page]
+                try:
+                    page = paged.advance_page()
+                except StopIteration:
+                    return
+                except Exception as ex:  # pylint: disable=broad-except
+                    if not cmd.exception_handler:
+                        raise
+                    cmd.exception_handler(ex)
+                    return
+
+        return StreamedResult(_pages())
+
     def _build_kwargs(self, func, ns):  # pylint: disable=no-self-use
         arg_list = get_arg_list(func)
         kwargs = {}
@@ -441,23 +570,37 @@ class AzCliCommandInvoker(CommandInvoker):
 
 
 class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
-    def __init__(self, cli_ctx, start_msg='', finish_msg='', poller_done_interval_ms=1000.0):
+    """ Waits for one or more long running operations and reports their progress.
+
+    The pollers poll the service on their own threads, honoring the Retry-After header of the service, and signal
+    their completion, so a single loop waits for any number of them and returns as soon as they are done rather than
+    after a fixed delay. In verbose mode the progress of template deployments is queried at an interval which backs
+    off while nothing changes. The timing of the last wait is available in `metrics`.
+    """
+    def __init__(self, cli_ctx, start_msg='', finish_msg='', poller_done_interval_ms=1000.0,
+                 progress_interval_ms=10000.0, max_progress_interval_ms=60000.0):
 
         self.cli_ctx = cli_ctx
         self.start_msg = start_msg
         self.finish_msg = finish_msg
         self.poller_done_interval_ms = poller_done_interval_ms
+        self.progress_interval_ms = progress_interval_ms
+        self.max_progress_interval_ms = max_progress_interval_ms
         self.deploy_dict = {}
-        self.last_progress_report = datetime.datetime.now()
+        self.metrics = {}
+        self._completed = threading.Event()
 
     def _delay(self):
-        time.sleep(self.poller_done_interval_ms / 1000.0)
+        # wake up early when an operation completes
+        self._completed.wait(self.poller_done_interval_ms / 1000.0)
+        self._completed.clear()
 
     def _generate_template_progress(self, correlation_id):  # pylint: disable=no-self-use
-        """ gets the progress for template deployments """
+        """ gets the progress for template deployments, returns whether it changed """
         from azure.cli.core.commands.client_factory import get_mgmt_service_client
         from azure.mgmt.monitor import MonitorManagementClient
 
+        progressed = False
         if correlation_id is not None:  # pylint: disable=too-many-nested-blocks
             formatter = "eventTimestamp ge {}"
 
@@ -515,6 +658,8 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
 
                             if update:
                                 logger.info(result)
+                                progressed = True
+        return progressed
 
     def __call__(self, poller):
         import colorama
@@ -523,6 +668,8 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
         # https://github.com/azure/azure-cli/issues/3555
         colorama.init()
 
+        pollers = poller if isinstance(poller, list) else [poller]
+        completed = [False] * len(pollers)
         correlation_message = ''
         self.cli_ctx.get_progress_controller().begin()
         correlation_id = None
@@ -530,24 +677,52 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
         cli_logger = get_logger()  # get CLI logger which has the level set through command lines
         is_verbose = any(handler.level <= logs.INFO for handler in cli_logger.handlers)
 
-        while not poller.done():
-            self.cli_ctx.get_progress_controller().add(message='Running')
-            try:
-                # pylint: disable=protected-access
-                correlation_id = json.loads(
-                    poller._response.__dict__['_content'].decode())['properties']['correlationId']
+        def _on_done(index):
+            def _callback(_):
+                completed[index] = True
+                self._completed.set()
+            return _callback
+
+        for index, p in enumerate(pollers):
+            if hasattr(p, 'add_done_callback'):
+                add_poller_done_callback(p, _on_done(index))
+
+        def _all_done():
+            for index, p in enumerate(pollers):
+                completed[index] = completed[index] or p.done()
+            return all(completed)
+
+        start_time = timeit.default_timer()
+        progress_interval = self.progress_interval_ms / 1000.0
+        next_progress_report = start_time + progress_interval
+        progress_queries = 0
+        while not _all_done():
+            if len(pollers) == 1:
+                self.cli_ctx.get_progress_controller().add(message='Running')
+            else:
+                self.cli_ctx.get_progress_controller().add(
+                    message='Running ({} of {} done)'.format(sum(completed), len(pollers)))
+            if correlation_id is None and len(pollers) == 1:
+                try:
+                    # pylint: disable=protected-access
+                    correlation_id = json.loads(
+                        poller._response.__dict__['_content'].decode())['properties']['correlationId']
 
-                correlation_message = 'Correlation ID: {}'.format(correlation_id)
-            except:  # pylint: disable=bare-except
-                pass
+                    correlation_message = 'Correlation ID: {}'.format(correlation_id)
+                except:  # pylint: disable=bare-except
+                    pass
 
-            current_time = datetime.datetime.now()
-            if is_verbose and current_time - self.last_progress_report >= datetime.timedelta(seconds=10):
-                self.last_progress_report = current_time
+            if is_verbose and correlation_id and timeit.default_timer() >= next_progress_report:
+                progress_queries += 1
                 try:
-                    self._generate_template_progress(correlation_id)
+                    progressed = self._generate_template_progress(correlation_id)
                 except Exception as ex:  # pylint: disable=broad-except
+                    progressed = False
                     logger.warning('%s during progress reporting: %s', getattr(type(ex), '__name__', type(ex)), ex)
+                # query often while the deployment makes progress, less and less often while it does not
+                progress_interval = self.progress_interval_ms / 1000.0 if progressed else \
+                    min(progress_interval * 2, self.max_progress_interval_ms / 1000.0)
+                next_progress_report = timeit.default_timer() + progress_interval
             try:
                 self._delay()
             except KeyboardInterrupt:
@@ -556,16 +731,23 @@ class LongRunningOperation(object):  # pylint: disable=too-few-public-methods
                 raise
 
         try:
-            result = poller.result()
+            results = [p.result() for p in pollers]
         except ClientException as client_exception:
             from azure.cli.core.commands.arm import handle_long_running_operation_exception
             self.cli_ctx.get_progress_controller().stop()
             handle_long_running_operation_exception(client_exception)
 
+        self.metrics = {
+            'operations': len(pollers),
+            'wait_seconds': timeit.default_timer() - start_time,
+            'progress_queries': progress_queries
+        }
+        logger.debug('Waited %.3f seconds for %d long running operation(s).', self.metrics['wait_seconds'],
+                     len(pollers))
         self.cli_ctx.get_progress_controller().end()
         colorama.deinit()
 
-        return result
+        return results if isinstance(poller, list) else results[0]
 
 
 # pylint: disable=too-few-public-methods
@@ -679,6 +861,33 @@ def _is_poller(obj):
     return False
 
 
+def _is_poller_list(obj):
+    return isinstance(obj, list) and bool(obj) and all(_is_poller(x) for x in obj)
+
+
+def add_poller_done_callback(poller, func):
+    """ Runs func with the poller once it is done, or right away when it is done already. Unlike LROPoller,
+    AzureOperationPoller raises a ValueError instead of running a callback added once it is done. """
+    if not poller.done():
+        try:
+            poller.add_done_callback(func)
+            return
+        except ValueError:
+            # it completed since it was checked
+            pass
+    func(poller)
+
+
+def get_ids_max_workers(cli_ctx):
+    """ The number of resources of --ids which are processed at the same time, 1 unless configured. """
+    try:
+        return max(1, cli_ctx.config.getint('core', 'ids_max_workers', fallback=1))
+    except ValueError:
+        logger.warning("Ignoring the invalid value of the 'core.ids_max_workers' configuration, an integer is "
+                       "expected.")
+        return 1
+
+
 def _merge_kwargs(patch_kwargs, base_kwargs, supported_kwargs=None):
     merged_kwargs = base_kwargs.copy()
     merged_kwargs.update(patch_kwargs)
@@ -8,7 +8,10 @@
 import argparse
 from collections import OrderedDict
 import json
+import os
 import re
+import threading
+import time
 from six import string_types
 
 from knack.arguments import CLICommandArgument, ignore_type
@@ -26,6 +29,10 @@ from azure.cli.core.profiles import ResourceType
 logger = get_logger(__name__)
 EXCLUDED_NON_CLIENT_PARAMS = list(set(EXCLUDED_PARAMS) - set(['self', 'client']))
 
+PROVIDER_CACHE_FILE_NAME = 'providerCache.json'
+PROVIDER_CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+_provider_cache_lock = threading.Lock()
+
 
 # pylint:disable=too-many-lines
 class ArmTemplateBuilder(object):
@@ -172,6 +179,65 @@ def resource_exists(cli_ctx, resource_group, name, namespace, type, **_):  # pyl
     return existing
 
 
+def _get_provider_api_versions(cli_ctx, client, provider_namespace, refresh=False):
+    """ Returns the API versions of the resource types of a provider keyed by the lower case type, and whether they
+    come from the cache. """
+    from azure.cli.core._session import PROVIDER_CACHE
+
+    subscription_id = getattr(client.config, 'subscription_id', None)
+    if not isinstance(subscription_id, string_types):
+        refresh = True  # without a subscription the provider cannot be cached
+    cache_key = '{}/{}/{}'.format(cli_ctx.cloud.name, subscription_id, provider_namespace).lower()
+
+    with _provider_cache_lock:
+        cache_file = os.path.join(cli_ctx.config.config_dir, PROVIDER_CACHE_FILE_NAME)
+        if PROVIDER_CACHE.filename != cache_file:
+            PROVIDER_CACHE.load(cache_file)
+        now = time.time()
+        entry = PROVIDER_CACHE.get(cache_key)
+        if not refresh and entry and now - entry.get('timestamp', 0) < PROVIDER_CACHE_MAX_AGE:
+            return entry['resourceTypes'], True
+
+        provider = client.providers.get(provider_namespace)
+        api_versions = {t.resource_type.lower(): t.api_versions or [] for t in provider.resource_types}
+        if isinstance(subscription_id, string_types):
+            with PROVIDER_CACHE.transaction():
+                expired_keys = [k for k, v in PROVIDER_CACHE.items()
+                                if now - v.get('timestamp', 0) >= PROVIDER_CACHE_MAX_AGE]
+                for key in expired_keys:
+                    del PROVIDER_CACHE[key]
+                PROVIDER_CACHE[cache_key] = {'timestamp': now, 'resourceTypes': api_versions}
+        return api_versions, False
+
+
+def resolve_api_version(cli_ctx, client, provider_namespace, resource_type, parent_path=None):
+    """ Resolves the latest API version of a resource type, or of the type of its parent, preferring non-preview
+    versions.
+
+    The resource types of the providers are cached per cloud and subscription for a day, which saves a request for
+    every resource of commands like `az resource tag --ids`.
+
+    :param client: Resource management client of the subscription of the resource
+    """
+    from azure.cli.core.parser import IncorrectUsageError
+
+    # If available, we will use parent resource's api-version
+    resource_type_str = (parent_path.split('/')[0] if parent_path else resource_type)
+
+    api_versions, from_cache = _get_provider_api_versions(cli_ctx, client, provider_namespace)
+    if resource_type_str.lower() not in api_versions and from_cache:
+        # the resource type may have been added since the provider was cached
+        api_versions, _ = _get_provider_api_versions(cli_ctx, client, provider_namespace, refresh=True)
+    if resource_type_str.lower() not in api_versions:
+        raise IncorrectUsageError('Resource type {} not found.'.format(resource_type_str))
+    rt_api_versions = api_versions[resource_type_str.lower()]
+    if not rt_api_versions:
+        raise IncorrectUsageError(
+            'API version is required and could not be resolved for resource {}'.format(resource_type))
+    npv = [v for v in rt_api_versions if 'preview' not in v.lower()]
+    return npv[0] if npv else rt_api_versions[0]
+
+
 def add_id_parameters(_, **kwargs):  # pylint: disable=unused-argument
 
     command_table = kwargs.get('commands_loader').command_table
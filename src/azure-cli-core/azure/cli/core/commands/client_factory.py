@@ -17,6 +17,7 @@ from azure.cli.core.profiles import ResourceType, CustomResourceType, get_api_ve
 logger = get_logger(__name__)
 UA_AGENT = "AZURECLI/{}".format(core_version)
 ENV_ADDITIONAL_USER_AGENT = 'AZURE_HTTP_USER_AGENT'
+MGMT_CLIENT_CACHE_KEY = 'mgmt_service_clients'
 
 
 def resolve_client_arg_name(operation, kwargs):
@@ -105,6 +106,14 @@ def configure_common_settings(cli_ctx, client):
     client.config.generate_client_request_id = 'x-ms-client-request-id' not in cli_ctx.data['headers']
 
 
+def _freeze(value):
+    if isinstance(value, dict):
+        return frozenset((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
 def _get_mgmt_service_client(cli_ctx,
                              client_type,
                              subscription_bound=True,
@@ -115,9 +124,36 @@ def _get_mgmt_service_client(cli_ctx,
                              sdk_profile=None,
                              aux_subscriptions=None,
                              **kwargs):
-    from azure.cli.core._profile import Profile
     logger.debug('Getting management service client client_type=%s', client_type.__name__)
     resource = resource or cli_ctx.cloud.endpoints.active_directory_resource_id
+
+    # Clients are reused for the rest of the command, so that they share credentials and HTTP connections.
+    cache_key = _freeze([client_type, subscription_bound, subscription_id, api_version, base_url_bound, resource,
+                         sdk_profile, aux_subscriptions, kwargs])
+    try:
+        cache = cli_ctx.data.setdefault(MGMT_CLIENT_CACHE_KEY, {})
+        cached = cache.get(cache_key)
+    except TypeError:  # unhashable client arguments
+        cache = None
+        cached = None
+    if cached:
+        return cached
+
+    client, subscription_id = _create_mgmt_service_client(cli_ctx, client_type, subscription_bound, subscription_id,
+                                                          api_version, base_url_bound, resource, sdk_profile,
+                                                          aux_subscriptions, **kwargs)
+    if cache is not None:
+        cache[cache_key] = client, subscription_id
+    return client, subscription_id
+
+
+def clear_mgmt_service_client_cache(cli_ctx):
+    cli_ctx.data[MGMT_CLIENT_CACHE_KEY] = {}
+
+
+def _create_mgmt_service_client(cli_ctx, client_type, subscription_bound, subscription_id, api_version,
+                                base_url_bound, resource, sdk_profile, aux_subscriptions, **kwargs):
+    from azure.cli.core._profile import Profile
     profile = Profile(cli_ctx=cli_ctx)
     cred, subscription_id, _ = profile.get_login_credentials(subscription_id=subscription_id, resource=resource,
                                                              aux_subscriptions=aux_subscriptions)
@@ -138,6 +174,8 @@ def _get_mgmt_service_client(cli_ctx,
         client = client_type(cred, **client_kwargs)
 
     configure_common_settings(cli_ctx, client)
+    # keep the connections open between the requests of the client
+    client.config.keep_alive = True
 
     return client, subscription_id
 
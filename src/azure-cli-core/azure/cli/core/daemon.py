@@ -0,0 +1,330 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+"""Resident process which runs `az` commands on behalf of a thin client.
+
+The daemon imports the CLI and all command modules once and then forks a child for every command it receives over a
+Unix socket. The client passes its standard input, output and error file descriptors along with the request, so the
+command reads from and writes to the client's terminal or pipes directly. Every command runs in a fresh CLI instance
+created with the client's environment and working directory, only the imported code is shared.
+
+Start the daemon with `python -m azure.cli.core.daemon start` and stop it with `python -m azure.cli.core.daemon stop`.
+While the daemon is running, `az` forwards its commands to it.
+"""
+
+from __future__ import print_function
+
+import array
+import json
+import os
+import signal
+import socket
+import sys
+
+SOCKET_FILE_NAME = 'daemon.sock'
+_STDIO_FDS = [0, 1, 2]
+_MAX_HEADER_SIZE = 64 * 1024
+# Modules which most commands import lazily, on top of the command modules.
+_WARM_UP_MODULES = ['requests', 'adal', 'msrest', 'msrestazure.azure_active_directory', 'msrestazure.azure_exceptions',
+                    'azure.cli.core._output', 'azure.cli.core._profile', 'azure.cli.core.commands.client_factory',
+                    'azure.cli.core.commands.progress', 'azure.cli.core.telemetry']
+
+
+def get_socket_path():
+    from azure.cli.core._environment import get_config_dir
+    return os.path.join(get_config_dir(), SOCKET_FILE_NAME)
+
+
+def is_daemon_supported():
+    return hasattr(socket, 'AF_UNIX') and hasattr(socket.socket, 'sendmsg')
+
+
+def _get_version():
+    from azure.cli.core import __version__
+    return __version__
+
+
+def _send_message(sock, message):
+    sock.sendall((json.dumps(message) + '\n').encode('utf-8'))
+
+
+class _MessageReader(object):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, sock, data=b''):
+        self._sock = sock
+        self._buffer = data
+
+    def read(self):
+        """ Returns the next message, or None once the connection is closed. """
+        while b'\n' not in self._buffer:
+            data = self._sock.recv(_MAX_HEADER_SIZE)
+            if not data:
+                return None
+            self._buffer += data
+        line, self._buffer = self._buffer.split(b'\n', 1)
+        return json.loads(line.decode('utf-8'))
+
+
+def forward_to_daemon(args, socket_path=None):
+    """ Run a command in the daemon.
+
+    Returns the exit code of the command, or None if no daemon is available to run it, in which case the command must
+    be run in the current process.
+    """
+    from knack.completion import ARGCOMPLETE_ENV_NAME
+    if not is_daemon_supported() or ARGCOMPLETE_ENV_NAME in os.environ:
+        return None
+
+    socket_path = socket_path or get_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(socket_path)
+            request = {
+                'args': args,
+                'cwd': os.getcwd(),
+                'env': dict(os.environ),
+                'encoding': getattr(sys.stdout, 'encoding', None),
+                'version': _get_version()
+            }
+            sock.sendmsg([(json.dumps(request) + '\n').encode('utf-8')],
+                         [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', _STDIO_FDS))])
+            reader = _MessageReader(sock)
+            reply = reader.read()
+        except (OSError, IOError, ValueError):
+            return None
+        if not reply or 'pid' not in reply:
+            # the daemon declined the command, e.g. because it runs a different version of the CLI
+            return None
+
+        # From here on the command may have started, so it must not be run again locally.
+        pid = reply['pid']
+        while True:
+            try:
+                reply = reader.read()
+                return reply.get('exit_code', 1) if reply else 1
+            except KeyboardInterrupt:
+                # the interrupt was delivered to the client, pass it on to the process running the command
+                os.kill(pid, signal.SIGINT)
+            except (OSError, IOError, ValueError):
+                return 1
+    finally:
+        sock.close()
+
+
+def _invoke_cli(args):
+    from knack.completion import ARGCOMPLETE_ENV_NAME
+    from azure.cli.core import get_default_cli
+    import azure.cli.core.telemetry as telemetry
+
+    az_cli = get_default_cli()
+    telemetry.set_application(az_cli, ARGCOMPLETE_ENV_NAME)
+    try:
+        telemetry.start()
+        exit_code = az_cli.invoke(args)
+        if exit_code and exit_code != 0:
+            telemetry.set_failure()
+        else:
+            telemetry.set_success()
+        return exit_code
+    except KeyboardInterrupt:
+        telemetry.set_user_fault('keyboard interrupt')
+        return 1
+    finally:
+        telemetry.conclude()
+
+
+class DaemonServer(object):
+    """ Accepts commands on a Unix socket and runs each of them in a forked child process. """
+
+    def __init__(self, socket_path=None, invoke=None):
+        self.socket_path = socket_path or get_socket_path()
+        self.invoke = invoke or _invoke_cli
+        self.version = _get_version()
+        self._sock = None
+
+    def warm_up(self):
+        """ Import the CLI and all the command modules, so that the forked children do not have to. """
+        import timeit
+        from importlib import import_module
+        from knack.log import get_logger
+        from azure.cli.core import get_default_cli
+
+        start_time = timeit.default_timer()
+        for mod in _WARM_UP_MODULES:
+            import_module(mod)
+        az_cli = get_default_cli()
+        az_cli.commands_loader_cls(cli_ctx=az_cli).load_command_table(None)
+        get_logger(__name__).debug('Daemon warmed up in %.3f seconds.', timeit.default_timer() - start_time)
+
+    def serve_forever(self):
+        from knack.util import CLIError
+        if not is_daemon_supported():
+            raise CLIError('The daemon is not supported on this platform.')
+        if os.path.exists(self.socket_path):
+            if _ping(self.socket_path):
+                raise CLIError('A daemon is already listening on {}.'.format(self.socket_path))
+            os.remove(self.socket_path)
+
+        # Only the current user may connect: the socket grants access to the user's credentials.
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            self._sock.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        self._sock.listen(64)
+
+        previous_handlers = {sig: signal.signal(sig, self._handle_signal) for sig in (signal.SIGTERM, signal.SIGHUP)}
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # the children are reaped automatically
+        try:
+            while self._accept():
+                pass
+        finally:
+            for sig, handler in previous_handlers.items():
+                signal.signal(sig, handler)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            self._sock.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    @staticmethod
+    def _handle_signal(signum, _):
+        raise SystemExit(128 + signum)
+
+    def _accept(self):
+        """ Handles one connection. Returns False when the daemon must stop. """
+        conn, _ = self._sock.accept()
+        fds = []
+        try:
+            try:
+                data, ancdata, _, _ = conn.recvmsg(_MAX_HEADER_SIZE, socket.CMSG_LEN(len(_STDIO_FDS) * 4))
+                for level, kind, cmsg_data in ancdata:
+                    if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+                        fds.extend(array.array('i', cmsg_data[:len(cmsg_data) - len(cmsg_data) % 4]))
+                request = _MessageReader(conn, data).read() or {}
+            except (OSError, IOError, ValueError):
+                request = {}
+
+            if request.get('stop'):
+                _send_message(conn, {'stopped': True})
+                return False
+            if request.get('ping'):
+                _send_message(conn, {'version': self.version})
+                return True
+            if request.get('version') != self.version or len(fds) != len(_STDIO_FDS):
+                # The client runs another version of the CLI, e.g. after an upgrade: let it run the command itself
+                # rather than running stale code.
+                _send_message(conn, {'error': 'The daemon runs version {}.'.format(self.version)})
+                return True
+
+            if os.fork() == 0:
+                self._run_child(conn, fds, request)
+            return True
+        finally:
+            for fd in fds:
+                os.close(fd)
+            conn.close()
+
+    def _run_child(self, conn, fds, request):
+        exit_code = 1
+        try:
+            self._sock.close()
+            for sig in (signal.SIGCHLD, signal.SIGTERM, signal.SIGHUP):
+                signal.signal(sig, signal.SIG_DFL)
+            # Detach from the terminal of the daemon. Interrupts are forwarded by the client instead.
+            os.setsid()
+            _send_message(conn, {'pid': os.getpid()})
+
+            for fd, std_fd in zip(fds, _STDIO_FDS):
+                os.dup2(fd, std_fd)
+            _reset_stdio(request.get('encoding'))
+            os.environ.clear()
+            os.environ.update(request['env'])
+            os.chdir(request['cwd'])
+
+            import random
+            random.seed()
+
+            exit_code = self.invoke(request['args'])
+        except SystemExit as ex:
+            exit_code = ex.code if isinstance(ex.code, int) else 1
+        except BaseException:  # pylint: disable=broad-except
+            import traceback
+            traceback.print_exc()
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                _send_message(conn, {'exit_code': exit_code or 0})
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+
+
+def _reset_stdio(encoding):
+    import io
+    if sys.version_info[0] < 3:
+        return
+    sys.stdin = io.open(0, 'r', encoding=encoding, closefd=False)
+    sys.stdout = io.open(1, 'w', buffering=1 if os.isatty(1) else -1, encoding=encoding, closefd=False)
+    sys.stderr = io.open(2, 'w', buffering=1, encoding=encoding, closefd=False)
+
+
+def _request(socket_path, message):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        _send_message(sock, message)
+        return _MessageReader(sock).read()
+    except (OSError, IOError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def _ping(socket_path):
+    return _request(socket_path, {'ping': True}) is not None
+
+
+def main(argv):
+    import argparse
+    from knack.util import CLIError
+
+    parser = argparse.ArgumentParser(prog='python -m azure.cli.core.daemon', description=__doc__.splitlines()[0])
+    parser.add_argument('action', choices=['start', 'stop', 'status'])
+    parser.add_argument('--socket', help='Path of the Unix socket. Defaults to {} in the configuration '
+                                         'directory.'.format(SOCKET_FILE_NAME))
+    args = parser.parse_args(argv)
+    socket_path = args.socket or get_socket_path()
+
+    if args.action == 'start':
+        server = DaemonServer(socket_path)
+        server.warm_up()
+        print('Listening on {}.'.format(socket_path))
+        sys.stdout.flush()
+        try:
+            server.serve_forever()
+        except CLIError as ex:
+            print(ex, file=sys.stderr)
+            return 1
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if args.action == 'stop':
+        if _request(socket_path, {'stop': True}) is None:
+            print('No daemon is listening on {}.'.format(socket_path), file=sys.stderr)
+            return 1
+        return 0
+    if not _ping(socket_path):
+        print('No daemon is listening on {}.'.format(socket_path))
+        return 1
+    print('A daemon is listening on {}.'.format(socket_path))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -10,11 +10,19 @@ import knack.events as events
 from azure.cli.core.util import b64_to_hex
 
 
+# The fields the transforms add to the objects of a result, mapped to the fields they are computed from.
+TRANSFORMED_FIELDS = {'resourceGroup': ['id'], 'x509ThumbprintHex': ['x509Thumbprint']}
+
+
 def register(cli_ctx):
     cli_ctx.register_event(events.EVENT_INVOKER_TRANSFORM_RESULT, _resource_group_transform)
     cli_ctx.register_event(events.EVENT_INVOKER_TRANSFORM_RESULT, _x509_from_base64_to_hex_transform)
 
 
+def is_transform(handler):
+    return handler in (_resource_group_transform, _x509_from_base64_to_hex_transform)
+
+
 def _parse_id(strid):
     parsed = {}
     parts = re.split('/', strid)
@@ -0,0 +1,180 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+"""Profiling of the startup of the CLI.
+
+When the AZURE_CLI_PROFILE_STARTUP environment variable is set, the time spent in each phase of a command (loading
+the configuration, resolving the cloud, loading each command module and extension, loading the arguments, building
+the parser, running the handler and writing the output) and the time spent importing each module are recorded and
+reported once the command completes. The variable holds the path of a file the report is written to as JSON, or '-'
+to print it to stderr.
+
+Phases are marked with `with profiler.phase(name):`, which costs nothing while the profiler is not started.
+"""
+
+from __future__ import print_function
+
+import json
+import os
+import sys
+import threading
+import timeit
+from contextlib import contextmanager
+
+PROFILE_ENV_NAME = 'AZURE_CLI_PROFILE_STARTUP'
+PROFILE_TO_STDERR = '-'
+_NUM_IMPORTS_PRINTED = 20
+
+_profiler = None
+
+
+class _NoPhase(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+class _ImportTimer(object):
+    """ A meta path finder which times the execution of the modules found by the other finders. """
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        # builtin and frozen modules are loaded by classes and cost next to nothing, loaders shared by several modules
+        # like zip importers are only wrapped once
+        if loader is not None and not isinstance(loader, type) and hasattr(loader, 'exec_module') and \
+                'exec_module' not in vars(loader):
+            loader.exec_module = self._wrap(loader.exec_module)
+        return spec
+
+    def _wrap(self, exec_module):
+        def _timed_exec_module(module):
+            with self._profiler.time_import(module.__name__):
+                exec_module(module)
+        return _timed_exec_module
+
+
+class StartupProfiler(object):
+
+    def __init__(self, start_time=None):
+        self.start_time = start_time or timeit.default_timer()
+        self.phases = []
+        self.imports = {}
+        self._depth = 0
+        self._local = threading.local()
+        self._import_timer = _ImportTimer(self) if sys.version_info >= (3, 4) else None
+
+    def install(self):
+        """ Starts timing the imports. """
+        if self._import_timer and self._import_timer not in sys.meta_path:
+            sys.meta_path.insert(0, self._import_timer)
+
+    def uninstall(self):
+        if self._import_timer in sys.meta_path:
+            sys.meta_path.remove(self._import_timer)
+
+    def add_phase(self, name, start_time, end_time):
+        """ Records a phase which completed before the profiler was started, like the import of this package. """
+        self.phases.append({'name': name, 'depth': self._depth, 'start': start_time - self.start_time,
+                            'duration': end_time - start_time})
+
+    @contextmanager
+    def phase(self, name):
+        start_time = timeit.default_timer()
+        entry = {'name': name, 'depth': self._depth, 'start': start_time - self.start_time, 'duration': None}
+        self.phases.append(entry)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            entry['duration'] = timeit.default_timer() - start_time
+
+    @contextmanager
+    def time_import(self, name):
+        stack = self._local.__dict__.setdefault('stack', [])
+        nested = [0.0]  # the time spent importing the modules this module imports
+        stack.append(nested)
+        start_time = timeit.default_timer()
+        try:
+            yield
+        finally:
+            cumulative = timeit.default_timer() - start_time
+            stack.pop()
+            if stack:
+                stack[-1][0] += cumulative
+            self.imports[name] = {'self': cumulative - nested[0], 'cumulative': cumulative}
+
+    def get_report(self, args=None):
+        imports = sorted(({'module': k, 'self': v['self'], 'cumulative': v['cumulative']}
+                          for k, v in self.imports.items()), key=lambda i: i['self'], reverse=True)
+        return {
+            'command': ' '.join(args or []),
+            'total': timeit.default_timer() - self.start_time,
+            'phases': self.phases,
+            'imports': imports
+        }
+
+
+def print_report(report, file=None):
+    file = file or sys.stderr
+    print("Startup profile of 'az {}' ({:.3f} seconds):".format(report['command'], report['total']), file=file)
+    print('{:>10} {:>10}  {}'.format('Start', 'Duration', 'Phase'), file=file)
+    for phase in report['phases']:
+        duration = '{:10.3f}'.format(phase['duration']) if phase['duration'] is not None else '{:>10}'.format('-')
+        print('{:10.3f} {}  {}{}'.format(phase['start'], duration, '  ' * phase['depth'], phase['name']), file=file)
+    if report['imports']:
+        print('\nSlowest imports:', file=file)
+        print('{:>10} {:>10}  {}'.format('Self', 'Cumulative', 'Module'), file=file)
+        for entry in report['imports'][:_NUM_IMPORTS_PRINTED]:
+            print('{:10.3f} {:10.3f}  {}'.format(entry['self'], entry['cumulative'], entry['module']), file=file)
+
+
+def is_requested():
+    return bool(os.environ.get(PROFILE_ENV_NAME))
+
+
+def start(start_time=None):
+    global _profiler  # pylint: disable=global-statement
+    _profiler = StartupProfiler(start_time)
+    _profiler.install()
+    return _profiler
+
+
+def phase(name):
+    return _profiler.phase(name) if _profiler else _NO_PHASE
+
+
+def stop(args=None):
+    """ Stops the profiler and writes its report where AZURE_CLI_PROFILE_STARTUP asks for. """
+    global _profiler  # pylint: disable=global-statement
+    if not _profiler:
+        return None
+    _profiler.uninstall()
+    report = _profiler.get_report(args)
+    _profiler = None
+
+    target = os.environ.get(PROFILE_ENV_NAME)
+    if target == PROFILE_TO_STDERR:
+        print_report(report)
+    elif target:
+        with open(os.path.expanduser(target), 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
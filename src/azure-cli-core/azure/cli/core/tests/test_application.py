@@ -119,6 +119,95 @@ class TestApplication(unittest.TestCase):
 
         os.remove(f.name)
 
+    def test_list_args_run_concurrently_with_ordered_results(self):
+        import json
+        import threading
+        import time
+        from six import StringIO
+
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def _handler(args):
+            name = args['name']
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.05 if name == 'a' else 0.01)
+            with lock:
+                state['active'] -= 1
+            if name == 'c':
+                raise CLIError('{} is broken'.format(name))
+            return name.upper()
+
+        class TestCommandsLoader(AzCommandsLoader):
+
+            def load_command_table(self, args):
+                super(TestCommandsLoader, self).load_command_table(args)
+                command = AzCliCommand(self, 'test', _handler)
+                command.add_argument('name', '--names', nargs='+', action=IterateAction)
+                self.command_table = {'test': command}
+                return self.command_table
+
+        cli = TestCli(commands_loader_cls=TestCommandsLoader)
+        with mock.patch.dict(os.environ, {'AZURE_CORE_IDS_MAX_WORKERS': '3'}):
+            out_file = StringIO()
+            self.assertEqual(cli.invoke(['test', '--names', 'a', 'b', 'd'], out_file=out_file), 0)
+            self.assertEqual(json.loads(out_file.getvalue()), ['A', 'B', 'D'])
+            self.assertGreater(state['peak'], 1)
+
+            # the other resources are processed despite the failure
+            with mock.patch('azure.cli.core.commands.logger.error') as logger_error:
+                self.assertEqual(cli.invoke(['test', '--names', 'a', 'c', 'd'], out_file=StringIO()), 1)
+            logger_error.assert_called_once_with('%s: %s', 'name=c', mock.ANY)
+
+        # serial unless configured
+        state['peak'] = 0
+        out_file = StringIO()
+        self.assertEqual(cli.invoke(['test', '--names', 'a', 'b'], out_file=out_file), 0)
+        self.assertEqual(json.loads(out_file.getvalue()), ['A', 'B'])
+        self.assertEqual(state['peak'], 1)
+
+    def test_paged_result_is_streamed(self):
+        import json
+        from msrest.paging import Paged
+        from six import StringIO
+        from azure.cli.core._output import StreamedResult
+
+        class _TestPaged(Paged):
+
+            def __init__(self, pages):
+                super(_TestPaged, self).__init__(None, {})
+                self.pages = pages
+
+            def advance_page(self):
+                if not self.pages:
+                    raise StopIteration('End of paging')
+                self.current_page = self.pages.pop(0)
+                self._current_page_iter_index = 0
+                return self.current_page
+
+        def _handler(args):
+            return _TestPaged([[{'name': 'a'}, {'name': 'b'}], [{'name': 'c'}]])
+
+        class TestCommandsLoader(AzCommandsLoader):
+
+            def load_command_table(self, args):
+                super(TestCommandsLoader, self).load_command_table(args)
+                self.command_table = {'test': AzCliCommand(self, 'test', _handler)}
+                return self.command_table
+
+        cli = TestCli(commands_loader_cls=TestCommandsLoader)
+        for args, streamed in [(['test', '-o', 'json'], True), (['test', '-o', 'tsv', '--query', '[].name'], False)]:
+            out_file = StringIO()
+            with mock.patch.object(cli.output, 'out', wraps=cli.output.out) as out:
+                self.assertEqual(cli.invoke(args, out_file=out_file), 0)
+            self.assertEqual(isinstance(out.call_args[0][0].result, StreamedResult), streamed)
+            if streamed:
+                self.assertEqual(json.loads(out_file.getvalue()), [{'name': 'a'}, {'name': 'b'}, {'name': 'c'}])
+            else:
+                self.assertEqual(out_file.getvalue(), 'a\nb\nc\n')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,46 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import unittest
+import mock
+
+from azure.cli.core.commands.client_factory import get_mgmt_service_client, clear_mgmt_service_client_cache
+from azure.cli.testsdk import TestCli
+
+
+class _TestClient(object):  # pylint: disable=too-few-public-methods
+
+    def __init__(self, credentials, subscription_id, base_url=None, api_version=None):
+        self.credentials = credentials
+        self.subscription_id = subscription_id
+        self.base_url = base_url
+        self.api_version = api_version
+        self.config = mock.MagicMock()
+        self._client = mock.MagicMock()
+
+
+class TestClientFactory(unittest.TestCase):
+
+    @mock.patch('azure.cli.core._profile.Profile.get_login_credentials', autospec=True)
+    def test_mgmt_service_client_cache(self, get_login_credentials):
+        get_login_credentials.return_value = (mock.MagicMock(), 'sub1', 'tenant1')
+        cli = TestCli()
+
+        client = get_mgmt_service_client(cli, _TestClient)
+        self.assertTrue(client.config.keep_alive)
+        self.assertIs(get_mgmt_service_client(cli, _TestClient), client)
+        self.assertEqual(get_login_credentials.call_count, 1)
+
+        # clients for another subscription or api-version are not shared
+        self.assertIsNot(get_mgmt_service_client(cli, _TestClient, subscription_id='sub2'), client)
+        self.assertIsNot(get_mgmt_service_client(cli, _TestClient, api_version='2018-01-01'), client)
+
+        # the cache only lives for one command
+        clear_mgmt_service_client_cache(cli)
+        self.assertIsNot(get_mgmt_service_client(cli, _TestClient), client)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -220,6 +220,65 @@ class TestCommandRegistration(unittest.TestCase):
         self.assertTrue(isinstance(ext2.command_source, ExtensionCommandSource))
         self.assertTrue(ext2.command_source.overrides_command)
 
+    def test_command_index(self):
+        import os
+        import tempfile
+        from azure.cli.core._session import Session
+
+        loaded_modules = []
+
+        def _mock_iter_modules(_):
+            return [(None, 'hello', None), (None, 'extra', None)]
+
+        def _mock_load_command_loader(loader, args, name, prefix):
+
+            class TestCommandsLoader(AzCommandsLoader):
+
+                def load_command_table(self, args):
+                    super(TestCommandsLoader, self).load_command_table(args)
+                    with self.command_group(name, operations_tmpl='{}#TestCommandRegistration.{{}}'.format(
+                            __name__)) as g:
+                        g.command('world', 'sample_vm_get')
+                    return self.command_table
+
+            loaded_modules.append(name)
+            command_loader = TestCommandsLoader(cli_ctx=loader.cli_ctx)
+            command_table = command_loader.load_command_table(args)
+            loader.loaders.append(command_loader)
+            return command_table, {}
+
+        index = Session()
+        with mock.patch('azure.cli.core._session.INDEX', index), \
+                mock.patch('pkgutil.iter_modules', _mock_iter_modules), \
+                mock.patch('azure.cli.core.commands._load_command_loader', _mock_load_command_loader), \
+                mock.patch('azure.cli.core.extension.get_extensions', lambda: []):
+            cli = TestCli()
+            index.load(os.path.join(tempfile.mkdtemp(), 'commandIndex.json'))
+
+            # no index yet: every module is loaded and the index is built
+            cmd_tbl = MainCommandsLoader(cli).load_command_table(['hello', 'world'])
+            self.assertEqual(sorted(loaded_modules), ['extra', 'hello'])
+            self.assertEqual(sorted(cmd_tbl), ['extra world', 'hello world'])
+            self.assertEqual(index['commandIndex']['hello'], {'modules': ['hello'], 'extensions': []})
+
+            # index is up to date: only the module providing the command is loaded
+            del loaded_modules[:]
+            cmd_tbl = MainCommandsLoader(cli).load_command_table(['hello', 'world'])
+            self.assertEqual(loaded_modules, ['hello'])
+            self.assertEqual(list(cmd_tbl), ['hello world'])
+
+            # commands missing from the index fall back to loading every module
+            del loaded_modules[:]
+            MainCommandsLoader(cli).load_command_table(['--help'])
+            self.assertEqual(sorted(loaded_modules), ['extra', 'hello'])
+
+            # a change to the core version invalidates the index
+            del loaded_modules[:]
+            index.data['indexKey']['version'] = '0.0.1'
+            MainCommandsLoader(cli).load_command_table(['hello', 'world'])
+            self.assertEqual(sorted(loaded_modules), ['extra', 'hello'])
+            self.assertNotEqual(index['indexKey']['version'], '0.0.1')
+
     def test_argument_with_overrides(self):
 
         global_vm_name_type = CLIArgumentType(
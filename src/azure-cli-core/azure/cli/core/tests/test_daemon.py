@@ -0,0 +1,86 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from azure.cli.core import daemon
+from azure.cli.core.daemon import DaemonServer, forward_to_daemon, is_daemon_supported
+
+
+def _invoke(args):
+    os.write(1, json.dumps({'args': args, 'cwd': os.getcwd(), 'env': os.environ.get('AZ_DAEMON_TEST')}).encode())
+    return int(args[0])
+
+
+@unittest.skipUnless(is_daemon_supported(), 'The daemon requires Unix sockets.')
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.socket_path = os.path.join(self.temp_dir, daemon.SOCKET_FILE_NAME)
+
+    def _start_server(self, version=None):
+        server = DaemonServer(self.socket_path, invoke=_invoke)
+        server.version = version or server.version
+        pid = os.fork()
+        if pid == 0:
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+
+        def _stop():
+            daemon._request(self.socket_path, {'stop': True})  # pylint: disable=protected-access
+            os.waitpid(pid, 0)
+
+        self.addCleanup(_stop)
+        for _ in range(100):
+            if daemon._ping(self.socket_path):  # pylint: disable=protected-access
+                return
+            time.sleep(0.05)
+        self.fail('The daemon did not start.')
+
+    def _forward(self, args):
+        output_path = os.path.join(self.temp_dir, 'stdout')
+        with open(output_path, 'w') as output:
+            stdout_fd = os.dup(1)
+            os.dup2(output.fileno(), 1)
+            try:
+                exit_code = forward_to_daemon(args, socket_path=self.socket_path)
+            finally:
+                os.dup2(stdout_fd, 1)
+                os.close(stdout_fd)
+        with open(output_path) as output:
+            return exit_code, output.read()
+
+    def test_daemon_runs_command_with_client_context(self):
+        self._start_server()
+        os.environ['AZ_DAEMON_TEST'] = 'value'
+        self.addCleanup(os.environ.pop, 'AZ_DAEMON_TEST')
+
+        exit_code, output = self._forward(['3', 'group', 'list'])
+        self.assertEqual(exit_code, 3)
+        self.assertEqual(json.loads(output), {'args': ['3', 'group', 'list'], 'cwd': os.getcwd(), 'env': 'value'})
+
+    def test_daemon_declines_other_versions(self):
+        self._start_server(version='0.0.1')
+        self.assertIsNone(self._forward(['0'])[0])
+        # the daemon keeps serving after declining a command
+        self.assertTrue(daemon._ping(self.socket_path))  # pylint: disable=protected-access
+
+    def test_no_daemon(self):
+        self.assertIsNone(forward_to_daemon(['0'], socket_path=self.socket_path))
+        open(self.socket_path, 'w').close()
+        self.assertIsNone(forward_to_daemon(['0'], socket_path=self.socket_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
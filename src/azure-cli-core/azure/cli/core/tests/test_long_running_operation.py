@@ -0,0 +1,94 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+import time
+import timeit
+import unittest
+
+import mock
+import requests
+from msrestazure.azure_operation import AzureOperationPoller
+
+from azure.cli.core.commands import LongRunningOperation
+
+
+class _FakePoller(object):
+    """ Completes after a delay and, like the msrest pollers, runs its callbacks before it reports to be done. A
+    callback added once it completed runs right away, like with LROPoller. """
+
+    def __init__(self, result, delay):
+        self._result = result
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._completed = False
+        self._thread = threading.Thread(target=self._run, args=(delay,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self, delay):
+        time.sleep(delay)
+        with self._lock:
+            self._completed = True
+        for callback in self._callbacks:
+            callback(self)
+        time.sleep(0.05)
+
+    def add_done_callback(self, func):
+        with self._lock:
+            if not self._completed:
+                self._callbacks.append(func)
+                return
+        func(self)
+
+    def done(self):
+        return not self._thread.is_alive()
+
+    def result(self):
+        self._thread.join()
+        return self._result
+
+
+class TestLongRunningOperation(unittest.TestCase):
+
+    def test_long_running_operation_returns_once_done(self):
+        cli_ctx = mock.MagicMock()
+        operation = LongRunningOperation(cli_ctx, poller_done_interval_ms=5000.0)
+
+        start_time = timeit.default_timer()
+        self.assertEqual(operation(_FakePoller('result', delay=0.05)), 'result')
+        self.assertLess(timeit.default_timer() - start_time, 2)
+        self.assertEqual(operation.metrics['operations'], 1)
+        cli_ctx.get_progress_controller.return_value.end.assert_called_once_with()
+
+    def test_long_running_operation_waits_for_many_pollers(self):
+        cli_ctx = mock.MagicMock()
+        operation = LongRunningOperation(cli_ctx, poller_done_interval_ms=5000.0)
+        pollers = [_FakePoller(i, delay=0.02 * (5 - i)) for i in range(5)]
+
+        start_time = timeit.default_timer()
+        self.assertEqual(operation(pollers), list(range(5)))
+        self.assertLess(timeit.default_timer() - start_time, 2)
+        self.assertEqual(operation.metrics['operations'], 5)
+        self.assertEqual(operation.metrics['progress_queries'], 0)
+
+    def test_long_running_operation_of_completed_azure_operation_poller(self):
+        # an AzureOperationPoller whose first response is terminal refuses done callbacks
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"properties": {"provisioningState": "Succeeded"}}'  # pylint: disable=protected-access
+        response.request = requests.Request('PUT', 'https://management.azure.com/resource').prepare()
+        poller = AzureOperationPoller(lambda: response, lambda _: 'result', None)
+        with self.assertRaises(ValueError):
+            poller.add_done_callback(lambda _: None)
+
+        operation = LongRunningOperation(mock.MagicMock(), poller_done_interval_ms=5000.0)
+        start_time = timeit.default_timer()
+        self.assertEqual(operation([poller, _FakePoller('other', delay=0.05)]), ['result', 'other'])
+        self.assertLess(timeit.default_timer() - start_time, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
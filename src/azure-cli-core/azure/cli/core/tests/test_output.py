@@ -9,7 +9,7 @@ import unittest
 from collections import OrderedDict
 from six import StringIO
 
-from azure.cli.core._output import OutputProducer
+from azure.cli.core._output import OutputProducer, AzOutputProducer, StreamedResult
 
 from knack.output import format_json, format_table, format_tsv
 from knack.util import CommandResultItem, normalize_newlines
@@ -178,6 +178,65 @@ qwerty  0b1f6472qwerty  True
         result = format_tsv(CommandResultItem([obj1, obj2]))
         self.assertEqual(result, '1\t2\n3\t4\n')
 
+    def _out_streamed(self, pages, formatter, **kwargs):
+        import mock
+        from knack.cli import CLI
+        output_producer = AzOutputProducer(cli_ctx=mock.MagicMock(spec=CLI))
+        output_producer.out(CommandResultItem(StreamedResult(pages), **kwargs), formatter=formatter, out_file=self.io)
+        return self.io.getvalue()
+
+    def test_out_streamed_json_matches_list_output(self):
+        pages = [[{'name': 'vm1', 'tags': {'a': 'b'}}, {'name': 'vm2', 'tags': None}], [], [{'name': 'vm3'}]]
+        expected = format_json(CommandResultItem([item for page in pages for item in page]))
+        self.assertEqual(self._out_streamed(pages, format_json), expected)
+
+        self.io = StringIO()
+        self.assertEqual(self._out_streamed([[]], format_json), '[]\n')
+
+    def test_out_streamed_tsv_matches_list_output(self):
+        pages = [[{'name': 'vm1', 'count': 1}], [{'name': 'vm2', 'count': 2}]]
+        self.assertEqual(self._out_streamed(pages, format_tsv), '1\tvm1\n2\tvm2\n')
+
+    def test_out_streamed_table_keeps_columns_of_first_page(self):
+        pages = [[{'name': 'long-name-1', 'count': 100}], [{'name': 'vm2', 'count': 2}, {'name': 'vm3', 'count': 30}]]
+        self.assertEqual(self._out_streamed(pages, format_table), normalize_newlines("""  Count  Name
+-------  -----------
+    100  long-name-1
+      2  vm2
+     30  vm3
+"""))
+
+    def test_out_streamed_table_lays_out_cells_with_spaces(self):
+        pages = [[{'name': 'a  b', 'state': 'on'}], [{'name': 'c  d  e', 'state': 'off'}]]
+        self.assertEqual(self._out_streamed(pages, format_table, table_transformer='[].{Name:name, State:state}'),
+                         normalize_newlines("""Name    State
+------  -------
+a  b    on
+c  d  e  off
+"""))
+
+    def test_out_streamed_table_repeats_headers_when_columns_change(self):
+        pages = [[{'name': 'vm1'}], [{'name': 'vm2', 'count': 2}]]
+        self.assertEqual(self._out_streamed(pages, format_table), normalize_newlines("""Name
+------
+vm1
+  Count  Name
+-------  ------
+      2  vm2
+"""))
+
+    def test_out_streamed_other_formats(self):
+        from knack.output import format_json_color
+        pages = [[{'name': 'vm1'}], [{'name': 'vm2'}]]
+        self.assertIn('vm2', self._out_streamed(pages, format_json_color))
+
+        # the legacy producer formats the whole result
+        output_producer = OutputProducer(formatter=format_json, file=self.io)
+        self.io = StringIO()
+        output_producer.file = self.io
+        output_producer.out(CommandResultItem(StreamedResult(pages)))
+        self.assertEqual(self.io.getvalue(), format_json(CommandResultItem([{'name': 'vm1'}, {'name': 'vm2'}])))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1292,9 +1292,9 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(creds_cache.retrieve_secret_of_service_principal(test_sp['servicePrincipalId']), None)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_add_new_sp_creds(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._profile.write_file_atomically', autospec=True)
+    @mock.patch('azure.cli.core._profile.FileLock', autospec=True)
+    def test_credscache_add_new_sp_creds(self, _, mock_write_file, mock_read_file):
         cli = TestCli()
         test_sp = {
             "servicePrincipalId": "myapp",
@@ -1306,7 +1306,6 @@ class TestProfile(unittest.TestCase):
             "servicePrincipalTenant": "mytenant2",
             "accessToken": "Secret2"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [self.token_entry1, test_sp]
         creds_cache = CredsCache(cli, async_persist=False)
 
@@ -1317,19 +1316,18 @@ class TestProfile(unittest.TestCase):
         token_entries = [e for _, e in creds_cache.adal_token_cache.read_items()]  # noqa: F812
         self.assertEqual(token_entries, [self.token_entry1])
         self.assertEqual(creds_cache._service_principal_creds, [test_sp, test_sp2])
-        mock_open_for_write.assert_called_with(mock.ANY, 'w+')
+        mock_write_file.assert_called_with(mock.ANY, mock.ANY, permissions=0o600)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_add_preexisting_sp_creds(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._profile.write_file_atomically', autospec=True)
+    @mock.patch('azure.cli.core._profile.FileLock', autospec=True)
+    def test_credscache_add_preexisting_sp_creds(self, _, mock_write_file, mock_read_file):
         cli = TestCli()
         test_sp = {
             "servicePrincipalId": "myapp",
             "servicePrincipalTenant": "mytenant",
             "accessToken": "Secret"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [test_sp]
         creds_cache = CredsCache(cli, async_persist=False)
 
@@ -1338,19 +1336,18 @@ class TestProfile(unittest.TestCase):
 
         # assert
         self.assertEqual(creds_cache._service_principal_creds, [test_sp])
-        self.assertFalse(mock_open_for_write.called)
+        self.assertFalse(mock_write_file.called)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_add_preexisting_sp_new_secret(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._profile.write_file_atomically', autospec=True)
+    @mock.patch('azure.cli.core._profile.FileLock', autospec=True)
+    def test_credscache_add_preexisting_sp_new_secret(self, _, mock_write_file, mock_read_file):
         cli = TestCli()
         test_sp = {
             "servicePrincipalId": "myapp",
             "servicePrincipalTenant": "mytenant",
             "accessToken": "Secret"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [test_sp]
         creds_cache = CredsCache(cli, async_persist=False)
 
@@ -1361,19 +1358,18 @@ class TestProfile(unittest.TestCase):
 
         # assert
         self.assertEqual(creds_cache._service_principal_creds, [new_creds])
-        self.assertTrue(mock_open_for_write.called)
+        self.assertTrue(mock_write_file.called)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
-    def test_credscache_remove_creds(self, _, mock_open_for_write, mock_read_file):
+    @mock.patch('azure.cli.core._profile.write_file_atomically', autospec=True)
+    @mock.patch('azure.cli.core._profile.FileLock', autospec=True)
+    def test_credscache_remove_creds(self, _, mock_write_file, mock_read_file):
         cli = TestCli()
         test_sp = {
             "servicePrincipalId": "myapp",
             "servicePrincipalTenant": "mytenant",
             "accessToken": "Secret"
         }
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [self.token_entry1, test_sp]
         creds_cache = CredsCache(cli, async_persist=False)
 
@@ -1390,14 +1386,14 @@ class TestProfile(unittest.TestCase):
         # assert #2
         self.assertEqual(creds_cache._service_principal_creds, [])
 
-        mock_open_for_write.assert_called_with(mock.ANY, 'w+')
-        self.assertEqual(mock_open_for_write.call_count, 2)
+        mock_write_file.assert_called_with(mock.ANY, mock.ANY, permissions=0o600)
+        self.assertEqual(mock_write_file.call_count, 2)
 
     @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
-    @mock.patch('os.fdopen', autospec=True)
-    @mock.patch('os.open', autospec=True)
+    @mock.patch('azure.cli.core._profile.write_file_atomically', autospec=True)
+    @mock.patch('azure.cli.core._profile.FileLock', autospec=True)
     @mock.patch('adal.AuthenticationContext', autospec=True)
-    def test_credscache_new_token_added_by_adal(self, mock_adal_auth_context, _, mock_open_for_write, mock_read_file):  # pylint: disable=line-too-long
+    def test_credscache_new_token_added_by_adal(self, mock_adal_auth_context, _, mock_write_file, mock_read_file):  # pylint: disable=line-too-long
         cli = TestCli()
         token_entry2 = {
             "accessToken": "new token",
@@ -1414,7 +1410,6 @@ class TestProfile(unittest.TestCase):
             return mock_adal_auth_context
 
         mock_adal_auth_context.acquire_token.side_effect = acquire_token_side_effect
-        mock_open_for_write.return_value = FileHandleStub()
         mock_read_file.return_value = [self.token_entry1]
         creds_cache = CredsCache(cli, auth_ctx_factory=get_auth_context, async_persist=False)
 
@@ -1428,10 +1423,73 @@ class TestProfile(unittest.TestCase):
             mock.ANY)
 
         # assert
-        mock_open_for_write.assert_called_with(mock.ANY, 'w+')
+        mock_write_file.assert_called_with(mock.ANY, mock.ANY, permissions=0o600)
         self.assertEqual(token, 'new token')
         self.assertEqual(token_type, token_entry2['tokenType'])
 
+    @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
+    @mock.patch('azure.cli.core._profile.FileLock', autospec=True)
+    def test_credscache_memoizes_unexpired_tokens(self, _, mock_read_file):
+        from datetime import datetime, timedelta
+        cli = TestCli()
+        mock_auth_context = mock.MagicMock()
+        mock_read_file.return_value = [self.token_entry1]
+        creds_cache = CredsCache(cli, auth_ctx_factory=lambda *_, **__: mock_auth_context, async_persist=False)
+
+        token_entry = {'tokenType': 'Bearer', 'accessToken': 'token1',
+                       'expiresOn': str(datetime.now() + timedelta(minutes=60))}
+        mock_auth_context.acquire_token.return_value = token_entry
+        mgmt_resource = 'https://management.core.windows.net/'
+        for _ in range(3):
+            self.assertEqual(creds_cache.retrieve_token_for_user(self.user1, self.tenant_id, mgmt_resource)[1],
+                             'token1')
+        self.assertEqual(mock_auth_context.acquire_token.call_count, 1)
+
+        # tokens about to expire go through ADAL again, so that they are refreshed
+        token_entry['expiresOn'] = str(datetime.now() + timedelta(minutes=2))
+        creds_cache.retrieve_token_for_user(self.user1, self.tenant_id, 'https://graph.windows.net/')
+        creds_cache.retrieve_token_for_user(self.user1, self.tenant_id, 'https://graph.windows.net/')
+        self.assertEqual(mock_auth_context.acquire_token.call_count, 3)
+
+        # logging out forgets the tokens
+        creds_cache.remove_cached_creds(self.user1)
+        with mock.patch('azure.cli.core._profile.write_file_atomically', autospec=True):
+            creds_cache.retrieve_token_for_user(self.user1, self.tenant_id, mgmt_resource)
+        self.assertEqual(mock_auth_context.acquire_token.call_count, 4)
+
+    @mock.patch('azure.cli.core._profile._load_tokens_from_file', autospec=True)
+    @mock.patch('azure.cli.core._profile.write_file_atomically', autospec=True)
+    @mock.patch('azure.cli.core._profile.FileLock', autospec=True)
+    def test_credscache_merges_token_file_on_write(self, mock_file_lock, mock_write_file, mock_read_file):
+        cli = TestCli()
+        test_sp = {
+            "servicePrincipalId": "myapp",
+            "servicePrincipalTenant": "mytenant",
+            "accessToken": "Secret"
+        }
+        token_entry2 = dict(self.token_entry1, userId='bar@bar.com')
+        refreshed_token_entry1 = dict(self.token_entry1, accessToken='refreshed', expiresOn='2016-03-31T05:26:56.610Z')
+        mock_read_file.return_value = [self.token_entry1]
+        creds_cache = CredsCache(cli, async_persist=False)
+        creds_cache.load_adal_token_cache()
+
+        # another CLI logged in a user and a service principal, and refreshed a token
+        mock_read_file.return_value = [refreshed_token_entry1, token_entry2, test_sp]
+        creds_cache.save_service_principal_cred(dict(test_sp, servicePrincipalId='myapp2'))
+
+        written = json.loads(mock_write_file.call_args[0][1])
+        self.assertEqual(len(written), 4)
+        self.assertIn(refreshed_token_entry1, written)
+        self.assertIn(token_entry2, written)
+        self.assertIn(test_sp, written)
+        self.assertTrue(mock_file_lock.called)
+
+        # what this CLI logged out is not merged back
+        creds_cache.remove_cached_creds('bar@bar.com')
+        written = json.loads(mock_write_file.call_args[0][1])
+        self.assertNotIn(token_entry2, written)
+        self.assertEqual(len(written), 3)
+
     @mock.patch('azure.cli.core._profile.get_file_json', autospec=True)
     def test_credscache_good_error_on_file_corruption(self, mock_read_file):
         mock_read_file.side_effect = ValueError('a bad error for you')
@@ -1492,18 +1550,6 @@ class TestProfile(unittest.TestCase):
         self.assertEqual(r.authority.url, aad_url + '/common')
 
 
-class FileHandleStub(object):  # pylint: disable=too-few-public-methods
-
-    def write(self, content):
-        pass
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, _2, _3, _4):
-        pass
-
-
 class SubscriptionStub(Subscription):  # pylint: disable=too-few-public-methods
 
     def __init__(self, id, display_name, state, tenant_id):  # pylint: disable=redefined-builtin
@@ -0,0 +1,77 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import mock
+
+from azure.cli.core import profiler
+
+
+class TestStartupProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        sys.path.insert(0, self.temp_dir)
+
+    def tearDown(self):
+        profiler.stop()
+        sys.path.remove(self.temp_dir)
+        for name in ['_profiled_outer', '_profiled_inner']:
+            sys.modules.pop(name, None)
+        shutil.rmtree(self.temp_dir)
+
+    def _write_module(self, name, content):
+        with open(os.path.join(self.temp_dir, name + '.py'), 'w') as f:
+            f.write(content)
+
+    def test_profiler_records_phases(self):
+        # phases are free while the profiler is not started
+        with profiler.phase('ignored'):
+            pass
+
+        profiler.start()
+        with profiler.phase('outer'):
+            with profiler.phase('inner'):
+                pass
+        report_path = os.path.join(self.temp_dir, 'report.json')
+        with mock.patch.dict(os.environ, {profiler.PROFILE_ENV_NAME: report_path}):
+            report = profiler.stop(['vm', 'list'])
+        with open(report_path) as f:
+            self.assertEqual(json.load(f), report)
+
+        self.assertEqual(report['command'], 'vm list')
+        self.assertEqual([(p['name'], p['depth']) for p in report['phases']], [('outer', 0), ('inner', 1)])
+        outer, inner = report['phases']
+        self.assertLessEqual(outer['start'], inner['start'])
+        self.assertLessEqual(inner['duration'], outer['duration'])
+        self.assertLessEqual(outer['duration'], report['total'])
+
+    @unittest.skipIf(sys.version_info < (3, 4), 'imports are timed on Python 3 only')
+    def test_profiler_records_imports(self):
+        self._write_module('_profiled_inner', 'import time\ntime.sleep(0.05)\n')
+        self._write_module('_profiled_outer', 'import _profiled_inner\nimport time\ntime.sleep(0.02)\n')
+
+        profiler.start()
+        import _profiled_outer  # pylint: disable=unused-variable
+        with mock.patch.dict(os.environ, {profiler.PROFILE_ENV_NAME: ''}):
+            report = profiler.stop()
+
+        imports = {i['module']: i for i in report['imports']}
+        inner, outer = imports['_profiled_inner'], imports['_profiled_outer']
+        self.assertGreaterEqual(inner['self'], 0.05)
+        self.assertGreaterEqual(outer['cumulative'], inner['cumulative'] + 0.02)
+        self.assertLess(outer['self'], inner['self'])
+        import_timer_type = profiler._ImportTimer  # pylint: disable=protected-access
+        self.assertFalse([f for f in sys.meta_path if isinstance(f, import_timer_type)])
+
+
+if __name__ == '__main__':
+    unittest.main()
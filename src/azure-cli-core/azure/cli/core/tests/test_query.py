@@ -0,0 +1,85 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import collections
+import copy
+import unittest
+
+import jmespath
+import mock
+from knack.util import todict
+from msrest.serialization import Model
+
+from azure.cli.core._query import get_query_selection, todict_selected
+from azure.cli.core.commands import AzCliCommandInvoker
+from azure.cli.core.extensions.transform import TRANSFORMED_FIELDS, _add_resource_group
+
+
+class _Profile(Model):
+    _attribute_map = {'vm_size': {'key': 'vmSize', 'type': 'str'}, 'zones': {'key': 'zones', 'type': '[str]'}}
+
+    def __init__(self, vm_size, zones):
+        super(_Profile, self).__init__()
+        self.vm_size = vm_size
+        self.zones = zones
+
+
+class _Resource(Model):
+    _attribute_map = {'id': {'key': 'id', 'type': 'str'}, 'name': {'key': 'name', 'type': 'str'},
+                      'tags': {'key': 'tags', 'type': '{str}'}, 'profile': {'key': 'profile', 'type': '_Profile'},
+                      'additional_properties': {'key': '', 'type': '{object}'}}
+
+    def __init__(self, name, location, tags, profile):
+        super(_Resource, self).__init__()
+        self.id = '/subscriptions/sub/resourceGroups/rg_{}/providers/Microsoft.Compute/virtualMachines/{}'.format(
+            location, name)
+        self.name = name
+        self.tags = tags
+        self.profile = profile
+        self.additional_properties = {'location': location}
+
+
+def _get_resources():
+    return [_Resource('vm1', 'westus', {'env': 'prod'}, _Profile('Standard_DS1_v2', ['1'])),
+            _Resource('vm2', 'eastus', {}, _Profile('Standard_DS2_v2', [])),
+            _Resource('vm3', 'westus', None, None)]
+
+
+class TestQuerySelection(unittest.TestCase):
+
+    def _query(self, query, converted):
+        result = copy.deepcopy(converted)
+        _add_resource_group(result)
+        return jmespath.compile(query).search(result, jmespath.Options(collections.OrderedDict))
+
+    def test_query_selection_gives_the_same_results(self):
+        post_processor = AzCliCommandInvoker.remove_additional_prop_layer
+        full = todict(_get_resources(), post_processor)
+        queries = ['[].name', '[0].profile.vmSize', "[?location=='westus'].{n:name, rg:resourceGroup}",
+                   '[].[name, tags.env]', '[?tags].name', '[?!profile].id', '[*].tags', '@', '[].tags.*',
+                   'length(@)', 'sort_by(@, &name)[].profile.zones', 'max_by(@, &name).id', 'map(&name, @)',
+                   "[?name=='vm2'] | [0].profile", '[].profile.zones[]', '[1:].name', 'keys([0])',
+                   "[?contains(name, '2') || location=='westus'].name", '[].{n:name, p:profile}.p.vmSize']
+        for query in queries:
+            selection = get_query_selection(jmespath.compile(query))
+            pruned = todict_selected(_get_resources(), selection, post_processor, TRANSFORMED_FIELDS)
+            self.assertEqual(self._query(query, pruned), self._query(query, full), query)
+
+    def test_query_selection_only_converts_the_fields_read(self):
+        selection = get_query_selection(jmespath.compile("[?location=='westus'].{n:name, rg:resourceGroup}"))
+        self.assertEqual(selection, {'location': None, 'name': None, 'resourceGroup': None})
+        with mock.patch('azure.cli.core._query.todict', wraps=todict) as todict_mock:
+            result = todict_selected(_get_resources(), selection, AzCliCommandInvoker.remove_additional_prop_layer,
+                                     TRANSFORMED_FIELDS)
+        # the resource group is computed from the id
+        self.assertEqual(result[0], {'id': _get_resources()[0].id, 'name': 'vm1', 'location': 'westus'})
+        # neither the tags nor the profiles were converted
+        self.assertFalse([c for c in todict_mock.call_args_list if isinstance(c[0][0], (_Profile, dict))])
+
+        self.assertIsNone(get_query_selection(jmespath.compile('length(@)')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from azure.cli.core._session import Session
+
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.filename = os.path.join(self.temp_dir, 'azureProfile.json')
+
+    def _read_file(self):
+        with io.open(self.filename, encoding='utf-8-sig') as f:
+            return json.load(f)
+
+    def test_session_saves_modifications(self):
+        session = Session()
+        session.load(self.filename)
+        self.assertEqual(self._read_file(), {})
+
+        session['key1'] = 'value1'
+        self.assertEqual(self._read_file(), {'key1': 'value1'})
+        del session['key1']
+        self.assertEqual(self._read_file(), {})
+        # no temporary file is left behind
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ['azureProfile.json', 'azureProfile.json.lock'])
+
+    def test_session_transaction_saves_once(self):
+        session = Session()
+        session.load(self.filename)
+
+        with mock.patch.object(session, 'save', wraps=session.save) as save:
+            with session.transaction():
+                session['key1'] = 'value1'
+                with session.transaction():
+                    session['key2'] = 'value2'
+                self.assertFalse(save.called)
+            save.assert_called_once_with()
+            self.assertEqual(self._read_file(), {'key1': 'value1', 'key2': 'value2'})
+
+            # nothing to save
+            with session.transaction():
+                pass
+            save.assert_called_once_with()
+
+    def test_session_reloads_changed_file_only(self):
+        session = Session()
+        session.load(self.filename)
+        session['key1'] = 'value1'
+
+        with mock.patch('json.load', wraps=json.load) as json_load:
+            session.load(self.filename)
+            self.assertFalse(json_load.called)
+
+            # another process changed the file
+            other_session = Session()
+            other_session.load(self.filename)
+            other_session['key1'] = 'value2'
+            session.load(self.filename)
+            self.assertEqual(session['key1'], 'value2')
+
+    def test_session_keeps_the_updates_of_other_processes(self):
+        session = Session()
+        session.load(self.filename)
+        session['key1'] = 'value1'
+        session['key2'] = 'value2'
+
+        # another process updates other keys meanwhile
+        other_session = Session()
+        other_session.load(self.filename)
+        with other_session.transaction():
+            other_session['key2'] = 'other2'
+            other_session['key3'] = 'other3'
+
+        with session.transaction():
+            session['key1'] = 'new1'
+            session['key4'] = 'new4'
+        self.assertEqual(self._read_file(), {'key1': 'new1', 'key2': 'other2', 'key3': 'other3', 'key4': 'new4'})
+        self.assertEqual(session['key2'], 'other2')
+
+    def test_session_keeps_the_deletions_of_other_processes(self):
+        session = Session()
+        session.load(self.filename)
+        session['key1'] = 'value1'
+        session['key2'] = {'nested': 'value2'}
+
+        other_session = Session()
+        other_session.load(self.filename)
+        del other_session['key1']
+
+        # an indirect modification, followed by a save
+        session['key2']['nested'] = 'new2'
+        session.save()
+        self.assertEqual(self._read_file(), {'key2': {'nested': 'new2'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,9 +11,11 @@ import mock
 import tempfile
 from datetime import date, time, datetime
 
+from knack.util import CLIError
+
 from azure.cli.core.util import \
     (get_file_json, truncate_text, shell_safe_json_parse, b64_to_hex, hash_string, random_string,
-     open_page_in_browser, can_launch_browser)
+     open_page_in_browser, can_launch_browser, write_file_atomically, FileLock)
 
 
 class TestUtils(unittest.TestCase):
@@ -171,6 +173,38 @@ class TestUtils(unittest.TestCase):
             result = can_launch_browser()
             self.assertFalse(result)
 
+    def test_write_file_atomically(self):
+        import os
+        import shutil
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        pathname = os.path.join(directory, 'accessTokens.json')
+
+        with FileLock(pathname + '.lock'):
+            write_file_atomically(pathname, 'first', permissions=0o600)
+            write_file_atomically(pathname, 'second')
+        with open(pathname) as f:
+            self.assertEqual(f.read(), 'second')
+        if sys.platform != 'win32':
+            # the mode of the replaced file is kept
+            self.assertEqual(os.stat(pathname).st_mode & 0o777, 0o600)
+        # no temporary file is left behind
+        self.assertEqual(sorted(os.listdir(directory)), ['accessTokens.json', 'accessTokens.json.lock'])
+
+    def test_file_lock_gives_up_on_windows(self):
+        import os
+        import shutil
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        msvcrt = mock.MagicMock()
+        msvcrt.locking.side_effect = OSError('Resource deadlock avoided')
+
+        with mock.patch.dict('sys.modules', {'fcntl': None, 'msvcrt': msvcrt}):
+            with self.assertRaises(CLIError):
+                with FileLock(os.path.join(directory, 'accessTokens.json.lock')):
+                    self.fail('the lock was not acquired')
+        self.assertEqual(msvcrt.locking.call_count, 6)
+
 
 class TestBase64ToHex(unittest.TestCase):
 
@@ -138,6 +138,90 @@ def read_file_content(file_path, allow_binary=False):
     raise CLIError('Failed to decode file {} - unknown decoding'.format(file_path))
 
 
+def write_file_atomically(file_path, content, permissions=None, encoding='utf-8'):
+    """ Replace the content of a file in one step, so that readers never see a partially written file.
+
+    :param int permissions: the mode of the file. Defaults to the mode of the file being replaced, or to the mode
+                            of a newly created file.
+    """
+    import io
+    import os
+    import tempfile
+    file_path = os.path.realpath(file_path)
+    if permissions is None:
+        try:
+            permissions = os.stat(file_path).st_mode & 0o777
+        except OSError:
+            umask = os.umask(0)
+            os.umask(umask)
+            permissions = 0o666 & ~umask
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix=os.path.basename(file_path) + '.')
+    try:
+        os.chmod(temp_path, permissions)
+        with io.open(fd, 'w', encoding=encoding) as temp_file:
+            temp_file.write(six.text_type(content))
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        if hasattr(os, 'replace'):
+            os.replace(temp_path, file_path)  # pylint: disable=no-member
+        else:
+            if sys.platform == 'win32' and os.path.exists(file_path):
+                os.remove(file_path)
+            os.rename(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+_FILE_LOCK_ATTEMPTS = 6
+
+
+class FileLock(object):
+    """ Exclusive lock shared by all the processes which use the same lock file.
+
+    The lock is not reentrant: a process must release it before acquiring it again.
+    """
+
+    def __init__(self, lock_file_path):
+        self.lock_file_path = lock_file_path
+        self._lock_file = None
+
+    def __enter__(self):
+        self._lock_file = open(self.lock_file_path, 'a')
+        try:
+            import fcntl
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        except ImportError:
+            import msvcrt
+            self._lock_file.seek(0)
+            for attempt in range(_FILE_LOCK_ATTEMPTS):
+                try:
+                    # blocks for up to 10 seconds before raising
+                    msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_LOCK, 1)  # pylint: disable=no-member
+                    break
+                except (IOError, OSError) as ex:
+                    # the holder of the lock may have stopped responding, or the file cannot be locked at all
+                    if attempt == _FILE_LOCK_ATTEMPTS - 1:
+                        self._lock_file.close()
+                        self._lock_file = None
+                        raise CLIError("Failed to lock '{}': {}".format(self.lock_file_path, ex))
+        return self
+
+    def __exit__(self, *args):
+        try:
+            try:
+                import fcntl
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+            except ImportError:
+                import msvcrt
+                self._lock_file.seek(0)
+                msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_UNLCK, 1)  # pylint: disable=no-member
+        finally:
+            self._lock_file.close()
+            self._lock_file = None
+
+
 def shell_safe_json_parse(json_or_dict_string, preserve_order=False):
     """ Allows the passing of JSON or Python dictionary strings. This is needed because certain
     JSON strings in CMD shell are not received in main's argv. This allows the user to specify
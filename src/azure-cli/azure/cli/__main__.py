@@ -4,14 +4,31 @@
 # --------------------------------------------------------------------------------------------
 
 import sys
+import timeit
 import uuid
 
-from knack.completion import ARGCOMPLETE_ENV_NAME
-from knack.log import get_logger
+start_time = timeit.default_timer()
 
-from azure.cli.core import get_default_cli
+# The imports below are timed, or wait for the command to be forwarded to the daemon.
+# pylint: disable=wrong-import-position
+from azure.cli.core import profiler  # noqa: E402
+from azure.cli.core.daemon import forward_to_daemon  # noqa: E402
 
-import azure.cli.core.telemetry as telemetry
+# Profile the startup of this process rather than forward the command to the daemon.
+if profiler.is_requested():
+    profiler.start(start_time).add_phase('import azure.cli.core', start_time, timeit.default_timer())
+else:
+    # Run the command in the daemon if one is running, before anything else is loaded.
+    daemon_exit_code = forward_to_daemon(sys.argv[1:])
+    if daemon_exit_code is not None:
+        sys.exit(daemon_exit_code)
+
+from knack.completion import ARGCOMPLETE_ENV_NAME  # noqa: E402
+from knack.log import get_logger  # noqa: E402
+
+from azure.cli.core import get_default_cli  # noqa: E402
+
+import azure.cli.core.telemetry as telemetry  # noqa: E402
 
 
 # A workaround for https://bugs.python.org/issue32502 (https://github.com/Azure/azure-cli/issues/5184)
@@ -29,7 +46,8 @@ def cli_main(cli, args):
     return cli.invoke(args)
 
 
-az_cli = get_default_cli()
+with profiler.phase('create CLI'):
+    az_cli = get_default_cli()
 
 telemetry.set_application(az_cli, ARGCOMPLETE_ENV_NAME)
 
@@ -49,3 +67,4 @@ except KeyboardInterrupt:
     sys.exit(1)
 finally:
     telemetry.conclude()
+    profiler.stop(sys.argv[1:])
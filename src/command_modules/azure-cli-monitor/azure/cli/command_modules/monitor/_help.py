@@ -131,6 +131,10 @@ helps['monitor metrics'] = """
 helps['monitor metrics list'] = """
     type: command
     short-summary: List the metric values for a resource.
+    long-summary: >
+        When several resources are given with --resource, or selected with --resource-type and optionally
+        --resource-group, their metrics are retrieved concurrently and listed as rows with the resource, metric,
+        dimensions, timestamp, aggregation and value. The rows are printed one resource at a time.
     parameters:
         - name: --aggregation
           type: string
@@ -177,6 +181,14 @@ helps['monitor metrics list'] = """
           text: >
               az monitor metrics list --resource {ResourceName} --metric SuccessE2ELatency \\
                                       --filter "ApiName eq 'DeleteContainer' and GeoType eq '*'"
+        - name: List the CPU usage of all the VMs of a resource group for the past hour as tab-separated values
+          text: >
+              az monitor metrics list --resource-type Microsoft.Compute/virtualMachines -g {ResourceGroup} \\
+                                      --metric "Percentage CPU" -o tsv
+        - name: List the ingress and egress of several storage accounts
+          text: >
+              az monitor metrics list --resource {ResourceId1} {ResourceId2} --metric Ingress Egress \\
+                                      --aggregation Total
         - name: List transactions of a storage account per day since 2017-01-01
           text: >
               az monitor metrics list --resource {ResourceName} --metric Transactions \\
@@ -731,6 +743,25 @@ helps['monitor activity-log alert scope remove'] = """
           short-summary: The scopes to remove
 """
 
+helps['monitor activity-log list'] = """
+    type: command
+    short-summary: List the events of the activity log.
+    long-summary: >
+        With --time-slices, the time range is split into slices which are retrieved concurrently. The events are
+        still listed newest first, and are printed one slice at a time. With --since-last-run, only the events which
+        were not listed by the previous run of the same query are listed. The newest event listed is recorded in the
+        configuration directory, and the next run starts 15 minutes before it instead of at --start-time, so that the
+        events which are listed late are not missed.
+    examples:
+        - name: List the events of a resource group of the last week, retrieving one day at a time concurrently.
+          text: >
+              az monitor activity-log list -g {ResourceGroup} --start-time 2018-07-01T00:00:00Z \\
+                  --end-time 2018-07-08T00:00:00Z --time-slices 7 --max-events 10000 -o tsv
+        - name: List the events of a resource group which are newer than the ones listed by the previous run.
+          text: >
+              az monitor activity-log list -g {ResourceGroup} --since-last-run
+"""
+
 helps['monitor activity-log list-categories'] = """
     type: command
     short-summary: List the event categories of activity logs.
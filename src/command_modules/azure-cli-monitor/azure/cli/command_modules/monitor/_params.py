@@ -92,9 +92,10 @@ def load_arguments(self, _):
 
     with self.argument_context('monitor metrics list') as c:
         from .validators import (process_metric_timespan, process_metric_aggregation, process_metric_result_type,
-                                 process_metric_dimension, validate_metric_names)
+                                 process_metric_dimension, validate_metric_names, process_metric_resources)
         from azure.mgmt.monitor.models.monitor_management_client_enums import AggregationType
-        c.resource_parameter('resource_uri', arg_group='Target Resource')
+        c.resource_parameter('resource_uri', arg_group='Target Resource', required=False, skip_validator=True)
+        c.argument('resource_uri', options_list=['--resource'], nargs='+', validator=process_metric_resources, help='Names or IDs of the target resources. Without it, the resources of --resource-type in --resource-group or the subscription.')
         c.extra('start_time', options_list=['--start-time'], validator=process_metric_timespan, arg_group='Time')
         c.extra('end_time', options_list=['--end-time'], arg_group='Time')
         c.extra('metadata', options_list=['--metadata'], action='store_true', validator=process_metric_result_type)
@@ -224,6 +225,8 @@ def load_arguments(self, _):
     # region ActivityLog
     with self.argument_context('monitor activity-log list') as c:
         c.argument('select', nargs='+')
+        c.argument('time_slices', type=int)
+        c.argument('since_last_run', action='store_true')
 
     with self.argument_context('monitor activity-log list', arg_group='OData Filter') as c:
         c.argument('correlation_id')
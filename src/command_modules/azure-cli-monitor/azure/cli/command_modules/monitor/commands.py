@@ -86,8 +86,8 @@ def load_command_table(self, _):
         client_factory=cf_log_profiles,
         exception_handler=monitor_exception_handler)
 
-    metric_operations_sdk = CliCommandType(
-        operations_tmpl='azure.mgmt.monitor.operations.metrics_operations#MetricsOperations.{}',
+    metric_custom = CliCommandType(
+        operations_tmpl='azure.cli.command_modules.monitor.operations.metrics#{}',
         client_factory=cf_metrics,
         exception_handler=monitor_exception_handler)
 
@@ -185,5 +185,5 @@ def load_command_table(self, _):
 
     with self.command_group('monitor metrics') as g:
         from .transformers import metrics_table, metrics_definitions_table
-        g.command('list', 'list', command_type=metric_operations_sdk, table_transformer=metrics_table)
+        g.command('list', 'list_metrics', command_type=metric_custom, table_transformer=metrics_table)
         g.command('list-definitions', 'list', command_type=metric_definitions_sdk, table_transformer=metrics_definitions_table)
@@ -3,12 +3,22 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
-from azure.cli.command_modules.monitor.util import validate_time_range_and_add_defaults
+import os
 
+from azure.cli.command_modules.monitor.operations.paging import GeneratedPaged
+from azure.cli.command_modules.monitor.util import (validate_time_range_and_add_defaults, get_time_range,
+                                                    DATE_TIME_FORMAT)
 
-def list_activity_log(client, filters=None, correlation_id=None, resource_group=None, resource_id=None,
+WATERMARK_FILE_NAME = 'activityLogWatermarks.json'
+_MAX_CONCURRENT_REQUESTS = 8
+_TIME_RANGE_FILTER = 'eventTimestamp ge {} and eventTimestamp le {}'
+_WATERMARK_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+_WATERMARK_LOOKBACK_MINUTES = 15  # events may be listed some minutes after their timestamp
+
+
+def list_activity_log(cmd, client, filters=None, correlation_id=None, resource_group=None, resource_id=None,
                       resource_provider=None, start_time=None, end_time=None, caller=None, status=None, max_events=50,
-                      select=None):
+                      select=None, time_slices=None, since_last_run=False):
     """Provides the list of activity log.
     :param str filters: The OData filter for the list activity logs. If this argument is provided
                         OData Filter Arguments will be ignored
@@ -26,27 +36,181 @@ def list_activity_log(client, filters=None, correlation_id=None, resource_group=
     :param str status: The status value to query (ex: Failed)
     :param str max_events: The maximum number of records to be returned by the command
     :param str select: The list of event names
+    :param int time_slices: The number of slices the time range is split into, which are retrieved concurrently
+    :param bool since_last_run: Only list the events which are newer than the ones listed by the previous run of
+                                the same query
     """
-    if filters:
-        odata_filters = filters
-    else:
-        from knack.util import CLIError
+    from knack.util import CLIError
+    if filters and (time_slices or since_last_run):
+        raise CLIError('usage error: --filters cannot be combined with --time-slices or --since-last-run')
+    if not filters:
         collection = [correlation_id, resource_group, resource_id, resource_provider]
         if not _single(collection):
             raise CLIError("usage error: [--correlation-id ID | --resource-group NAME | "
                            "--resource-id ID | --resource-provider PROVIDER]")
 
-        odata_filters = _build_activity_log_odata_filter(correlation_id, resource_group, resource_id, resource_provider,
-                                                         start_time, end_time, caller, status)
-
     if max_events:
         max_events = int(max_events)
 
+    if time_slices or since_last_run:
+        conditions = _add_activity_log_conditions('', correlation_id, resource_group, resource_id, resource_provider,
+                                                  caller, status)
+        start_time, end_time = get_time_range(start_time, end_time)
+        watermark = None
+        if since_last_run:
+            # the events are identified and compared by their id and timestamp, which are selected if needed
+            if select:
+                select = list(select) + [x for x in ['eventDataId', 'eventTimestamp'] if x not in select]
+            watermark = _ActivityLogWatermark(cmd.cli_ctx, '{}{} select {}'.format(
+                client.config.subscription_id, conditions, _activity_log_select_filter_builder(select)))
+            if watermark.timestamp:
+                start_time = watermark.timestamp - _get_watermark_lookback()
+        elif select and 'eventTimestamp' not in select:
+            select = list(select) + ['eventTimestamp']
+        return TimeSlicedActivityLog(client, start_time, end_time, int(time_slices or 1), conditions,
+                                     _activity_log_select_filter_builder(select), max_events, watermark)
+
+    odata_filters = filters or _build_activity_log_odata_filter(correlation_id, resource_group, resource_id,
+                                                                resource_provider, start_time, end_time, caller,
+                                                                status)
     select_filters = _activity_log_select_filter_builder(select)
     activity_log = client.list(filter=odata_filters, select=select_filters)
     return _limit_results(activity_log, max_events)
 
 
+class TimeSlicedActivityLog(GeneratedPaged):
+    """ The events of a time range, newest first like the events of a single query. The time range is split into
+    slices which are retrieved concurrently, and the events are returned one slice at a time.
+
+    With a watermark, the events it has seen are skipped, and it is moved to the newest event once all the events
+    were returned.
+    """
+
+    def __init__(self, client, start_time, end_time, time_slices, conditions, select, max_events, watermark=None):
+        super(TimeSlicedActivityLog, self).__init__()
+        self._client = client
+        self._conditions = conditions
+        self._select = select
+        self._max_events = max_events
+        self._watermark = watermark
+        # the time filters only have a precision of seconds
+        self._slices = _get_time_slices(start_time.replace(microsecond=0), end_time.replace(microsecond=0),
+                                        time_slices)
+
+    def _list_slice(self, slice_start, slice_end, newest):
+        """ Lists the events of a slice, up to one more than the command returns to tell whether it is truncated. """
+        time_filter = _TIME_RANGE_FILTER.format(slice_start.strftime(DATE_TIME_FORMAT),
+                                                slice_end.strftime(DATE_TIME_FORMAT))
+        events = []
+        for event in self._client.list(filter=time_filter + self._conditions, select=self._select):
+            timestamp = _to_utc(event.event_timestamp)
+            # the events at the end of a slice are also listed by the next newer slice
+            if not newest and timestamp >= slice_end:
+                continue
+            if self._watermark and self._watermark.has_seen(event.event_data_id):
+                continue
+            events.append(event)
+            if self._max_events and len(events) > self._max_events:
+                break
+        return events
+
+    def _iter_pages(self):
+        if not self._slices:
+            yield []
+            return
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=min(len(self._slices), _MAX_CONCURRENT_REQUESTS))
+        futures = [executor.submit(self._list_slice, slice_start, slice_end, index == 0)
+                   for index, (slice_start, slice_end) in enumerate(self._slices)]
+        count = 0
+        listed_events = []
+        try:
+            for future in futures:
+                events = future.result()
+                if self._watermark:
+                    listed_events.extend(events)
+                if self._max_events and count + len(events) > self._max_events:
+                    yield events[:self._max_events - count]
+                    if self._watermark:
+                        from knack.log import get_logger
+                        get_logger(__name__).warning(
+                            'Only the newest %s events were listed, the others will not be listed by the next '
+                            'run either. Increase --max-events to list all the events since the last run.',
+                            self._max_events)
+                    break
+                count += len(events)
+                yield events
+            else:
+                if self._watermark and listed_events:
+                    self._watermark.move(listed_events)
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+
+class _ActivityLogWatermark(object):
+    """ The timestamp of the newest event listed by a query, and the ids and timestamps of the events listed within
+    the lookback before it, stored in the configuration directory. The next run lists the events from the start of
+    the lookback, so that the events which are listed late are not missed, and skips the events listed already.
+    """
+
+    def __init__(self, cli_ctx, key):
+        from azure.cli.core._session import Session
+        self._key = key
+        self._session = Session()
+        self._session.load(os.path.join(cli_ctx.config.config_dir, WATERMARK_FILE_NAME))
+        value = self._session.get(key) or {}
+        self.timestamp = _parse_watermark_time(value.get('timestamp'))
+        self.events = {event_id: _parse_watermark_time(timestamp)
+                       for event_id, timestamp in (value.get('events') or {}).items()}
+
+    def has_seen(self, event_id):
+        return event_id in self.events
+
+    def move(self, events):
+        """ Moves the watermark to the newest of the events, and keeps the events within the lookback before it. """
+        listed = {e.event_data_id: _to_utc(e.event_timestamp) for e in events}
+        timestamp = max(list(listed.values()) + ([self.timestamp] if self.timestamp else []))
+        lookback_start = timestamp - _get_watermark_lookback()
+        seen = dict(self.events)
+        seen.update(listed)
+        # read the file again, it may have been modified by another query since it was loaded
+        self._session.load(self._session.filename)
+        self._session[self._key] = {
+            'timestamp': timestamp.strftime(_WATERMARK_FORMAT),
+            'events': {event_id: event_timestamp.strftime(_WATERMARK_FORMAT)
+                       for event_id, event_timestamp in seen.items() if event_timestamp >= lookback_start}}
+
+
+def _get_watermark_lookback():
+    from datetime import timedelta
+    return timedelta(minutes=_WATERMARK_LOOKBACK_MINUTES)
+
+
+def _parse_watermark_time(value):
+    from datetime import datetime
+    return datetime.strptime(value, _WATERMARK_FORMAT) if value else None
+
+
+def _to_utc(timestamp):
+    """ Converts a timestamp deserialized by the SDK to a naive UTC datetime. """
+    if timestamp.utcoffset() is not None:
+        timestamp = (timestamp - timestamp.utcoffset()).replace(tzinfo=None)
+    return timestamp
+
+
+def _get_time_slices(start_time, end_time, count):
+    """ Splits a time range into slices of whole seconds, newest first. """
+    from datetime import timedelta
+    seconds = int((end_time - start_time).total_seconds())
+    if seconds <= 0:
+        return []
+    count = max(1, min(count, seconds))
+    bounds = [start_time + timedelta(seconds=seconds * i // count) for i in range(count)] + [end_time]
+    return list(reversed(list(zip(bounds[:-1], bounds[1:]))))
+
+
 def _build_activity_log_odata_filter(correlation_id=None, resource_group=None, resource_id=None, resource_provider=None,
                                      start_time=None, end_time=None, caller=None, status=None):
     """Builds odata filter string.
@@ -61,9 +225,13 @@ def _build_activity_log_odata_filter(correlation_id=None, resource_group=None, r
     :param str caller: The caller to look for when querying
     :param str status: The status value to query (ex: Failed)
     """
-    formatter = "eventTimestamp ge {} and eventTimestamp le {}"
-    odata_filters = validate_time_range_and_add_defaults(start_time, end_time, formatter=formatter)
+    odata_filters = validate_time_range_and_add_defaults(start_time, end_time, formatter=_TIME_RANGE_FILTER)
+    return _add_activity_log_conditions(odata_filters, correlation_id, resource_group, resource_id, resource_provider,
+                                        caller, status)
+
 
+def _add_activity_log_conditions(odata_filters, correlation_id=None, resource_group=None, resource_id=None,
+                                 resource_provider=None, caller=None, status=None):
     if correlation_id:
         odata_filters = _build_odata_filter(odata_filters, 'correlation_id', correlation_id, 'correlationId')
     elif resource_group:
@@ -0,0 +1,111 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from collections import OrderedDict
+
+from knack.log import get_logger
+
+from azure.cli.command_modules.monitor.operations.paging import GeneratedPaged
+
+logger = get_logger(__name__)
+
+_MAX_CONCURRENT_REQUESTS = 16
+_AGGREGATIONS = [('average', 'Average'), ('minimum', 'Minimum'), ('maximum', 'Maximum'), ('total', 'Total'),
+                 ('count', 'Count')]
+
+
+# pylint: disable=redefined-builtin
+def list_metrics(cmd, client, resource_uri=None, resource_group_name=None, resource_type=None, timespan=None,
+                 interval=None, metricnames=None, aggregation=None, top=None, orderby=None, filter=None,
+                 result_type=None, metricnamespace=None):
+    """ Lists the metric values of a resource, or of several resources as rows of their values. """
+    kwargs = {'timespan': timespan, 'interval': interval, 'metricnames': metricnames, 'aggregation': aggregation,
+              'top': top, 'orderby': orderby, 'filter': filter, 'result_type': result_type,
+              'metricnamespace': metricnamespace}
+    if resource_uri and len(resource_uri) == 1:
+        return client.list(resource_uri[0], **kwargs)
+
+    if result_type:
+        from knack.util import CLIError
+        raise CLIError('usage error: --metadata can only be used with a single --resource')
+    if not resource_uri:
+        resource_uri = _list_resource_ids(cmd.cli_ctx, resource_group_name, resource_type)
+        if not resource_uri:
+            logger.warning("No resources of type '%s' were found.", resource_type)
+    return MultiResourceMetrics(client, resource_uri, kwargs)
+
+
+class MultiResourceMetrics(GeneratedPaged):
+    """ The metric values of several resources, one row per resource, metric, time series, time and aggregation.
+
+    The metrics of the resources are retrieved concurrently with the same client, and the rows are returned one
+    resource at a time, in the order of the resources.
+    """
+
+    def __init__(self, client, resource_ids, kwargs):
+        super(MultiResourceMetrics, self).__init__()
+        self._client = client
+        self._resource_ids = resource_ids
+        self._kwargs = kwargs
+
+    def _list_rows(self, resource_id):
+        from msrest.exceptions import HttpOperationError
+        try:
+            response = self._client.list(resource_id, **self._kwargs)
+        except HttpOperationError as ex:
+            logger.error("Failed to retrieve the metrics of '%s': %s", resource_id, ex.message)
+            return None
+        return _get_metric_rows(resource_id, response)
+
+    def _iter_pages(self):
+        if not self._resource_ids:
+            yield []
+            return
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=min(len(self._resource_ids), _MAX_CONCURRENT_REQUESTS))
+        futures = [executor.submit(self._list_rows, resource_id) for resource_id in self._resource_ids]
+        failed = 0
+        try:
+            for future in futures:
+                rows = future.result()
+                if rows is None:
+                    failed += 1
+                    rows = []
+                yield rows
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        if failed:
+            logger.warning('The metrics of %d of %d resources could not be retrieved.', failed,
+                           len(self._resource_ids))
+
+
+def _get_metric_rows(resource_id, response):
+    rows = []
+    for metric in response.value:
+        for series in metric.timeseries or []:
+            dimensions = ','.join('{}={}'.format(m.name.value, m.value) for m in series.metadatavalues or [])
+            for data in series.data or []:
+                for field, aggregation in _AGGREGATIONS:
+                    value = getattr(data, field)
+                    if value is None:
+                        continue
+                    rows.append(OrderedDict([('resource', resource_id), ('metric', metric.name.value),
+                                             ('dimensions', dimensions), ('timestamp', data.time_stamp),
+                                             ('aggregation', aggregation), ('value', value)]))
+    return rows
+
+
+def _list_resource_ids(cli_ctx, resource_group_name, resource_type):
+    from azure.cli.core.commands.client_factory import get_mgmt_service_client
+    from azure.cli.core.profiles import ResourceType
+    client = get_mgmt_service_client(cli_ctx, ResourceType.MGMT_RESOURCE_RESOURCES).resources
+    odata_filter = "resourceType eq '{}'".format(resource_type)
+    if resource_group_name:
+        resources = client.list_by_resource_group(resource_group_name, filter=odata_filter)
+    else:
+        resources = client.list(filter=odata_filter)
+    return [r.id for r in resources]
@@ -0,0 +1,27 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from msrest.paging import Paged
+
+
+class GeneratedPaged(Paged):
+    """ A result whose pages are produced by the generator `_iter_pages`, which yields at least one page.
+
+    Like the results of the list operations of the SDK, it is printed page by page to the json, table and tsv output.
+    """
+
+    def __init__(self):
+        super(GeneratedPaged, self).__init__(None, {})
+        self._pages = None
+
+    def _iter_pages(self):
+        raise NotImplementedError()
+
+    def advance_page(self):
+        if self._pages is None:
+            self._pages = self._iter_pages()
+        self.current_page = next(self._pages)
+        self._current_page_iter_index = 0
+        return self.current_page
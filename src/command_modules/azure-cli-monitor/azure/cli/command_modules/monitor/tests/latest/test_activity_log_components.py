@@ -5,12 +5,16 @@
 
 import unittest
 import re
+import shutil
+import tempfile
+from datetime import datetime, timedelta
 
+import mock
 from knack.util import CLIError
 
 from azure.cli.command_modules.monitor.operations.activity_log import (_build_activity_log_odata_filter,
                                                                        _activity_log_select_filter_builder,
-                                                                       _build_odata_filter)
+                                                                       _build_odata_filter, list_activity_log)
 
 
 class TestActivityLogODataBuilderComponents(unittest.TestCase):
@@ -70,3 +74,86 @@ class TestActivityLogODataBuilderComponents(unittest.TestCase):
 
         with self.assertRaises(CLIError):
             _build_odata_filter(default_filter, field_name, None, field_label)
+
+
+class _ActivityLogClient(object):
+    """ Lists the events of a time range from memory, newest first like the service. """
+
+    def __init__(self, events):
+        self.events = events
+        self.filters = []
+        self.config = mock.MagicMock(subscription_id='sub')
+
+    def list(self, filter, select=None):  # pylint: disable=redefined-builtin
+        self.filters.append(filter)
+        start, end = [datetime.strptime(x, '%Y-%m-%dT%H:%M:%SZ')
+                      for x in re.match(r'eventTimestamp ge (\S+) and eventTimestamp le (\S+)', filter).groups()]
+        return iter(sorted((e for e in self.events if start <= e.event_timestamp <= end),
+                           key=lambda e: e.event_timestamp, reverse=True))
+
+
+class TestActivityLogTimeSlices(unittest.TestCase):
+
+    def setUp(self):
+        from azure.mgmt.monitor.models import EventData
+        self.config_dir = tempfile.mkdtemp()
+        self.cmd = mock.MagicMock()
+        self.cmd.cli_ctx.config.config_dir = self.config_dir
+        self.start = datetime(2018, 7, 1)
+        # an event every 10 minutes for a day, including the bounds of the slices
+        self.client = _ActivityLogClient([EventData() for _ in range(145)])
+        for index, event in enumerate(self.client.events):
+            event.event_timestamp = self.start + timedelta(minutes=10 * index)
+            event.event_data_id = str(index)
+
+    def tearDown(self):
+        shutil.rmtree(self.config_dir)
+
+    def _list(self, **kwargs):
+        return list(list_activity_log(self.cmd, self.client, resource_group='rg', **kwargs))
+
+    def test_activity_log_time_slices(self):
+        events = self._list(start_time='2018-07-01T00:00:00Z', end_time='2018-07-02T00:00:00Z', time_slices=4,
+                            max_events=1000)
+        self.assertEqual([e.event_data_id for e in events], [str(i) for i in reversed(range(145))])
+        self.assertEqual(len(self.client.filters), 4)
+        self.assertTrue(all(f.endswith(" and resourceGroupName eq 'rg'") for f in self.client.filters))
+
+        events = self._list(start_time='2018-07-01T00:00:00Z', end_time='2018-07-02T00:00:00Z', time_slices=4,
+                            max_events=50)
+        self.assertEqual([e.event_data_id for e in events], [str(i) for i in reversed(range(95, 145))])
+
+    def test_activity_log_since_last_run(self):
+        events = self._list(start_time='2018-07-01T12:00:00Z', end_time='2018-07-01T18:00:00Z', since_last_run=True)
+        self.assertEqual([e.event_data_id for e in events], [str(i) for i in reversed(range(72, 109))])
+
+        # the start time is replaced by the newest event listed, which is not listed again
+        events = self._list(start_time='2018-07-01T00:00:00Z', end_time='2018-07-01T20:00:00Z', since_last_run=True,
+                            time_slices=2)
+        self.assertEqual([e.event_data_id for e in events], [str(i) for i in reversed(range(109, 121))])
+        self.assertFalse(self._list(end_time='2018-07-01T20:00:00Z', since_last_run=True))
+
+        # a truncated listing does not move the watermark
+        events = self._list(end_time='2018-07-02T00:00:00Z', since_last_run=True, max_events=5)
+        self.assertEqual(len(events), 5)
+        events = self._list(end_time='2018-07-02T00:00:00Z', since_last_run=True)
+        self.assertEqual([e.event_data_id for e in events], [str(i) for i in reversed(range(121, 145))])
+
+        with self.assertRaises(CLIError):
+            self._list(filters="eventTimestamp ge '2018-07-01T00:00:00Z'", since_last_run=True)
+
+    def test_activity_log_since_last_run_lists_late_events(self):
+        from azure.mgmt.monitor.models import EventData
+        events = self._list(start_time='2018-07-01T12:00:00Z', end_time='2018-07-01T18:00:00Z', since_last_run=True)
+        self.assertEqual(events[0].event_data_id, '108')
+
+        # events listed some minutes after their timestamp, which is older than the newest event listed
+        for event_id, minutes in [('late', 5), ('too late', 20)]:
+            event = EventData()
+            event.event_timestamp = datetime(2018, 7, 1, 18) - timedelta(minutes=minutes)
+            event.event_data_id = event_id
+            self.client.events.append(event)
+        events = self._list(end_time='2018-07-01T18:30:00Z', since_last_run=True)
+        self.assertEqual([e.event_data_id for e in events], ['111', '110', '109', 'late'])
+        self.assertTrue(self.client.filters[-1].startswith('eventTimestamp ge 2018-07-01T17:45:00Z '))
+        self.assertFalse(self._list(end_time='2018-07-01T18:30:00Z', since_last_run=True))
@@ -88,3 +88,81 @@ class MonitorNameOrIdTest(unittest.TestCase):
         self.assertFalse(hasattr(ns, 'namespace'))
         self.assertFalse(hasattr(ns, 'parent'))
         self.assertFalse(hasattr(ns, 'resource_type'))
+
+    @mock.patch('azure.cli.core.commands.client_factory.get_subscription_id', _mock_get_subscription_id)
+    def test_monitor_metric_resources(self):
+        from azure.cli.command_modules.monitor.validators import process_metric_resources
+        from azure.cli.testsdk import TestCli
+
+        cmd = mock.MagicMock()
+        cmd.cli_ctx = TestCli()
+        id = '/subscriptions/00000000-0000-0000-0000-000000000000/resourceGroups/my-rg/providers/Microsoft.Compute/' \
+             'virtualMachines/vm{}'
+
+        # IDs cannot be given with the parameters of names
+        ns = self._build_namespace([id.format(1), 'vm2'], 'my-rg', None, None, 'Microsoft.Compute/virtualMachines')
+        ns.resource_uri = ns.name_or_id
+        with self.assertRaises(CLIError):
+            process_metric_resources(cmd, ns)
+        ns = self._build_namespace([id.format(1)], 'my-rg')
+        ns.resource_uri = ns.name_or_id
+        process_metric_resources(cmd, ns)
+        self.assertEqual(ns.resource_uri, [id.format(1)])
+        ns = self._build_namespace(['vm1', 'vm2'], 'my-rg', 'Microsoft.Compute', None, 'virtualMachines')
+        ns.resource_uri = ns.name_or_id
+        process_metric_resources(cmd, ns)
+        self.assertEqual(ns.resource_uri, [id.format(1), id.format(2)])
+        self.assertIsNone(ns.resource_type)
+
+        # without resources, the resources of a type are selected
+        ns = self._build_namespace(None, 'my-rg', 'Microsoft.Compute', None, 'virtualMachines')
+        ns.resource_uri = None
+        process_metric_resources(cmd, ns)
+        self.assertEqual((ns.resource_group_name, ns.resource_type), ('my-rg', 'Microsoft.Compute/virtualMachines'))
+        for resource_type in [None, 'virtualMachines']:
+            ns = self._build_namespace(None, 'my-rg', None, None, resource_type)
+            ns.resource_uri = None
+            with self.assertRaises(CLIError):
+                process_metric_resources(cmd, ns)
+
+
+class MetricsListTests(unittest.TestCase):
+
+    @staticmethod
+    def _get_response(resource_id):
+        from datetime import datetime
+        from azure.mgmt.monitor.models import (Response, Metric, LocalizableString, TimeSeriesElement,
+                                               MetadataValue, MetricValue)
+        if resource_id.endswith('bad'):
+            from msrest.exceptions import HttpOperationError
+            raise HttpOperationError(mock.MagicMock(), mock.MagicMock())
+        data = [MetricValue(time_stamp=datetime(2018, 7, 1, minute=m), average=float(m), maximum=m + 1.0)
+                for m in range(2)]
+        series = TimeSeriesElement(metadatavalues=[MetadataValue(name=LocalizableString(value='ApiName'),
+                                                                 value='GetBlob')], data=data)
+        metric = Metric(id=resource_id + '/metric', type='metric', name=LocalizableString(value='Ingress'),
+                        unit='Bytes', timeseries=[series])
+        return Response(timespan='2018-07-01T00:00:00Z/2018-07-01T01:00:00Z', value=[metric])
+
+    def test_monitor_metrics_list_resources(self):
+        from azure.cli.command_modules.monitor.operations.metrics import list_metrics
+        client = mock.MagicMock()
+        client.list.side_effect = lambda resource_id, **kwargs: self._get_response(resource_id)
+
+        # a single resource lists the response of the service
+        self.assertEqual(list_metrics(None, client, ['/r1'], metricnames='Ingress').value[0].name.value, 'Ingress')
+
+        ids = ['/r{}'.format(i) for i in range(40)] + ['/bad']
+        with mock.patch('azure.cli.command_modules.monitor.operations.metrics.logger') as logger:
+            rows = list(list_metrics(None, client, ids, metricnames='Ingress'))
+        self.assertEqual(len(rows), 160)
+        self.assertEqual(rows[0], {'resource': '/r0', 'metric': 'Ingress', 'dimensions': 'ApiName=GetBlob',
+                                   'timestamp': rows[0]['timestamp'], 'aggregation': 'Average', 'value': 0.0})
+        self.assertEqual([(r['aggregation'], r['value']) for r in rows[:4]],
+                         [('Average', 0.0), ('Maximum', 1.0), ('Average', 1.0), ('Maximum', 2.0)])
+        self.assertEqual([r['resource'] for r in rows[::4]], ids[:-1])
+        self.assertEqual(logger.error.call_count, 1)
+        self.assertTrue(all(c[1]['metricnames'] == 'Ingress' for c in client.list.call_args_list))
+
+        with self.assertRaises(CLIError):
+            list_metrics(None, client, ids, result_type='Metadata')
@@ -76,6 +76,10 @@ def metrics_table(results):
         except ValueError:
             return time_string
 
+    if isinstance(results, list):
+        # the rows of several resources
+        return results
+
     retval = []
     for value_group in results['value']:
         name = value_group['name']['localizedValue']
@@ -58,6 +58,13 @@ def get_autoscale_scale_direction_map():
 
 
 def validate_time_range_and_add_defaults(start_time, end_time, formatter='startTime eq {} and endTime eq {}'):
+    start_time, end_time = get_time_range(start_time, end_time)
+    return formatter.format(start_time.strftime('%Y-%m-%dT%H:%M:%SZ'), end_time.strftime('%Y-%m-%dT%H:%M:%SZ'))
+
+
+def get_time_range(start_time, end_time):
+    """ Returns the start and end times as UTC datetimes. The end time defaults to now and the start time to one hour
+    before the end time. """
     from datetime import datetime, timedelta
     try:
         end_time = datetime.strptime(end_time, DATE_TIME_FORMAT) if end_time else datetime.utcnow()
@@ -71,4 +78,4 @@ def validate_time_range_and_add_defaults(start_time, end_time, formatter='startT
     except ValueError:
         raise ValueError("Input '{}' is not valid datetime. Valid example: 2000-12-31T12:59:59Z".format(start_time))
 
-    return formatter.format(start_time.strftime('%Y-%m-%dT%H:%M:%SZ'), end_time.strftime('%Y-%m-%dT%H:%M:%SZ'))
+    return start_time, end_time
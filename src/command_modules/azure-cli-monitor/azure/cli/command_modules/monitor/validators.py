@@ -101,13 +101,8 @@ def validate_autoscale_timegrain(namespace):
 
 def get_target_resource_validator(dest, required, preserve_resource_group_parameter=False, alias='resource'):
     def _validator(cmd, namespace):
-        from msrestazure.tools import is_valid_resource_id
         from knack.util import CLIError
         name_or_id = getattr(namespace, dest)
-        rg = namespace.resource_group_name
-        res_ns = namespace.namespace
-        parent = namespace.parent
-        res_type = namespace.resource_type
 
         usage_error = CLIError('usage error: --{0} ID | --{0} NAME --resource-group NAME '
                                '--{0}-type TYPE [--{0}-parent PARENT] '
@@ -115,20 +110,7 @@ def get_target_resource_validator(dest, required, preserve_resource_group_parame
         if not name_or_id and required:
             raise usage_error
         elif name_or_id:
-            if is_valid_resource_id(name_or_id) and any((res_ns, parent, res_type)):
-                raise usage_error
-            elif not is_valid_resource_id(name_or_id):
-                from azure.cli.core.commands.client_factory import get_subscription_id
-                if res_type and '/' in res_type:
-                    res_ns = res_ns or res_type.rsplit('/', 1)[0]
-                    res_type = res_type.rsplit('/', 1)[1]
-                if not all((rg, res_ns, res_type, name_or_id)):
-                    raise usage_error
-
-                setattr(namespace, dest,
-                        '/subscriptions/{}/resourceGroups/{}/providers/{}/{}{}/{}'.format(
-                            get_subscription_id(cmd.cli_ctx), rg, res_ns, parent + '/' if parent else '',
-                            res_type, name_or_id))
+            setattr(namespace, dest, _get_target_resource_id(cmd, namespace, name_or_id, usage_error))
 
         del namespace.namespace
         del namespace.parent
@@ -139,6 +121,29 @@ def get_target_resource_validator(dest, required, preserve_resource_group_parame
     return _validator
 
 
+def _get_target_resource_id(cmd, namespace, name_or_id, usage_error):
+    from msrestazure.tools import is_valid_resource_id
+    rg = namespace.resource_group_name
+    res_ns = namespace.namespace
+    parent = namespace.parent
+    res_type = namespace.resource_type
+
+    if is_valid_resource_id(name_or_id):
+        if any((res_ns, parent, res_type)):
+            raise usage_error
+        return name_or_id
+
+    from azure.cli.core.commands.client_factory import get_subscription_id
+    if res_type and '/' in res_type:
+        res_ns = res_ns or res_type.rsplit('/', 1)[0]
+        res_type = res_type.rsplit('/', 1)[1]
+    if not all((rg, res_ns, res_type, name_or_id)):
+        raise usage_error
+
+    return '/subscriptions/{}/resourceGroups/{}/providers/{}/{}{}/{}'.format(
+        get_subscription_id(cmd.cli_ctx), rg, res_ns, parent + '/' if parent else '', res_type, name_or_id)
+
+
 def validate_diagnostic_settings(cmd, namespace):
     from azure.cli.core.commands.client_factory import get_subscription_id
     from msrestazure.tools import is_valid_resource_id, resource_id
@@ -223,6 +228,28 @@ def process_metric_timespan(namespace):
     ns['timespan'] = validate_time_range_and_add_defaults(start_time, end_time, formatter='{}/{}')
 
 
+def process_metric_resources(cmd, namespace):
+    """ Resolves the names of --resource to ids. Without --resource, the resources of --resource-type are selected,
+    which the command lists. """
+    from knack.util import CLIError
+    usage_error = CLIError('usage error: --resource ID [ID ...] | --resource NAME [NAME ...] --resource-group NAME '
+                           '--resource-type TYPE [--resource-parent PARENT] [--resource-namespace NAMESPACE] | '
+                           '--resource-type TYPE [--resource-namespace NAMESPACE] [--resource-group NAME]')
+    if namespace.resource_uri:
+        namespace.resource_uri = [_get_target_resource_id(cmd, namespace, name_or_id, usage_error)
+                                  for name_or_id in namespace.resource_uri]
+        namespace.resource_group_name = namespace.resource_type = None
+    elif not namespace.resource_type or namespace.parent:
+        raise usage_error
+    elif '/' not in namespace.resource_type:
+        if not namespace.namespace:
+            raise usage_error
+        namespace.resource_type = '{}/{}'.format(namespace.namespace, namespace.resource_type)
+
+    del namespace.namespace
+    del namespace.parent
+
+
 def process_metric_aggregation(namespace):
     ns = vars(namespace)
     aggregation = ns.pop('aggregation', None)
@@ -1669,18 +1669,22 @@ helps['network dns zone export'] = """
     type: command
     short-summary: Export a DNS zone as a DNS zone file.
     examples:
-        - name: Export a DNS zone as a DNS zone file in tsv format.
+        - name: Export a DNS zone as a DNS zone file.
           text: >
-            az network dns zone export -g MyResourceGroup -n www.mysite.com -o mysite_com_zone.tsv
+            az network dns zone export -g MyResourceGroup -n www.mysite.com --file-name mysite_com_zone.txt
 """
 
 helps['network dns zone import'] = """
     type: command
     short-summary: Create a DNS zone using a DNS zone file.
+    long-summary: Only the record sets which differ from the zone are written, so importing a zone file again only writes what changed.
     examples:
         - name: Import a local zone file into a DNS zone resource.
           text: >
             az network dns zone import -g MyResourceGroup -n MyZone -f /path/to/zone/file
+        - name: Make a DNS zone match a local zone file, deleting the record sets which are not in it.
+          text: >
+            az network dns zone import -g MyResourceGroup -n MyZone -f /path/to/zone/file --delete-extra
 """
 
 helps['network dns zone list'] = """
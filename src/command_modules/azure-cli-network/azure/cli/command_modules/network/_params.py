@@ -336,9 +336,10 @@ def load_arguments(self, _):
 
     with self.argument_context('network dns zone import') as c:
         c.argument('file_name', options_list=('--file-name', '-f'), type=file_type, completer=FilesCompleter(), help='Path to the DNS zone file to import')
+        c.argument('delete_extra', action='store_true', help='Delete the record sets of the zone which are not in the zone file. The SOA and NS record sets of the zone apex are kept.')
 
     with self.argument_context('network dns zone export') as c:
-        c.argument('file_name', options_list=('--file-name', '-f'), type=file_type, completer=FilesCompleter(), help='Path to the DNS zone file to save')
+        c.argument('file_name', options_list=('--file-name', '-f'), type=file_type, completer=FilesCompleter(), help='Path to the DNS zone file to save. If omitted, the zone file is written to stdout.')
 
     with self.argument_context('network dns zone update') as c:
         c.ignore('if_none_match')
@@ -4,7 +4,7 @@
 # --------------------------------------------------------------------------------------------
 from __future__ import print_function
 
-from collections import Counter, OrderedDict
+from collections import Counter
 import mock
 
 from knack.log import get_logger
@@ -26,7 +26,7 @@ from azure.mgmt.dns.models import (RecordSet, AaaaRecord, ARecord, CaaRecord, Cn
                                    NsRecord, PtrRecord, SoaRecord, SrvRecord, TxtRecord, Zone)
 
 from azure.cli.command_modules.network.zone_file.parse_zone_file import parse_zone_file
-from azure.cli.command_modules.network.zone_file.make_zone_file import make_zone_file
+from azure.cli.command_modules.network.zone_file.make_zone_file import write_header, write_record_set
 from azure.cli.core.profiles import ResourceType
 
 logger = get_logger(__name__)
@@ -902,6 +902,9 @@ def list_ddos_plans(cmd, resource_group_name=None):
 
 
 # region DNS Commands
+_DNS_IMPORT_MAX_WORKERS = 16
+
+
 def create_dns_zone(client, resource_group_name, zone_name, location='global', tags=None,
                     if_none_match=False, zone_type='Public', resolution_vnets=None, registration_vnets=None):
     zone = Zone(location=location, tags=tags)
@@ -981,80 +984,119 @@ def _type_to_property_name(key):
     return type_dict[key.lower()]
 
 
+def _get_zone_file_records(record_set, record_type):
+    """ Returns the records of a record set in the form the zone file writer takes. """
+    record_data = getattr(record_set, _type_to_property_name(record_type), None)
+    if not record_data:
+        return []
+    if not isinstance(record_data, list):
+        record_data = [record_data]
+
+    records = []
+    for record in record_data:
+
+        record_obj = {'ttl': record_set.ttl}
+
+        if record_type == 'aaaa':
+            record_obj.update({'ip': record.ipv6_address})
+        elif record_type == 'a':
+            record_obj.update({'ip': record.ipv4_address})
+        elif record_type == 'caa':
+            record_obj.update({'value': record.value, 'tag': record.tag, 'flags': record.flags})
+        elif record_type == 'cname':
+            record_obj.update({'alias': record.cname})
+        elif record_type == 'mx':
+            record_obj.update({'preference': record.preference, 'host': record.exchange})
+        elif record_type == 'ns':
+            record_obj.update({'host': record.nsdname})
+        elif record_type == 'ptr':
+            record_obj.update({'host': record.ptrdname})
+        elif record_type == 'soa':
+            record_obj.update({
+                'mname': record.host.rstrip('.') + '.',
+                'rname': record.email.rstrip('.') + '.',
+                'serial': record.serial_number, 'refresh': record.refresh_time,
+                'retry': record.retry_time, 'expire': record.expire_time,
+                'minimum': record.minimum_ttl
+            })
+        elif record_type == 'srv':
+            record_obj.update({'priority': record.priority, 'weight': record.weight,
+                               'port': record.port, 'target': record.target})
+        elif record_type == 'txt':
+            record_obj.update({'txt': ''.join(record.value)})
+
+        records.append(record_obj)
+    return records
+
+
 def export_zone(cmd, resource_group_name, zone_name, file_name=None):
-    from time import localtime, strftime
+    import sys
 
     client = get_mgmt_service_client(cmd.cli_ctx, DnsManagementClient)
-    record_sets = client.record_sets.list_by_dns_zone(resource_group_name, zone_name)
+    # the SOA record must come first and gives the default TTL of the zone
+    root_soa = client.record_sets.get(resource_group_name, zone_name, '@', 'SOA')
 
-    zone_obj = OrderedDict({
-        '$origin': zone_name.rstrip('.') + '.',
-        'resource-group': resource_group_name,
-        'zone-name': zone_name.rstrip('.'),
-        'datetime': strftime('%a, %d %b %Y %X %z', localtime())
-    })
+    if not file_name:
+        _write_zone_file(sys.stdout, client, resource_group_name, zone_name, root_soa)
+        return
 
-    for record_set in record_sets:
-        record_type = record_set.type.rsplit('/', 1)[1].lower()
-        record_set_name = record_set.name
-        record_data = getattr(record_set, _type_to_property_name(record_type), None)
+    # The zone is written to a temporary file which only replaces the file once the whole zone is written, so that
+    # a failure part way, e.g. while listing the record sets, leaves no partial zone file behind.
+    import os
+    import tempfile
+    file_path = os.path.realpath(file_name)
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix=os.path.basename(file_path) + '.')
+        with os.fdopen(fd, 'w') as zone_file:
+            # keep the mode of the file being replaced, or give the mode of a newly created file
+            try:
+                permissions = os.stat(file_path).st_mode & 0o777
+            except OSError:
+                umask = os.umask(0)
+                os.umask(umask)
+                permissions = 0o666 & ~umask
+            os.chmod(temp_path, permissions)
+            _write_zone_file(zone_file, client, resource_group_name, zone_name, root_soa)
+        if hasattr(os, 'replace'):
+            os.replace(temp_path, file_path)  # pylint: disable=no-member
+        else:
+            if sys.platform == 'win32' and os.path.exists(file_path):
+                os.remove(file_path)
+            os.rename(temp_path, file_path)
+    except (IOError, OSError):
+        raise CLIError('Unable to export to file: {}'.format(file_name))
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _write_zone_file(zone_file, client, resource_group_name, zone_name, root_soa):
+    """ Writes the record sets of a zone as the pages of the zone arrive, rather than holding the whole zone in
+    memory. """
+    from time import localtime, strftime
 
+    write_header(
+        zone_file,
+        zone_name=zone_name.rstrip('.'),
+        resource_group=resource_group_name,
+        datetime=strftime('%a, %d %b %Y %X %z', localtime()),
+        ttl=root_soa.soa_record.minimum_ttl,
+        origin=zone_name.rstrip('.') + '.'
+    )
+    write_record_set(zone_file, root_soa.name, 'soa', _get_zone_file_records(root_soa, 'soa'))
+
+    previous_record_set_name = root_soa.name
+    for record_set in client.record_sets.list_by_dns_zone(resource_group_name, zone_name):
+        record_type = record_set.type.rsplit('/', 1)[1].lower()
+        records = _get_zone_file_records(record_set, record_type)
         # ignore empty record sets
-        if not record_data:
+        if record_type == 'soa' or not records:
             continue
-
-        if not isinstance(record_data, list):
-            record_data = [record_data]
-
-        if record_set_name not in zone_obj:
-            zone_obj[record_set_name] = OrderedDict()
-
-        for record in record_data:
-
-            record_obj = {'ttl': record_set.ttl}
-
-            if record_type not in zone_obj[record_set_name]:
-                zone_obj[record_set_name][record_type] = []
-
-            if record_type == 'aaaa':
-                record_obj.update({'ip': record.ipv6_address})
-            elif record_type == 'a':
-                record_obj.update({'ip': record.ipv4_address})
-            elif record_type == 'caa':
-                record_obj.update({'value': record.value, 'tag': record.tag, 'flags': record.flags})
-            elif record_type == 'cname':
-                record_obj.update({'alias': record.cname})
-            elif record_type == 'mx':
-                record_obj.update({'preference': record.preference, 'host': record.exchange})
-            elif record_type == 'ns':
-                record_obj.update({'host': record.nsdname})
-            elif record_type == 'ptr':
-                record_obj.update({'host': record.ptrdname})
-            elif record_type == 'soa':
-                record_obj.update({
-                    'mname': record.host.rstrip('.') + '.',
-                    'rname': record.email.rstrip('.') + '.',
-                    'serial': record.serial_number, 'refresh': record.refresh_time,
-                    'retry': record.retry_time, 'expire': record.expire_time,
-                    'minimum': record.minimum_ttl
-                })
-                zone_obj['$ttl'] = record.minimum_ttl
-            elif record_type == 'srv':
-                record_obj.update({'priority': record.priority, 'weight': record.weight,
-                                   'port': record.port, 'target': record.target})
-            elif record_type == 'txt':
-                record_obj.update({'txt': ''.join(record.value)})
-
-            zone_obj[record_set_name][record_type].append(record_obj)
-
-    zone_file_content = make_zone_file(zone_obj)
-    print(zone_file_content)
-    if file_name:
-        try:
-            with open(file_name, 'w') as f:
-                f.write(zone_file_content)
-        except IOError:
-            raise CLIError('Unable to export to file: {}'.format(file_name))
+        # the records of a name which follow each other only give the name once
+        write_record_set(zone_file, record_set.name, record_type, records,
+                         print_name=record_set.name != previous_record_set_name)
+        previous_record_set_name = record_set.name
 
 
 # pylint: disable=too-many-return-statements, inconsistent-return-statements
@@ -1089,8 +1131,31 @@ def _build_record(data):
                        .format(record_type, data['name'], ke))
 
 
-# pylint: disable=too-many-statements
-def import_zone(cmd, resource_group_name, zone_name, file_name):
+def _get_record_count(record_set, record_type):
+    try:
+        return len(getattr(record_set, _type_to_property_name(record_type)))
+    except TypeError:
+        return 1
+
+
+def _record_set_matches(record_set, other, record_type):
+    """ Whether two record sets hold the same records with the same TTL, ignoring the order of the records. """
+    import json
+
+    def _get_records(rs):
+        records = getattr(rs, _type_to_property_name(record_type)) or []
+        records = records if isinstance(records, list) else [records]
+        if record_type in ['txt', 'spf']:
+            # the service may split long strings
+            return sorted(''.join(r.value or []) for r in records)
+        return sorted(json.dumps(r.serialize(), sort_keys=True) for r in records)
+
+    return record_set.ttl == other.ttl and _get_records(record_set) == _get_records(other)
+
+
+# pylint: disable=too-many-statements,too-many-locals,too-many-branches
+def import_zone(cmd, resource_group_name, zone_name, file_name, delete_extra=False):
+    from concurrent.futures import ThreadPoolExecutor, as_completed
     from azure.cli.core.util import read_file_content
     import sys
     file_text = read_file_content(file_name)
@@ -1130,20 +1195,21 @@ def import_zone(cmd, resource_group_name, zone_name, file_name):
                 _add_record(record_set, record, record_set_type,
                             is_list=record_set_type.lower() not in ['soa', 'cname'])
 
-    total_records = 0
-    for key, rs in record_sets.items():
-        rs_name, rs_type = key.lower().rsplit('.', 1)
-        rs_name = rs_name[:-(len(origin) + 1)] if rs_name != origin else '@'
-        try:
-            record_count = len(getattr(rs, _type_to_property_name(rs_type)))
-        except TypeError:
-            record_count = 1
-        total_records += record_count
-    cum_records = 0
-
     client = get_mgmt_service_client(cmd.cli_ctx, DnsManagementClient)
     print('== BEGINNING ZONE IMPORT: {} ==\n'.format(zone_name), file=sys.stderr)
-    client.zones.create_or_update(resource_group_name, zone_name, Zone('global'))
+    try:
+        client.zones.get(resource_group_name, zone_name)
+    except CloudError as ex:
+        if ex.status_code != 404:
+            raise
+        client.zones.create_or_update(resource_group_name, zone_name, Zone('global'))
+
+    # Compare the zone file to the record sets of the zone, so that only the record sets which differ are written.
+    existing = {(rs.name.lower(), rs.type.rsplit('/', 1)[1].lower()): rs
+                for rs in client.record_sets.list_by_dns_zone(resource_group_name, zone_name)}
+    total_records = 0
+    unchanged_records = 0
+    changes = []
     for key, rs in record_sets.items():
 
         rs_name, rs_type = key.lower().rsplit('.', 1)
@@ -1151,27 +1217,71 @@ def import_zone(cmd, resource_group_name, zone_name, file_name):
         if rs_name.endswith(origin):
             rs_name = rs_name[:-(len(origin) + 1)]
 
-        try:
-            record_count = len(getattr(rs, _type_to_property_name(rs_type)))
-        except TypeError:
-            record_count = 1
+        record_count = _get_record_count(rs, rs_type)
+        total_records += record_count
+        current = existing.pop((rs_name, rs_type), None)
         if rs_name == '@' and rs_type == 'soa':
-            root_soa = client.record_sets.get(resource_group_name, zone_name, '@', 'SOA')
+            root_soa = current or client.record_sets.get(resource_group_name, zone_name, '@', 'SOA')
             rs.soa_record.host = root_soa.soa_record.host
-            rs_name = '@'
         elif rs_name == '@' and rs_type == 'ns':
-            root_ns = client.record_sets.get(resource_group_name, zone_name, '@', 'NS')
-            root_ns.ttl = rs.ttl
-            rs = root_ns
-            rs_type = rs.type.rsplit('/', 1)[1]
-        try:
-            client.record_sets.create_or_update(
-                resource_group_name, zone_name, rs_name, rs_type, rs)
-            cum_records += record_count
-            print("({}/{}) Imported {} records of type '{}' and name '{}'"
-                  .format(cum_records, total_records, record_count, rs_type, rs_name), file=sys.stderr)
-        except CloudError as ex:
-            logger.error(ex)
+            # the name servers of the zone are kept, only their TTL is imported
+            root_ns = current or client.record_sets.get(resource_group_name, zone_name, '@', 'NS')
+            rs = RecordSet(ttl=rs.ttl, ns_records=root_ns.ns_records)
+        if current:
+            if _record_set_matches(rs, current, rs_type):
+                unchanged_records += record_count
+                continue
+            rs.metadata = current.metadata
+        changes.append((rs_name, rs_type, rs, record_count))
+
+    # The apex SOA and NS record sets cannot be deleted.
+    extras = [rs for (rs_name, rs_type), rs in existing.items()
+              if not (rs_name == '@' and rs_type in ['soa', 'ns'])] if delete_extra else []
+    logger.info('%d of %d record sets differ from the zone file, %d are not in it.',
+                len(changes), len(record_sets), len(extras))
+
+    def _create_or_update(rs_name, rs_type, rs):
+        client.record_sets.create_or_update(resource_group_name, zone_name, rs_name, rs_type, rs)
+
+    def _delete(rs):
+        client.record_sets.delete(resource_group_name, zone_name, rs.name, rs.type.rsplit('/', 1)[1])
+
+    deletions = [(_delete, (rs,), (rs.name, rs.type.rsplit('/', 1)[1].lower(), None)) for rs in extras]
+    writes = [(_create_or_update, (rs_name, rs_type, rs), (rs_name, rs_type, record_count))
+              for rs_name, rs_type, rs, record_count in changes]
+
+    cum_records = unchanged_records
+    deleted_record_sets = 0
+    failures = 0
+    with ThreadPoolExecutor(max_workers=_DNS_IMPORT_MAX_WORKERS) as executor:
+        # The deletions complete before the writes start, a record set of the zone file may take the name of a
+        # deleted one, e.g. a CNAME record set replacing record sets of other types.
+        for jobs in [deletions, writes]:
+            futures = {executor.submit(func, *args): info for func, args, info in jobs}
+            for future in as_completed(futures):
+                rs_name, rs_type, record_count = futures[future]
+                try:
+                    future.result()
+                except CloudError as ex:
+                    failures += 1
+                    logger.error("Failed to %s the record set of type '%s' and name '%s': %s",
+                                 'import' if record_count is not None else 'delete', rs_type, rs_name, ex)
+                    continue
+                if record_count is None:
+                    deleted_record_sets += 1
+                    print("Deleted the record set of type '{}' and name '{}'".format(rs_type, rs_name),
+                          file=sys.stderr)
+                else:
+                    cum_records += record_count
+                    print("({}/{}) Imported {} records of type '{}' and name '{}'"
+                          .format(cum_records, total_records, record_count, rs_type, rs_name), file=sys.stderr)
+    if unchanged_records:
+        print('\n{} records were already up to date.'.format(unchanged_records), file=sys.stderr)
+    if deleted_record_sets:
+        print('{} record sets which are not in the zone file were deleted.'.format(deleted_record_sets),
+              file=sys.stderr)
+    if failures:
+        print('{} record sets failed to import or delete.'.format(failures), file=sys.stderr)
     print("\n== {}/{} RECORDS IMPORTED SUCCESSFULLY: '{}' =="
           .format(cum_records, total_records, zone_name), file=sys.stderr)
 
@@ -6,14 +6,16 @@
 import os
 import unittest
 
-from azure.cli.testsdk import ScenarioTest, ResourceGroupPreparer
+from azure.cli.testsdk import ScenarioTest, LiveScenarioTest, ResourceGroupPreparer
 
 from azure.cli.command_modules.network.zone_file import parse_zone_file
 
 TEST_DIR = os.path.abspath(os.path.join(os.path.abspath(__file__), '..'))
 
 
-class DnsZoneImportTest(ScenarioTest):
+# convert to ScenarioTest and re-record: the recordings predate reading the zone before creating it and writing only
+# the record sets which differ
+class DnsZoneImportTest(LiveScenarioTest):
 
     def _match_record(self, record_set, name, type):
         matches = [x for x in record_set if x['name'] == name and x['type'] == type]
@@ -557,6 +559,20 @@ class DnsParseZoneFiles(unittest.TestCase):
             (172800, 'ns4-03.azure-dns.info.'),
         ])
 
+    def test_zone_file_lines(self):
+        from azure.cli.core.util import read_file_content
+        zn = 'zone3.com.'
+        file_text = read_file_content(os.path.join(TEST_DIR, 'zone_files', 'zone3.txt'))
+        self.assertEqual(parse_zone_file(iter(file_text.splitlines(True)), zn), parse_zone_file(file_text, zn))
+
+    def test_zone_file_record_type_names(self):
+        zn = 'zone8.com.'
+        zone = parse_zone_file('@ IN SOA ns1.zone8.com. hostmaster ( 1 3600 300 2419200 300 )\n'
+                               'mx IN A 1.2.3.4 ; name which is a record type\n'
+                               'txt IN TXT "in" IN "a" ; class in the strings\n', zn)
+        self._check_a(zone, 'mx.' + zn, [(3600, '1.2.3.4')])
+        self._check_txt(zone, 'txt.' + zn, [(3600, None, 'inINa')])
+
     def test_zone_import_errors(self):
         from knack.util import CLIError
         for f in ['fail1', 'fail2', 'fail3', 'fail4', 'fail5']:
@@ -3,6 +3,9 @@
 # Licensed under the MIT License. See License.txt in the project root for license information.
 # --------------------------------------------------------------------------------------------
 
+import os
+import shutil
+import tempfile
 import unittest
 
 import mock
@@ -76,6 +79,186 @@ class TestNetworkUnitTests(unittest.TestCase):
         self.assertEqual(len(result), 2)
         self.assertEqual(result[1].value, 'noodle')
 
+    def test_network_dns_zone_import_writes_changed_record_sets(self):
+        from azure.mgmt.dns.models import ARecord, NsRecord, RecordSet, SoaRecord
+        from azure.cli.command_modules.network.custom import import_zone
+
+        def _record_set(name, record_type, ttl, **kwargs):
+            record_set = RecordSet(ttl=ttl, **kwargs)
+            record_set.name = name
+            record_set.type = 'Microsoft.Network/dnszones/' + record_type
+            return record_set
+
+        client = mock.MagicMock()
+        client.record_sets.list_by_dns_zone.return_value = [
+            _record_set('@', 'SOA', 3600, soa_record=SoaRecord(
+                host='ns1-01.azure-dns.com.', email='azuredns-hostmaster.microsoft.com.', serial_number=1,
+                refresh_time=3600, retry_time=300, expire_time=2419200, minimum_ttl=300)),
+            _record_set('@', 'NS', 172800, ns_records=[NsRecord(nsdname='ns1-01.azure-dns.com.')]),
+            _record_set('www', 'A', 3600, arecords=[ARecord(ipv4_address='10.0.0.2'),
+                                                    ARecord(ipv4_address='10.0.0.1')]),
+            _record_set('mail', 'A', 3600, arecords=[ARecord(ipv4_address='10.0.0.9')]),
+            _record_set('old', 'A', 3600, arecords=[ARecord(ipv4_address='10.0.0.4')])
+        ]
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            zone_file = os.path.join(temp_dir, 'zone.txt')
+            with open(zone_file, 'w') as f:
+                f.write('$ORIGIN zone.com.\n'
+                        '@ 3600 IN SOA ns1-01.azure-dns.com. azuredns-hostmaster.microsoft.com. '
+                        '( 1 3600 300 2419200 300 )\n'
+                        '@ 172800 NS ns1-01.azure-dns.com.\n'
+                        'www 3600 A 10.0.0.1\n'
+                        'www 3600 A 10.0.0.2\n'
+                        'mail 3600 A 10.0.0.3\n'
+                        'new 3600 A 10.0.0.5\n')
+            with mock.patch('azure.cli.command_modules.network.custom.get_mgmt_service_client', return_value=client):
+                import_zone(mock.MagicMock(), 'rg', 'zone.com', zone_file, delete_extra=True)
+        finally:
+            shutil.rmtree(temp_dir)
+
+        # the zone exists and the record sets are listed once
+        client.zones.create_or_update.assert_not_called()
+        client.record_sets.list_by_dns_zone.assert_called_once_with('rg', 'zone.com')
+        written = [c[0][2] for c in client.record_sets.create_or_update.call_args_list]
+        self.assertIn('mail', written)
+        self.assertIn('new', written)
+        self.assertNotIn('www', written)
+        client.record_sets.delete.assert_called_once_with('rg', 'zone.com', 'old', 'A')
+
+    _DNS_ZONE_HEADER = ('$ORIGIN zone.com.\n'
+                        '@ 3600 IN SOA ns1-01.azure-dns.com. azuredns-hostmaster.microsoft.com. '
+                        '( 1 3600 300 2419200 300 )\n')
+
+    def _import_zone(self, client, zone_text, **kwargs):
+        from azure.cli.command_modules.network.custom import import_zone
+        temp_dir = tempfile.mkdtemp()
+        try:
+            zone_file = os.path.join(temp_dir, 'zone.txt')
+            with open(zone_file, 'w') as f:
+                f.write(zone_text)
+            with mock.patch('azure.cli.command_modules.network.custom.get_mgmt_service_client', return_value=client):
+                import_zone(mock.MagicMock(), 'rg', 'zone.com', zone_file, **kwargs)
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_network_dns_zone_import_creates_missing_zone_only(self):
+        from msrestazure.azure_exceptions import CloudError
+        zone_text = self._DNS_ZONE_HEADER + 'www 3600 A 10.0.0.1\n'
+
+        client = mock.MagicMock()
+        client.zones.get.side_effect = CloudError(mock.MagicMock(status_code=403), error='Forbidden')
+        with self.assertRaises(CloudError):
+            self._import_zone(client, zone_text)
+        client.zones.create_or_update.assert_not_called()
+        client.record_sets.create_or_update.assert_not_called()
+
+        client = mock.MagicMock()
+        client.zones.get.side_effect = CloudError(mock.MagicMock(status_code=404), error='Not Found')
+        client.record_sets.list_by_dns_zone.return_value = []
+        self._import_zone(client, zone_text)
+        client.zones.create_or_update.assert_called_once()
+        self.assertIn('www', [c[0][2] for c in client.record_sets.create_or_update.call_args_list])
+
+    def test_network_dns_zone_import_deletes_before_writing(self):
+        import threading
+        import time
+        from azure.mgmt.dns.models import CnameRecord
+        calls = []
+        lock = threading.Lock()
+
+        def _record(operation, delay):
+            def _call(*args):
+                time.sleep(delay)
+                with lock:
+                    calls.append((operation, args[2]))
+            return _call
+
+        client = mock.MagicMock()
+        client.record_sets.list_by_dns_zone.return_value = [
+            self._dns_record_set('old{}'.format(i), 'CNAME', 3600, cname_record=CnameRecord(cname='a.zone.com.'))
+            for i in range(3)]
+        client.record_sets.delete.side_effect = _record('delete', 0.05)
+        client.record_sets.create_or_update.side_effect = _record('write', 0)
+
+        self._import_zone(client, self._DNS_ZONE_HEADER + 'www 3600 A 10.0.0.1\nmail 3600 A 10.0.0.2\n',
+                          delete_extra=True)
+        self.assertEqual([operation for operation, _ in calls], ['delete'] * 3 + ['write'] * 3)
+
+    @staticmethod
+    def _dns_record_set(name, record_type, ttl, **kwargs):
+        from azure.mgmt.dns.models import RecordSet
+        record_set = RecordSet(ttl=ttl, **kwargs)
+        record_set.name = name
+        record_set.type = 'Microsoft.Network/dnszones/' + record_type
+        return record_set
+
+    def _dns_root_soa(self):
+        from azure.mgmt.dns.models import SoaRecord
+        return self._dns_record_set('@', 'SOA', 3600, soa_record=SoaRecord(
+            host='ns1-01.azure-dns.com.', email='azuredns-hostmaster.microsoft.com', serial_number=1,
+            refresh_time=3600, retry_time=300, expire_time=2419200, minimum_ttl=300))
+
+    def test_network_dns_zone_export_writes_record_sets_as_listed(self):
+        from azure.mgmt.dns.models import ARecord, TxtRecord
+        from azure.cli.command_modules.network.custom import export_zone
+        from azure.cli.command_modules.network.zone_file import parse_zone_file
+
+        _record_set = self._dns_record_set
+        root_soa = self._dns_root_soa()
+        client = mock.MagicMock()
+        client.record_sets.get.return_value = root_soa
+        client.record_sets.list_by_dns_zone.return_value = iter([
+            _record_set('www', 'A', 60, arecords=[ARecord(ipv4_address='10.0.0.1'), ARecord(ipv4_address='10.0.0.2')]),
+            root_soa,
+            _record_set('www', 'TXT', 60, txt_records=[TxtRecord(value=['a "quoted" ', 'string'])]),
+            _record_set('empty', 'A', 60, arecords=[])
+        ])
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            zone_file = os.path.join(temp_dir, 'zone.txt')
+            with mock.patch('azure.cli.command_modules.network.custom.get_mgmt_service_client', return_value=client):
+                export_zone(mock.MagicMock(), 'rg', 'zone.com', zone_file)
+            with open(zone_file) as f:
+                zone = parse_zone_file(f, 'zone.com')
+        finally:
+            shutil.rmtree(temp_dir)
+
+        self.assertEqual(list(zone.keys()), ['zone.com.', 'www.zone.com.'])
+        self.assertEqual(zone['zone.com.']['soa']['minimum'], 300)
+        self.assertEqual([r['ip'] for r in zone['www.zone.com.']['a']], ['10.0.0.1', '10.0.0.2'])
+        self.assertEqual(zone['www.zone.com.']['txt'][0]['txt'], ['a \\"quoted\\" string'])
+
+    def test_network_dns_zone_export_keeps_file_on_failure(self):
+        from azure.mgmt.dns.models import ARecord
+        from msrestazure.azure_exceptions import CloudError
+        from azure.cli.command_modules.network.custom import export_zone
+
+        def _list_record_sets(*_):
+            yield self._dns_record_set('www', 'A', 60, arecords=[ARecord(ipv4_address='10.0.0.1')])
+            raise CloudError(mock.MagicMock(status_code=500), error='Internal Server Error')
+
+        client = mock.MagicMock()
+        client.record_sets.get.return_value = self._dns_root_soa()
+        client.record_sets.list_by_dns_zone.side_effect = _list_record_sets
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            zone_file = os.path.join(temp_dir, 'zone.txt')
+            with open(zone_file, 'w') as f:
+                f.write('previous export')
+            with mock.patch('azure.cli.command_modules.network.custom.get_mgmt_service_client', return_value=client):
+                with self.assertRaises(CloudError):
+                    export_zone(mock.MagicMock(), 'rg', 'zone.com', zone_file)
+            # the previous export is left as it was, with no partial zone file next to it
+            self.assertEqual(os.listdir(temp_dir), ['zone.txt'])
+            with open(zone_file) as f:
+                self.assertEqual(f.read(), 'previous export')
+        finally:
+            shutil.rmtree(temp_dir)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -27,6 +27,44 @@
 from __future__ import print_function
 
 
+HEADER = """
+; Exported zone file from Azure DNS\n\
+;      Zone name: {zone_name}\n\
+;      Resource Group Name: {resource_group}\n\
+;      Date and time (UTC): {datetime}\n\n\
+$TTL {ttl}\n\
+$ORIGIN {origin}\n\
+    """
+
+
+def write_header(zone_file, zone_name, resource_group, datetime, ttl, origin):
+    """
+    Write the comments, $TTL and $ORIGIN which start a zonefile
+    """
+    print(HEADER.format(
+        zone_name=zone_name,
+        resource_group=resource_group,
+        datetime=datetime,
+        ttl=ttl,
+        origin=origin
+    ), file=zone_file)
+
+
+def write_record_set(zone_file, record_set_name, record_type, records, print_name=True):
+    """
+    Write the records of a record set, followed by an empty line. Unless @print_name is False, the name of the
+    record set is written on the first record, otherwise the records take the name of the previous record.
+    """
+    import azure.cli.command_modules.network.zone_file.record_processors as record_processors
+
+    method = getattr(record_processors, 'process_{}'.format(record_type.strip('$')))
+    for entry in records:
+        method(zone_file, entry, record_set_name, print_name)
+        print_name = False
+
+    print('', file=zone_file)
+
+
 def make_zone_file(json_obj):
     """
     Generate the DNS zonefile, given a json-encoded description of the
@@ -49,27 +87,19 @@ def make_zone_file(json_obj):
         "uri":     [ uri records ]
     }
     """
-    import azure.cli.command_modules.network.zone_file.record_processors as record_processors
     from six import StringIO
 
     zone_file = StringIO()
 
-    HEADER = """
-; Exported zone file from Azure DNS\n\
-;      Zone name: {zone_name}\n\
-;      Resource Group Name: {resource_group}\n\
-;      Date and time (UTC): {datetime}\n\n\
-$TTL {ttl}\n\
-$ORIGIN {origin}\n\
-    """
     zone_name = json_obj.pop('zone-name')
-    print(HEADER.format(
+    write_header(
+        zone_file,
         zone_name=zone_name,
         resource_group=json_obj.pop('resource-group'),
         datetime=json_obj.pop('datetime'),
         ttl=json_obj.pop('$ttl'),
         origin=json_obj.pop('$origin')
-    ), file=zone_file)
+    )
 
     for record_set_name in json_obj.keys():
 
@@ -92,12 +122,8 @@ $ORIGIN {origin}\n\
             if not isinstance(record, list):
                 record = [record]
 
-            for entry in record:
-                method = 'process_{}'.format(record_type.strip('$'))
-                getattr(record_processors, method)(zone_file, entry, record_set_name, first_line)
-                first_line = False
-
-            print('', file=zone_file)
+            write_record_set(zone_file, record_set_name, record_type, record, first_line)
+            first_line = False
 
     result = zone_file.getvalue()
     zone_file.close()
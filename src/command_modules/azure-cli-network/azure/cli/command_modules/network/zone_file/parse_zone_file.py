@@ -33,24 +33,28 @@ Known limitations:
     * currently only supports the following:
     '$ORIGIN', '$TTL', 'SOA', 'NS', 'A', 'AAAA', 'CNAME', 'MX', 'PTR',
     'TXT', 'SRV', 'SPF', 'URI', 'CAA'
+
+The zone file is read in a single pass: each line is split into tokens by one regular expression, the lines of a
+record which spans several lines in parentheses are joined and every record is then matched against the fields of
+its type.
 """
 
-import copy
-import datetime
-import time
-import argparse
+import io
 from collections import OrderedDict
 import re
 
+import six
+
 from knack.log import get_logger
 from knack.util import CLIError
 
-from azure.cli.command_modules.network.zone_file.configs import SUPPORTED_RECORDS
 from azure.cli.command_modules.network.zone_file.exceptions import InvalidLineException
 
 logger = get_logger(__name__)
 
-semicolon_regex = re.compile(r'(?:"[^"]*")*[^\\](;.*)')
+# A token is a quoted string, an opening or closing parenthesis, a comment or a sequence of other characters.
+# Escape sequences are kept as they are, in and out of quotes.
+_token_regex = re.compile(r'\s+|;.*|(?P<paren>[()])|"(?P<quoted>(?:[^"\\]|\\.)*)"?|(?P<word>(?:[^\s"();\\]|\\.?)+)')
 date_regex_dict = {
     'w': {'regex': re.compile(r'(\d*w)'), 'scale': 86400 * 7},
     'd': {'regex': re.compile(r'(\d*d)'), 'scale': 86400},
@@ -59,370 +63,124 @@ date_regex_dict = {
     's': {'regex': re.compile(r'(\d*s)'), 'scale': 1}
 }
 
+# The fields of each record type. The fields of TXT and SPF records are all the strings which follow the type.
+_RECORD_FIELDS = {
+    'SOA': [('host', str), ('email', str), ('serial', int), ('refresh', str), ('retry', str), ('expire', str),
+            ('minimum', str)],
+    'NS': [('host', str)],
+    'A': [('ip', str)],
+    'AAAA': [('ip', str)],
+    'CAA': [('flags', int), ('tag', str), ('value', str)],
+    'CNAME': [('alias', str)],
+    'MX': [('preference', str), ('host', str)],
+    'TXT': None,
+    'PTR': [('host', str)],
+    'SRV': [('priority', int), ('weight', int), ('port', int), ('target', str)],
+    'SPF': None,
+    'URI': [('priority', int), ('weight', int), ('target', str)]
+}
+_DIRECTIVES = ['$ORIGIN', '$TTL']
 
-class ZonefileLineParser(argparse.ArgumentParser):
-    def error(self, message):
-        """
-        Silent error message
-        """
-        raise InvalidLineException(message)
-
-
-class IncorrectParserException(Exception):
-    pass
-
-
-def _make_record_parser(parsers, rec_type, arg_defs):
-    """
-    Make a parser for a given type of DNS record
-    """
-    parser = ZonefileLineParser(rec_type)
-    parser.add_argument('name', type=str)
-
-    for arg in arg_defs:
-        nargs = arg[2] if len(arg) > 2 else 1
-        parser.add_argument(arg[0], type=arg[1], nargs=nargs)
 
-    parsers.append(parser)
+def _iter_lines(text):
+    if isinstance(text, six.string_types):
+        text = io.StringIO(six.text_type(text))
+    for line in text:
+        yield line.rstrip('\r\n')
 
 
-def _make_parser():
+def _tokenize_records(lines):
     """
-    Make an array of parsers that can process different DNS record types
+    Yield the tokens of each record, joining the lines of records which span several lines in parentheses,
+    together with whether the record starts with whitespace, in which case it has the name of the previous record.
     """
-    parsers = []
-
-    # parse $ORIGIN
-    origin = ZonefileLineParser('$ORIGIN')
-    origin.add_argument('DELIM', type=str)
-    origin.add_argument('value', type=str)
-    parsers.append(origin)
-
-    # parse $TTL
-    ttl = ZonefileLineParser('$TTL')
-    ttl.add_argument('DELIM', type=str)
-    ttl.add_argument('value', type=str)
-    parsers.append(ttl)
-
-    # parse each RR
-    _make_record_parser(parsers, 'SOA', [
-        ('ttl', str), ('DELIM', str),
-        ('host', str), ('email', str), ('serial', int), ('refresh', str),
-        ('retry', str), ('expire', str), ('minimum', str)
-    ])
-    _make_record_parser(parsers, 'SOA', [
-        ('DELIM', str), ('host', str), ('email', str), ('serial', int), ('refresh', str),
-        ('retry', str), ('expire', str), ('minimum', str)
-    ])
-    _make_record_parser(parsers, 'SOA', [
-        ('DELIM', str), ('host', str), ('email', str), ('serial', int), ('refresh', str),
-        ('retry', str), ('expire', str)
-    ])
-    _make_record_parser(parsers, 'NS', [('ttl', str, '?'), ('DELIM', str), ('host', str)])
-    _make_record_parser(parsers, 'A', [('ttl', str, '?'), ('DELIM', str), ('ip', str)])
-    _make_record_parser(parsers, 'AAAA', [('ttl', str, '?'), ('DELIM', str), ('ip', str)])
-    _make_record_parser(parsers, 'CAA', [('ttl', str, '?'), ('DELIM', str), ('flags', int), ('tag', str), ('value', str)])
-    _make_record_parser(parsers, 'CNAME', [('ttl', str, '?'), ('DELIM', str), ('alias', str)])
-    _make_record_parser(parsers, 'MX', [('ttl', str, '?'), ('DELIM', str), ('preference', str), ('host', str)])
-    _make_record_parser(parsers, 'TXT', [('ttl', str), ('DELIM', str), ('txt', str, '+')])
-    _make_record_parser(parsers, 'TXT', [('DELIM', str), ('txt', str, '+')])
-    _make_record_parser(parsers, 'PTR', [('ttl', str, '?'), ('DELIM', str), ('host', str)])
-    _make_record_parser(parsers, 'SRV', [('ttl', str, '?'), ('DELIM', str), ('priority', int), ('weight', int), ('port', int), ('target', str)])
-    _make_record_parser(parsers, 'SPF', [('ttl', str, '?'), ('DELIM', str), ('txt', str)])
-    _make_record_parser(parsers, 'URI', [('ttl', str, '?'), ('DELIM', str), ('priority', int), ('weight', int), ('target', str)])
-
-    return parsers
-
-
-def _tokenize_line(line, quote_strings=False, infer_name=True):
+    tokens = []
+    depth = 0
+    inherits_name = False
+    for line in lines:
+        if not depth:
+            inherits_name = line[:1].isspace()
+        for match in _token_regex.finditer(line):
+            if match.group('paren'):
+                depth += 1 if match.group('paren') == '(' else -1
+                if depth < 0:
+                    raise CLIError('Unable to parse: {}'.format(line))
+            elif match.group('quoted') is not None:
+                tokens.append(match.group('quoted'))
+            elif match.group('word'):
+                tokens.append(match.group('word'))
+        if not depth and tokens:
+            yield inherits_name, tokens
+            tokens = []
+    if tokens:
+        raise CLIError('Unable to parse: {}'.format(' '.join(tokens)))
+
+
+def _parse_record(tokens, name):
     """
-    Tokenize a line:
-    * split tokens on whitespace
-    * treat quoted strings as a single token
+    Parse the tokens of a record into a dict of its name, TTL, type and the fields of its type.
+    The type is the first token after the name which is a record type, the TTL and the IN class may precede it.
     """
-    ret = []
-    escape = False
-    quote = False
-    tokbuf = ""
-    firstchar = True
-    ll = list(line)
-    while len(ll) > 0:
-        c = ll.pop(0)
-        if c.isspace():
-            if firstchar:
-                # used by the _add_record_names method
-                tokbuf += '$NAME' if infer_name else ' '
-
-            if not quote and not escape:
-                # end of token
-                if len(tokbuf) > 0:
-                    ret.append(tokbuf)
-                tokbuf = ''
-
-            elif escape:
-                # escaped space (can be inside or outside of quote)
-                tokbuf += '\\' + c
-                escape = False
-
-            elif quote:
-                # in quotes
-                tokbuf += c
-
-            else:
-                tokbuf = ''
-        elif c == '\\':
-            if escape:
-                # escape of an escape is valid part of the line sequence
-                tokbuf += '\\\\'
-                escape = False
-            else:
-                escape = True
-        elif c == '"':
-            if not escape:
-                if quote:
-                    # end of quote
-                    if quote_strings:
-                        tokbuf += '"'
-                    ret.append(tokbuf)
-                    tokbuf = ''
-                    quote = False
-                else:
-                    # beginning of quote
-                    if quote_strings:
-                        tokbuf += '"'
-                    quote = True
-            else:
-                # append the escaped quote
-                tokbuf += '\\"'
-                escape = False
+    ttl = None
+    for index, token in enumerate(tokens):
+        record_type = token.upper()
+        if record_type in _RECORD_FIELDS:
+            break
+        elif record_type == 'IN':
+            continue
+        elif ttl is None:
+            ttl = token
         else:
-            # normal character
-            if escape:
-                # append escape character
-                tokbuf += '\\'
-
-            tokbuf += c
-            escape = False
-        firstchar = False
-
-    if len(tokbuf.strip(' \r\n\t')):
-        ret.append(tokbuf)
-
-    if len(ret) == 1 and ret[0] == '$NAME':
-        return []
+            raise InvalidLineException(' '.join(tokens))
     else:
-        return ret
+        raise CLIError('Unable to determine record type: {}'.format(' '.join(tokens)))
+
+    record = {'name': name, 'DELIM': token, 'type': record_type}
+    if ttl is not None:
+        record['ttl'] = ttl
+    values = tokens[index + 1:]
+    fields = _RECORD_FIELDS[record_type]
+    if fields is None:
+        if not values:
+            raise InvalidLineException(' '.join(tokens))
+        record['txt'] = values if len(values) > 1 else values[0]
+        return record
+
+    if len(values) != len(fields):
+        raise InvalidLineException(' '.join(tokens))
+    try:
+        for (field, field_type), value in zip(fields, values):
+            record[field] = field_type(value)
+    except ValueError:
+        raise InvalidLineException(' '.join(tokens))
+    return record
 
 
-def _find_comment_index(line):
+def _iter_records(text, ignore_invalid=False):
     """
-    Finds the index of a ; denoting a comment.
-    Ignores escaped semicolons and semicolons inside quotes
+    Yield the records and directives of a zonefile, given as a string or as an iterable of lines, in order.
+    The records which do not start with a name are given the name of the previous record.
     """
-    escape = False
-    quote = False
-    for i, char in enumerate(line):
-        if char == '\\':
-            escape = True
-            continue
-        elif char == '"':
-            if escape:
-                escape = False
+    previous_record_name = None
+    for inherits_name, tokens in _tokenize_records(_iter_lines(text)):
+        try:
+            if not inherits_name and tokens[0].upper() in _DIRECTIVES:
+                if len(tokens) != 2:
+                    raise InvalidLineException(' '.join(tokens))
+                yield {'DELIM': tokens[0], 'value': tokens[1], 'type': tokens[0].upper()}
                 continue
+            if inherits_name:
+                if previous_record_name is None:
+                    raise InvalidLineException(' '.join(tokens))
+                record = _parse_record(tokens, previous_record_name)
             else:
-                quote = not quote
-        elif char == ';':
-            if quote:
-                escape = False
-                continue
-            elif escape:
-                escape = False
+                record = _parse_record(tokens[1:], tokens[0])
+                previous_record_name = tokens[0]
+        except InvalidLineException:
+            if ignore_invalid:
                 continue
-            else:
-                # comment denoting semicolon found
-                return i
-        else:
-            escape = False
-            continue
-    # no unquoted, unescaped ; found
-    return -1
-
-
-def _serialize(tokens):
-    """
-    Serialize tokens:
-    * quote whitespace-containing tokens
-    """
-    ret = []
-    for tok in tokens:
-        if " " in tok:
-            tok = '"%s"' % tok
-
-        ret.append(tok)
-
-    return " ".join(ret)
-
-
-def _remove_comments(text):
-    """
-    Remove comments from a zonefile
-    """
-    ret = []
-    lines = text.split("\n")
-    for line in lines:
-        if not line:
-            continue
-
-        index = _find_comment_index(line)
-        if index != -1:
-            line = line[:index]
-        if line:
-            ret.append(line)
-
-    return "\n".join(ret)
-
-
-def _flatten(text):
-    """
-    Flatten the text:
-    * make sure each record is on one line.
-    * remove parenthesis
-    * remove Windows line endings
-    """
-    lines = text.split('\n')
-    SENTINEL = '%%%'
-
-    # tokens: sequence of non-whitespace separated by '' where a newline was
-    tokens = []
-    for line in (x for x in lines if len(x) > 0):
-        line = line.replace('\t', ' ')
-        tokens += _tokenize_line(line, quote_strings=True, infer_name=False)
-        tokens.append(SENTINEL)
-
-    # find (...) and turn it into a single line ("capture" it)
-    capturing = False
-    captured = []
-
-    flattened = []
-    while len(tokens) > 0:
-        tok = tokens.pop(0)
-
-        if tok == '$NAME':
-            tok = ' '
-
-        if not capturing and tok == SENTINEL:
-            # normal end-of-line
-            if len(captured) > 0:
-                flattened.append(" ".join(captured))
-                captured = []
-            continue
-
-        if tok.startswith("("):
-            # begin grouping
-            tok = tok.lstrip("(")
-            capturing = True
-
-        if capturing and tok.endswith(")"):
-            # end grouping.  next end-of-line will turn this sequence into a flat line
-            tok = tok.rstrip(")")
-            capturing = False
-
-        if tok != SENTINEL:
-            captured.append(tok)
-
-    return "\n".join(flattened)
-
-
-def _remove_class(text):
-    """
-    Remove the CLASS from each DNS record, if present.
-    The only class that gets used today (for all intents
-    and purposes) is 'IN'.
-    """
-    # see RFC 1035 for list of classes
-    lines = text.split("\n")
-    ret = []
-    for line in lines:
-        original_tokens = _tokenize_line(line)
-        tokens = []
-        for token in original_tokens:
-            if token.upper() != 'IN':
-                tokens.append(token)
-        ret.append(_serialize(tokens))
-    return "\n".join(ret)
-
-
-def _add_record_names(text):
-    """
-    Go through each line of the text and ensure that
-    a name is defined.  Use previous record name if there is none.
-    """
-    global SUPPORTED_RECORDS
-
-    lines = text.split("\n")
-    ret = []
-    previous_record_name = None
-
-    for line in lines:
-        tokens = _tokenize_line(line)
-        if not tokens:
-            continue
-
-        record_name = tokens[0]
-        if record_name == '$NAME':
-            tokens = [previous_record_name] + tokens[1:]
-        elif not record_name.startswith('$'):
-            previous_record_name = record_name
-
-        ret.append(_serialize(tokens))
-
-    return "\n".join(ret)
-
-
-def _parse_record(parser, record_token):
-    global SUPPORTED_RECORDS
-
-    # match parser to record type
-    record_type = None
-    for i in range(3):
-        try:
-            if record_token[i].upper() in SUPPORTED_RECORDS:
-                record_type = record_token[i].upper()
-                break
-        except KeyError:
-            break
-
-    if not record_type:
-        from knack.util import CLIError
-        raise CLIError('Unable to determine record type: {}'.format(' '.join(record_token)))
-
-    # move the record type to the front of the token list so it will conform to argparse
-    if record_type != parser.prog:
-        raise IncorrectParserException
-
-    try:
-        rr, unmatched = parser.parse_known_args(record_token)
-        assert len(unmatched) == 0, "Unmatched fields: %s" % unmatched
-    except (SystemExit, AssertionError, InvalidLineException):
-        # invalid argument
-        raise InvalidLineException(' '.join(record_token))
-
-    record = rr.__dict__
-    record['type'] = record_type
-
-    # remove emtpy fields
-    for field in list(record.keys()):
-        if record[field] is None:
-            del record[field]
-
-    for key in record:
-        try:
-            if len(record[key]) == 1:
-                record[key] = record[key][0]
-        except TypeError:
-            continue
-
-    return record
+            raise CLIError('Unable to parse: {}'.format(' '.join(tokens)))
+        yield record
 
 
 def _convert_to_seconds(value):
@@ -474,16 +232,6 @@ def _post_process_ttl(zone):
                     record['ttl'] = ttl
 
 
-def _pre_process_txt_records(text):
-    """ This looks only for the cases of multiple text records not surrounded by quotes.
-    This must be done after flattening but before any tokenization occurs, as this strips out
-    the quotes. """
-    lines = text.split('\n')
-    for line in lines:
-        pass
-    return text
-
-
 def _post_process_txt_record(record, current_ttl):
     if not isinstance(record['txt'], list):
         record['txt'] = [record['txt']]
@@ -518,38 +266,14 @@ def _post_check_names(zone):
 
 def parse_zone_file(text, zone_name, ignore_invalid=False):
     """
-    Parse a zonefile into a dict
+    Parse a zonefile, given as a string or as an iterable of lines, into a dict
     """
-    parsers = _make_parser()
-
-    text = _remove_comments(text)
-    text = _flatten(text)
-    text = _remove_class(text)
-    text = _pre_process_txt_records(text)
-    text = _add_record_names(text)
-
     zone_obj = OrderedDict()
-    record_lines = text.split("\n")
     current_origin = zone_name.rstrip('.') + '.'
     current_ttl = 3600
     soa_processed = False
 
-    for record_line in record_lines:
-        parse_match = False
-        record = None
-        for parser in parsers:
-            record_tokens = _tokenize_line(record_line)
-            try:
-                record = _parse_record(parser, record_tokens)
-                if record['DELIM'].lower() != record['type'].lower():
-                    raise IncorrectParserException
-                parse_match = True
-                break
-            except (InvalidLineException, IncorrectParserException):
-                continue
-        if not parse_match and not ignore_invalid:
-            raise CLIError('Unable to parse: {}'.format(record_line))
-
+    for record in _iter_records(text, ignore_invalid):
         record_type = record['type'].lower()
         if record_type.lower() == '$origin':
             origin_value = record['value']
@@ -499,6 +499,9 @@ helps['resource tag'] = """
         - name: Tag a web app with the key 'vmlist' and value 'vm1', using a resource identifier.
           text: >
             az resource tag --tags vmlist=vm1 --id /subscriptions/{SubID}/resourceGroups/{ResourceGroup}/providers/Microsoft.Web/sites/{WebApp}
+        - name: Tag many resources, skipping the ones which already have the tags.
+          text: >
+            az resource tag --tags env=prod --bulk --ids $(az resource list --tag env=prod --query [].id -o tsv)
 """
 
 helps['resource create'] = """
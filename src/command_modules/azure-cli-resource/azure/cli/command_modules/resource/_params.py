@@ -52,6 +52,9 @@ def load_arguments(self, _):
     with self.argument_context('resource list') as c:
         c.argument('name', resource_name_type)
 
+    with self.argument_context('resource tag') as c:
+        c.argument('bulk', action='store_true', help='Read the current tags of the resources from one listing per resource group and only tag the resources whose tags change. Requires --ids. Returns the tagged resources.')
+
     with self.argument_context('resource move') as c:
         c.argument('ids', nargs='+')
 
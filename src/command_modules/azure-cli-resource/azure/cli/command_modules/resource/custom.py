@@ -31,6 +31,7 @@ from azure.mgmt.resource.links.models import ResourceLinkProperties
 
 from azure.cli.core.parser import IncorrectUsageError
 from azure.cli.core.util import get_file_json, shell_safe_json_parse, sdk_no_wait
+from azure.cli.core.commands import get_ids_max_workers
 from azure.cli.core.commands.client_factory import get_mgmt_service_client
 from azure.cli.core.profiles import ResourceType, get_sdk
 
@@ -41,6 +42,8 @@ from azure.cli.command_modules.resource._validators import _parse_lock_id
 
 logger = get_logger(__name__)
 
+_DELETE_POLL_INTERVAL = 1  # seconds, the deletions also signal their completion
+
 
 def _process_parameters(template_param_defs, parameter_lists):
 
@@ -332,7 +335,8 @@ def _list_resources_odata_filter_builder(resource_group_name=None, resource_prov
 
 def _get_auth_provider_latest_api_version(cli_ctx):
     rcf = _resource_client_factory(cli_ctx)
-    api_version = _ResourceUtils.resolve_api_version(rcf, 'Microsoft.Authorization', None, 'providerOperations')
+    api_version = _ResourceUtils.resolve_api_version(cli_ctx, rcf, 'Microsoft.Authorization', None,
+                                                     'providerOperations')
     return api_version
 
 
@@ -762,6 +766,27 @@ def _single_or_collection(obj, default=None):
     return obj
 
 
+def _run_for_each(operation, items, max_concurrency=1):
+    """
+    Runs the operation on every item and returns the results in the order of the items.
+    Up to max_concurrency items are processed at the same time. When there is more than one item, long running
+    operations are waited for.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from azure.cli.core.commands import _is_poller
+
+    items = list(items)
+    if len(items) <= 1:
+        return [operation(item) for item in items]
+
+    def _run(item):
+        result = operation(item)
+        return result.result() if _is_poller(result) else result
+
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(items))) as executor:
+        return list(executor.map(_run, items))
+
+
 # pylint: unused-argument
 def show_resource(cmd, resource_ids=None, resource_group_name=None,
                   resource_provider_namespace=None, parent_resource_path=None, resource_type=None,
@@ -772,9 +797,9 @@ def show_resource(cmd, resource_ids=None, resource_group_name=None,
                                                                               resource_type,
                                                                               resource_name)]
 
-    return _single_or_collection(
-        [_get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version).get_resource(
-            include_response_body) for id_dict in parsed_ids])
+    return _single_or_collection(_run_for_each(
+        lambda id_dict: _get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version).get_resource(
+            include_response_body), parsed_ids, get_ids_max_workers(cmd.cli_ctx)))
 
 
 # pylint: disable=unused-argument
@@ -784,7 +809,7 @@ def delete_resource(cmd, resource_ids=None, resource_group_name=None,
     """
     Deletes the given resource(s).
     This function allows deletion of ids with dependencies on one another.
-    This is done with multiple passes through the given ids.
+    A deletion which fails is retried whenever the deletion of another resource completes.
     """
     parsed_ids = _get_parsed_resource_ids(resource_ids) or [_create_parsed_id(resource_group_name,
                                                                               resource_provider_namespace,
@@ -794,41 +819,78 @@ def delete_resource(cmd, resource_ids=None, resource_group_name=None,
     to_be_deleted = [(_get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version), id_dict)
                      for id_dict in parsed_ids]
 
-    results = []
-    from msrestazure.azure_exceptions import CloudError
-    while to_be_deleted:
-        logger.debug("Start new loop to delete resources.")
-        operations = []
-        failed_to_delete = []
-        for rsrc_utils, id_dict in to_be_deleted:
-            try:
-                operations.append(rsrc_utils.delete())
-                resource = resource_dict_to_id(**id_dict) if id_dict.get("subscription") else resource_name
-                logger.debug("deleting %s", resource)
-            except CloudError as e:
-                # request to delete failed, add parsed id dict back to queue
-                id_dict['exception'] = str(e)
-                failed_to_delete.append((rsrc_utils, id_dict))
-        to_be_deleted = failed_to_delete
-
-        # stop deleting if none deletable
-        if not operations:
-            break
-
-        # all operations return result before next pass
-        for operation in operations:
-            results.append(operation.result())
-
-    if to_be_deleted:
+    results, failed_to_delete = _delete_resources(to_be_deleted, get_ids_max_workers(cmd.cli_ctx))
+    if failed_to_delete:
         error_msg_builder = ['Some resources failed to be deleted:']
-        for _, id_dict in to_be_deleted:
+        for _, id_dict in failed_to_delete:
             logger.debug(id_dict['exception'])
-            error_msg_builder.append(resource_dict_to_id(**id_dict))
+            error_msg_builder.append('{}: {}'.format(resource_dict_to_id(**id_dict),
+                                                     (id_dict['exception'].splitlines() or [''])[0]))
         raise CLIError(os.linesep.join(error_msg_builder))
 
     return _single_or_collection(results)
 
 
+def _delete_resources(to_be_deleted, max_concurrency=1):
+    """
+    Deletes resources which may depend on one another.
+    Up to max_concurrency deletions run at the same time. A resource whose deletion fails, e.g. because another
+    resource depends on it, is tried again as soon as another deletion completes, until no deletion succeeds anymore.
+    Returns the results of the deletions in the order of the resources and the resources which were not deleted.
+    """
+    import threading
+    from msrestazure.azure_exceptions import CloudError
+    from azure.cli.core.commands import add_poller_done_callback
+
+    pending = list(enumerate(to_be_deleted))
+    failed = []  # the resources which failed since the last deletion completed
+    in_flight = []
+    results = {}
+    completed = threading.Event()
+
+    def _fail(item, ex):
+        item[1][1]['exception'] = str(ex)
+        failed.append(item)
+
+    while pending or in_flight:
+        while pending and len(in_flight) < max_concurrency:
+            item = pending.pop(0)
+            rsrc_utils, id_dict = item[1]
+            try:
+                operation = rsrc_utils.delete()
+            except CloudError as ex:
+                # request to delete failed, try again after another deletion completes
+                _fail(item, ex)
+                continue
+            logger.debug("deleting %s", resource_dict_to_id(**id_dict) if id_dict.get("subscription") else
+                         id_dict.get('resource_name'))
+            add_poller_done_callback(operation, lambda _: completed.set())
+            in_flight.append((operation, item))
+
+        if not in_flight:
+            break  # none deletable
+
+        # wait for any of the deletions to complete
+        completed.wait(_DELETE_POLL_INTERVAL)
+        completed.clear()
+        still_in_flight = []
+        for operation, item in in_flight:
+            if not operation.done():
+                still_in_flight.append((operation, item))
+                continue
+            try:
+                results[item[0]] = operation.result()
+            except CloudError as ex:
+                _fail(item, ex)
+                continue
+            # a dependency of the failed resources may be gone
+            pending.extend(failed)
+            del failed[:]
+        in_flight = still_in_flight
+
+    return [results[index] for index in sorted(results)], [item for _, item in sorted(failed, key=lambda i: i[0])]
+
+
 # pylint: unused-argument
 def update_resource(cmd, parameters, resource_ids=None,
                     resource_group_name=None, resource_provider_namespace=None,
@@ -839,24 +901,58 @@ def update_resource(cmd, parameters, resource_ids=None,
                                                                               resource_type,
                                                                               resource_name)]
 
-    return _single_or_collection(
-        [_get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version).update(parameters) for id_dict in parsed_ids])
+    return _single_or_collection(_run_for_each(
+        lambda id_dict: _get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version).update(parameters),
+        parsed_ids, get_ids_max_workers(cmd.cli_ctx)))
 
 
 # pylint: unused-argument
 def tag_resource(cmd, tags, resource_ids=None,
                  resource_group_name=None, resource_provider_namespace=None,
-                 parent_resource_path=None, resource_type=None, resource_name=None, api_version=None):
+                 parent_resource_path=None, resource_type=None, resource_name=None, api_version=None, bulk=False):
     """ Updates the tags on an existing resource. To clear tags, specify the --tag option
     without anything else. """
+    if bulk:
+        if not resource_ids:
+            raise CLIError('usage error: --bulk requires --ids')
+        return _tag_resources_in_bulk(cmd, tags or {}, resource_ids, api_version)
+
     parsed_ids = _get_parsed_resource_ids(resource_ids) or [_create_parsed_id(resource_group_name,
                                                                               resource_provider_namespace,
                                                                               parent_resource_path,
                                                                               resource_type,
                                                                               resource_name)]
 
-    return _single_or_collection(
-        [_get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version).tag(tags) for id_dict in parsed_ids])
+    return _single_or_collection(_run_for_each(
+        lambda id_dict: _get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version).tag(tags), parsed_ids,
+        get_ids_max_workers(cmd.cli_ctx)))
+
+
+def _tag_resources_in_bulk(cmd, tags, resource_ids, api_version):
+    """
+    Tags only the resources whose tags differ from the given ones and returns them.
+    The current tags are taken from one listing per resource group instead of a GET per resource. Resources which
+    are not part of the listing, e.g. child resources, resources of another subscription or resources outside of
+    a resource group, are always tagged.
+    """
+    parsed_ids = list(zip(resource_ids, _get_parsed_resource_ids(resource_ids)))
+    rcf = _resource_client_factory(cmd.cli_ctx)
+    subscription_id = rcf.config.subscription_id.lower()
+    resource_groups = sorted({id_dict['resource_group'].lower() for _, id_dict in parsed_ids
+                              if id_dict.get('resource_group') and
+                              id_dict.get('subscription', '').lower() == subscription_id})
+    max_workers = get_ids_max_workers(cmd.cli_ctx)
+
+    current_tags = {}
+    for resources in _run_for_each(lambda rg: list(rcf.resources.list_by_resource_group(rg)), resource_groups,
+                                   max_workers):
+        current_tags.update((r.id.lower(), r.tags or {}) for r in resources)
+
+    to_be_tagged = [id_dict for rid, id_dict in parsed_ids if current_tags.get(rid.lower()) != tags]
+    logger.info('%d of %d resources already have the tags.', len(parsed_ids) - len(to_be_tagged), len(parsed_ids))
+    return _run_for_each(
+        lambda id_dict: _get_rsrc_util_from_parsed_id(cmd.cli_ctx, id_dict, api_version).tag(tags).result(),
+        to_be_tagged, max_workers)
 
 
 # pylint: unused-argument
@@ -1607,11 +1703,11 @@ class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
         self.rcf = rcf or _resource_client_factory(cli_ctx)
         if api_version is None:
             if resource_id:
-                api_version = _ResourceUtils._resolve_api_version_by_id(self.rcf, resource_id)
+                api_version = _ResourceUtils._resolve_api_version_by_id(cli_ctx, self.rcf, resource_id)
             else:
                 _validate_resource_inputs(resource_group_name, resource_provider_namespace,
                                           resource_type, resource_name)
-                api_version = _ResourceUtils.resolve_api_version(self.rcf,
+                api_version = _ResourceUtils.resolve_api_version(cli_ctx, self.rcf,
                                                                  resource_provider_namespace,
                                                                  parent_resource_path,
                                                                  resource_type)
@@ -1779,26 +1875,12 @@ class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
                                     self.rcf.resources.config.long_running_operation_timeout)
 
     @staticmethod
-    def resolve_api_version(rcf, resource_provider_namespace, parent_resource_path, resource_type):
-        provider = rcf.providers.get(resource_provider_namespace)
-
-        # If available, we will use parent resource's api-version
-        resource_type_str = (parent_resource_path.split('/')[0] if parent_resource_path else resource_type)
-
-        rt = [t for t in provider.resource_types
-              if t.resource_type.lower() == resource_type_str.lower()]
-        if not rt:
-            raise IncorrectUsageError('Resource type {} not found.'.format(resource_type_str))
-        if len(rt) == 1 and rt[0].api_versions:
-            npv = [v for v in rt[0].api_versions if 'preview' not in v.lower()]
-            return npv[0] if npv else rt[0].api_versions[0]
-        else:
-            raise IncorrectUsageError(
-                'API version is required and could not be resolved for resource {}'
-                .format(resource_type))
+    def resolve_api_version(cli_ctx, rcf, resource_provider_namespace, parent_resource_path, resource_type):
+        from azure.cli.core.commands.arm import resolve_api_version
+        return resolve_api_version(cli_ctx, rcf, resource_provider_namespace, resource_type, parent_resource_path)
 
     @staticmethod
-    def _resolve_api_version_by_id(rcf, resource_id):
+    def _resolve_api_version_by_id(cli_ctx, rcf, resource_id):
         parts = parse_resource_id(resource_id)
         namespace = parts.get('child_namespace_1', parts['namespace'])
         if parts.get('child_type_2'):
@@ -1817,4 +1899,4 @@ class _ResourceUtils(object):  # pylint: disable=too-many-instance-attributes
             parent = None
             resource_type = parts['type']
 
-        return _ResourceUtils.resolve_api_version(rcf, namespace, parent, resource_type)
+        return _ResourceUtils.resolve_api_version(cli_ctx, rcf, namespace, parent, resource_type)
@@ -78,6 +78,38 @@ class TestApiCheck(unittest.TestCase):
                                    resource_group_name='rg', rcf=rcf)
         self.assertEqual(res_utils.api_version, "2005-01-01-preview")
 
+    def test_resolve_api_caches_provider(self):
+        import shutil
+        import tempfile
+        from mock import patch
+        from azure.cli.core._session import Session
+        from azure.cli.testsdk import TestCli
+        cli = TestCli()
+        cli.config.config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cli.config.config_dir)
+        rcf = self._get_mock_client()
+        rcf.config.subscription_id = 'sub1'
+
+        with patch('azure.cli.core._session.PROVIDER_CACHE', Session()):
+            for resource_type in ['test', 'foo', 'Test']:
+                res_utils = _ResourceUtils(cli, resource_type='Mock/' + resource_type, resource_name='vnet1',
+                                           resource_group_name='rg', rcf=rcf)
+            self.assertEqual(res_utils.api_version, "2016-01-01")
+            self.assertEqual(rcf.providers.get.call_count, 1)
+
+            # the cache is refreshed for resource types it does not know
+            with self.assertRaises(CLIError):
+                _ResourceUtils(cli, resource_type='Mock/new', resource_name='vnet1', resource_group_name='rg',
+                               rcf=rcf)
+            self.assertEqual(rcf.providers.get.call_count, 2)
+
+        # other processes use the cache file
+        with patch('azure.cli.core._session.PROVIDER_CACHE', Session()):
+            res_utils = _ResourceUtils(cli, resource_type='Mock/test', resource_name='vnet1',
+                                       resource_group_name='rg', rcf=rcf)
+            self.assertEqual(res_utils.api_version, "2016-01-01")
+            self.assertEqual(rcf.providers.get.call_count, 2)
+
     def _get_mock_client(self):
         client = MagicMock()
         provider = MagicMock()
@@ -18,7 +18,8 @@ except ImportError:
 from azure.cli.core.util import CLIError, get_file_json, shell_safe_json_parse
 from azure.cli.command_modules.resource.custom import \
     (_get_missing_parameters, _extract_lock_params, _process_parameters, _find_missing_parameters,
-     _prompt_for_parameters, _load_file_string_or_uri)
+     _prompt_for_parameters, _load_file_string_or_uri, _delete_resources, delete_resource, tag_resource,
+     _run_for_each)
 
 
 def _simulate_no_tty():
@@ -302,5 +303,151 @@ class TestCustom(unittest.TestCase):
         self.assertTrue(str(list(results.keys())) in param_alpha_order)
 
 
+class _FakeDeletion(object):
+    def __init__(self, on_done, delay):
+        import threading
+        self._callbacks = []
+        self._done = False
+        self._on_done = on_done
+        threading.Timer(delay, self._complete).start()
+
+    def _complete(self):
+        self._on_done()
+        self._done = True
+        for callback in self._callbacks:
+            callback(self)
+
+    def add_done_callback(self, callback):
+        self._callbacks.append(callback)
+
+    def done(self):
+        return self._done
+
+    def result(self):  # pylint: disable=no-self-use
+        return None
+
+
+class TestDeleteResources(unittest.TestCase):
+
+    def test_delete_resources_with_dependencies(self):
+        from msrestazure.azure_exceptions import CloudError
+        existing = set(['vm', 'nic', 'vnet', 'nsg', 'locked'])
+        dependencies = {'nic': ['vm'], 'vnet': ['nic'], 'nsg': ['nic']}
+        attempts = []
+
+        class _Resource(object):
+            def __init__(self, name):
+                self.name = name
+
+            def delete(self):
+                attempts.append(self.name)
+                if self.name == 'locked' or any(d in existing for d in dependencies.get(self.name, [])):
+                    ex = CloudError(mock.MagicMock(status_code=409), error='Conflict')
+                    ex.error = '{} is in use'.format(self.name)
+                    raise ex
+                return _FakeDeletion(lambda: existing.discard(self.name), delay=0.05)
+
+        names = ['vnet', 'nsg', 'locked', 'nic', 'vm']
+        to_be_deleted = [(_Resource(n), {'resource_name': n}) for n in names]
+        results, failed = _delete_resources(to_be_deleted, max_concurrency=2)
+
+        self.assertEqual(existing, set(['locked']))
+        self.assertEqual(len(results), 4)
+        self.assertEqual([id_dict['resource_name'] for _, id_dict in failed], ['locked'])
+        self.assertIn('locked is in use', failed[0][1]['exception'])
+        # a failed deletion is only tried again after another one succeeded
+        self.assertLessEqual(attempts.count('locked'), 5)
+
+    def test_delete_resources_completed_on_first_response(self):
+        # like AzureOperationPoller, refuses done callbacks once completed
+        deletion = mock.MagicMock(**{'done.return_value': True, 'result.return_value': 'deleted',
+                                     'add_done_callback.side_effect': ValueError('Process is complete.')})
+        resource = mock.MagicMock(**{'delete.return_value': deletion})
+        results, failed = _delete_resources([(resource, {'resource_name': 'vm'})])
+        self.assertEqual((results, failed), (['deleted'], []))
+
+    @mock.patch('azure.cli.command_modules.resource.custom._get_rsrc_util_from_parsed_id', autospec=True)
+    def test_delete_resource_reports_empty_errors(self, get_rsrc_util):
+        from msrestazure.azure_exceptions import CloudError
+        ex = CloudError(mock.MagicMock(status_code=409), error='Conflict')
+        ex.error = ex.message = ''
+        get_rsrc_util.return_value.delete.side_effect = ex
+        with self.assertRaises(CLIError) as context:
+            delete_resource(mock.MagicMock(**{'cli_ctx.config.getint.return_value': 1}), resource_ids=[
+                '/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Web/sites/site1'])
+        self.assertIn('Microsoft.Web/sites/site1: ', str(context.exception))
+
+
+class TestRunForEach(unittest.TestCase):
+
+    def test_run_for_each_waits_for_azure_operation_pollers(self):
+        import requests
+        from msrestazure.azure_operation import AzureOperationPoller
+
+        def _operation(item):
+            response = requests.Response()
+            response.status_code = 200
+            content = b'{"properties": {"provisioningState": "Succeeded"}}'
+            response._content = content  # pylint: disable=protected-access
+            response.request = requests.Request('PUT', 'https://management.azure.com/resource').prepare()
+            return AzureOperationPoller(lambda: response, lambda _: item, None)
+
+        self.assertEqual(_run_for_each(_operation, ['a', 'b', 'c']), ['a', 'b', 'c'])
+
+    def test_run_for_each_limits_concurrency(self):
+        import threading
+        import time
+        lock = threading.Lock()
+        running = []
+        concurrency = []
+
+        def _operation(item):
+            with lock:
+                running.append(item)
+                concurrency.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(item)
+            return item * 2
+
+        self.assertEqual(_run_for_each(_operation, [1, 2, 3, 4]), [2, 4, 6, 8])
+        self.assertEqual(max(concurrency), 1)
+        del concurrency[:]
+        self.assertEqual(_run_for_each(_operation, [1, 2, 3, 4], max_concurrency=2), [2, 4, 6, 8])
+        self.assertEqual(max(concurrency), 2)
+
+
+class TestTagResources(unittest.TestCase):
+
+    @mock.patch('azure.cli.command_modules.resource.custom._get_rsrc_util_from_parsed_id', autospec=True)
+    @mock.patch('azure.cli.command_modules.resource.custom._resource_client_factory', autospec=True)
+    def test_tag_resources_in_bulk(self, client_factory, get_rsrc_util):
+        rid = '/subscriptions/sub1/resourceGroups/{}/providers/Microsoft.Web/sites/{}'
+        listed = {
+            'rg1': [mock.MagicMock(id=rid.format('RG1', 'tagged'), tags={'env': 'prod'}),
+                    mock.MagicMock(id=rid.format('rg1', 'untagged'), tags=None)],
+            'rg2': [mock.MagicMock(id=rid.format('rg2', 'other'), tags={'env': 'test'})]
+        }
+        rcf = client_factory.return_value
+        rcf.config.subscription_id = 'sub1'
+        rcf.resources.list_by_resource_group.side_effect = lambda rg: iter(listed[rg])
+        get_rsrc_util.side_effect = lambda _, id_dict, __: mock.MagicMock(**{
+            'tag.return_value.result.return_value': id_dict['resource_name']})
+
+        ids = [rid.format('rg1', 'tagged'), rid.format('rg1', 'untagged'), rid.format('rg2', 'other'),
+               rid.format('rg2', 'new'), '/subscriptions/sub2/resourceGroups/rg3/providers/Microsoft.Web/sites/remote',
+               '/subscriptions/sub1/providers/Microsoft.Web/sites/ungrouped']
+        cmd = mock.MagicMock(**{'cli_ctx.config.getint.return_value': 2})
+        result = tag_resource(cmd, {'env': 'prod'}, resource_ids=ids, bulk=True)
+
+        # the resource which already has the tags is left alone, unknown resources are tagged
+        self.assertEqual(result, ['untagged', 'other', 'new', 'remote', 'ungrouped'])
+        cmd.cli_ctx.config.getint.assert_called_with('core', 'ids_max_workers', fallback=1)
+        self.assertEqual(sorted(c[0][0] for c in rcf.resources.list_by_resource_group.call_args_list), ['rg1', 'rg2'])
+
+        with self.assertRaises(CLIError):
+            tag_resource(mock.MagicMock(), {'env': 'prod'}, resource_group_name='rg1', resource_name='a', bulk=True)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -291,6 +291,16 @@ helps['storage blob upload-batch'] = """
           short-summary: The max length in bytes permitted for an append blob.
         - name: --lease-id
           short-summary: Required if the blob has an active lease
+        - name: --max-workers
+          type: integer
+          short-summary: The maximum number of files to upload in parallel. Default value is 1.
+          long-summary: When more than one file is uploaded at a time, the aggregate progress and throughput of
+                        the batch is reported instead of the progress of each file.
+    examples:
+        - name: Upload all files in a directory, transferring 16 files at a time.
+          text: az storage blob upload-batch -d mycontainer -s <path-to-directory> --max-workers 16
+        - name: Upload only the files which are new or were modified since the previous upload.
+          text: az storage blob upload-batch -d mycontainer -s <path-to-directory> --skip-unchanged
 """
 
 helps['storage blob download-batch'] = """
@@ -311,6 +321,16 @@ helps['storage blob download-batch'] = """
         - name: --dryrun
           type: bool
           short-summary: Show the summary of the operations to be taken instead of actually downloading the file(s).
+        - name: --max-workers
+          type: integer
+          short-summary: The maximum number of blobs to download in parallel. Default value is 1.
+          long-summary: When more than one blob is downloaded at a time, the aggregate progress and throughput of
+                        the batch is reported instead of the progress of each blob.
+    examples:
+        - name: Download all blobs in a container, transferring 16 blobs at a time.
+          text: az storage blob download-batch -d . -s mycontainer --max-workers 16
+        - name: Download only the blobs whose content differs from the local files, comparing their MD5 hashes.
+          text: az storage blob download-batch -d . -s mycontainer --skip-unchanged --check-md5
 """
 
 helps['storage blob delete-batch'] = """
@@ -337,7 +357,14 @@ helps['storage blob delete-batch'] = """
           short-summary: An ETag value, or the wildcard character (*).
           long-summary: Specify this header to perform the operation only if the resource's ETag does not match the value specified.
                         Specify the wildcard character (*) to perform the operation only if the resource does not exist, and fail the operation if it does exist.
-
+        - name: --max-workers
+          type: integer
+          short-summary: The maximum number of blobs to delete in parallel. Default value is 1.
+          long-summary: A blob which fails to be deleted does not stop the batch. The blobs which could not be deleted
+                        are reported once all the other blobs are processed, and the command then fails.
+    examples:
+        - name: Delete all blobs ending with ".py" in a container, deleting 16 blobs at a time.
+          text: az storage blob delete-batch -s mycontainer --pattern *.py --max-workers 16
 """
 
 helps['storage blob copy start-batch'] = """
@@ -372,6 +399,14 @@ helps['storage blob copy start-batch'] = """
         - name: --source-sas
           type: string
           short-summary: The shared access signature for the source storage account.
+        - name: --max-workers
+          type: integer
+          short-summary: The maximum number of copy operations to start in parallel. Default value is 1.
+          long-summary: A file or blob which fails to be copied does not stop the batch. The ones which could not be
+                        copied are reported once all the others are processed, and the command then fails.
+    examples:
+        - name: Copy all blobs of a container to another container, starting 16 copies at a time.
+          text: az storage blob copy start-batch --source-container sourcecontainer -c mycontainer --max-workers 16
 """
 
 helps['storage container'] = """
@@ -12,7 +12,8 @@ from ._validators import (get_datetime_type, validate_metadata, get_permission_v
                           validate_included_datasets, validate_custom_domain, validate_container_public_access,
                           validate_table_payload_format, validate_key, add_progress_callback,
                           storage_account_key_options, process_file_download_namespace, process_metric_update_namespace,
-                          get_char_options_validator, validate_bypass, validate_encryption_source, validate_marker)
+                          get_char_options_validator, validate_bypass, validate_encryption_source, validate_marker,
+                          validate_max_workers, validate_check_md5)
 
 
 def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statements
@@ -59,6 +60,14 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
                                     action='store_true', validator=add_progress_callback)
     socket_timeout_type = CLIArgumentType(help='The socket timeout(secs), used by the service to regulate data flow.',
                                           type=int)
+    max_workers_type = CLIArgumentType(type=int, validator=validate_max_workers,
+                                       help='The maximum number of blobs or files to process in parallel.')
+    skip_unchanged_type = CLIArgumentType(action='store_true', arg_group='Synchronization',
+                                          help='Only transfer the files whose size differs from the destination or '
+                                               'whose source was modified after the destination.')
+    check_md5_type = CLIArgumentType(action='store_true', arg_group='Synchronization', validator=validate_check_md5,
+                                     help='Compare the Content-MD5 of the blobs with the MD5 of the local files '
+                                          'instead of their modification time. Requires --skip-unchanged.')
 
     sas_help = 'The permissions the SAS grants. Allowed values: {}. Do not use if a stored access policy is ' \
                'referenced with --id that specifies this value. Can be combined.'
@@ -277,6 +286,9 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.argument('maxsize_condition', arg_group='Content Control')
         c.argument('validate_content', action='store_true', min_api='2016-05-31', arg_group='Content Control')
         c.argument('blob_type', options_list=('--type', '-t'), arg_type=get_enum_type(get_blob_types()))
+        c.argument('max_workers', max_workers_type)
+        c.argument('skip_unchanged', skip_unchanged_type)
+        c.argument('check_md5', check_md5_type)
         c.extra('no_progress', progress_type)
         c.extra('socket_timeout', socket_timeout_type)
 
@@ -299,6 +311,9 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.extra('socket_timeout', socket_timeout_type)
         c.argument('max_connections', type=int,
                    help='Maximum number of parallel connections to use when the blob size exceeds 64MB.')
+        c.argument('max_workers', max_workers_type)
+        c.argument('skip_unchanged', skip_unchanged_type)
+        c.argument('check_md5', check_md5_type)
 
     with self.argument_context('storage blob delete') as c:
         from .sdkutil import get_delete_blob_snapshot_type_names
@@ -312,6 +327,7 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.argument('delete_snapshots', arg_type=get_enum_type(get_delete_blob_snapshot_type_names()),
                    help='Required if the blob has associated snapshots.')
         c.argument('lease_id', help='Required if the blob has an active lease.')
+        c.argument('max_workers', max_workers_type)
 
     with self.argument_context('storage blob lease') as c:
         c.argument('lease_duration', type=int)
@@ -348,6 +364,9 @@ def load_arguments(self, _):  # pylint: disable=too-many-locals, too-many-statem
         c.argument('source_share')
         c.argument('prefix', validator=process_blob_copy_batch_namespace)
 
+    with self.argument_context('storage blob copy start-batch') as c:
+        c.argument('max_workers', max_workers_type)
+
     with self.argument_context('storage blob incremental-copy start') as c:
         from azure.cli.command_modules.storage._validators import process_blob_source_uri
 
@@ -458,6 +458,16 @@ def validate_marker(namespace):
     namespace.marker = marker
 
 
+def validate_max_workers(namespace):
+    if namespace.max_workers is not None and namespace.max_workers < 1:
+        raise ValueError('incorrect usage: --max-workers must be a positive integer')
+
+
+def validate_check_md5(namespace):
+    if namespace.check_md5 and not namespace.skip_unchanged:
+        raise ValueError('incorrect usage: --check-md5 requires --skip-unchanged')
+
+
 def get_file_path_validator(default_file_param=None):
     """ Creates a namespace validator that splits out 'path' into 'directory_name' and 'file_name'.
     Allows another path-type parameter to be named which can supply a default filename. """
@@ -12,9 +12,11 @@ from azure.cli.command_modules.storage.util import (create_blob_service_from_sto
                                                     create_file_share_from_storage_client,
                                                     create_short_lived_share_sas,
                                                     create_short_lived_container_sas,
-                                                    filter_none, collect_blobs, collect_files,
+                                                    filter_none, collect_blobs, collect_blob_properties, collect_files,
                                                     mkdir_p, guess_content_type, normalize_blob_file_path,
-                                                    check_precondition_success)
+                                                    check_precondition_success, run_batch,
+                                                    run_batch_with_failure_report, BatchTransferProgress, get_file_md5,
+                                                    is_file_in_sync_with_blob)
 from azure.cli.command_modules.storage.url_quote_util import encode_for_url, make_encoded_file_url_and_params
 
 
@@ -47,7 +49,7 @@ def set_delete_policy(client, enable=None, days_retained=None):
 
 def storage_blob_copy_batch(cmd, client, source_client, destination_container=None,
                             destination_path=None, source_container=None, source_share=None,
-                            source_sas=None, pattern=None, dryrun=False):
+                            source_sas=None, pattern=None, dryrun=False, max_workers=1):
     """Copy a group of blob or files to a blob container."""
     logger = None
     if dryrun:
@@ -78,9 +80,10 @@ def storage_blob_copy_batch(cmd, client, source_client, destination_container=No
                 return _copy_blob_to_blob_container(client, source_client, destination_container, destination_path,
                                                     source_container, source_sas, blob_name)
 
-        return list(filter_none(action_blob_copy(blob) for blob in collect_blobs(source_client,
-                                                                                 source_container,
-                                                                                 pattern)))
+        source_blobs = collect_blobs(source_client, source_container, pattern)
+        if dryrun:
+            return list(filter_none(action_blob_copy(blob) for blob in source_blobs))
+        return run_batch_with_failure_report(action_blob_copy, source_blobs, max_workers, action='copy blob')
 
     elif source_share:
         # copy blob from file share
@@ -101,54 +104,92 @@ def storage_blob_copy_batch(cmd, client, source_client, destination_container=No
                 return _copy_file_to_blob_container(client, source_client, destination_container, destination_path,
                                                     source_share, source_sas, dir_name, file_name)
 
-        return list(filter_none(action_file_copy(file) for file in collect_files(cmd,
-                                                                                 source_client,
-                                                                                 source_share,
-                                                                                 pattern)))
+        source_files = collect_files(cmd, source_client, source_share, pattern)
+        if dryrun:
+            return list(filter_none(action_file_copy(file) for file in source_files))
+        return run_batch_with_failure_report(action_file_copy, source_files, max_workers, action='copy file',
+                                             describe=lambda file_info: os.path.join(*file_info))
     else:
         raise ValueError('Fail to find source. Neither blob container or file share is specified')
 
 
-# pylint: disable=unused-argument
-def storage_blob_download_batch(client, source, destination, source_container_name, pattern=None, dryrun=False,
-                                progress_callback=None, max_connections=2):
+# pylint: disable=unused-argument, too-many-locals
+def storage_blob_download_batch(cmd, client, source, destination, source_container_name, pattern=None, dryrun=False,
+                                progress_callback=None, max_connections=2, max_workers=1, skip_unchanged=False,
+                                check_md5=False):
 
-    def _download_blob(blob_service, container, destination_folder, normalized_blob_name, blob_name):
+    def _is_unchanged(blob):
+        normalized_blob_name, _, blob_properties = blob
+        return skip_unchanged and is_file_in_sync_with_blob(os.path.join(destination, normalized_blob_name),
+                                                            blob_properties, blob_is_source=True, check_md5=check_md5)
+
+    def _download_blob(blob):
+        if _is_unchanged(blob):
+            return None
+
+        normalized_blob_name, blob_name, _ = blob
         # TODO: try catch IO exception
-        destination_path = os.path.join(destination_folder, normalized_blob_name)
+        destination_path = os.path.join(destination, normalized_blob_name)
         destination_folder = os.path.dirname(destination_path)
         if not os.path.exists(destination_folder):
             mkdir_p(destination_folder)
 
-        blob = blob_service.get_blob_to_path(container, blob_name, destination_path, max_connections=max_connections,
-                                             progress_callback=progress_callback)
-        return blob.name
+        return client.get_blob_to_path(source_container_name, blob_name, destination_path,
+                                       max_connections=max_connections, progress_callback=progress_callback)
 
-    source_blobs = collect_blobs(client, source_container_name, pattern)
-    blobs_to_download = {}
-    for blob_name in source_blobs:
-        # remove starting path seperator and normalize
-        normalized_blob_name = normalize_blob_file_path(None, blob_name)
-        if normalized_blob_name in blobs_to_download:
-            from knack.util import CLIError
-            raise CLIError('Multiple blobs with download path: `{}`. As a solution, use the `--pattern` parameter '
-                           'to select for a subset of blobs to download OR utilize the `storage blob download` '
-                           'command instead to download individual blobs.'.format(normalized_blob_name))
-        blobs_to_download[normalized_blob_name] = blob_name
+    def _collect_blobs_to_download():
+        if skip_unchanged:
+            # the listing provides the properties used to compare the blobs with the local files
+            source_blobs = collect_blob_properties(client, source_container_name, pattern)
+        else:
+            source_blobs = ((blob_name, None) for blob_name in collect_blobs(client, source_container_name, pattern))
+
+        download_paths = set()
+        for blob_name, blob_properties in source_blobs:
+            # remove starting path seperator and normalize
+            normalized_blob_name = normalize_blob_file_path(None, blob_name)
+            if normalized_blob_name in download_paths:
+                from knack.util import CLIError
+                raise CLIError('Multiple blobs with download path: `{}`. As a solution, use the `--pattern` '
+                               'parameter to select for a subset of blobs to download OR utilize the `storage blob '
+                               'download` command instead to download individual blobs.'.format(normalized_blob_name))
+            download_paths.add(normalized_blob_name)
+            yield normalized_blob_name, blob_name, blob_properties
 
+    logger = get_logger(__name__)
     if dryrun:
-        logger = get_logger(__name__)
+        blobs_to_download = [blob[1] for blob in _collect_blobs_to_download() if not _is_unchanged(blob)]
         logger.warning('download action: from %s to %s', source, destination)
         logger.warning('    pattern %s', pattern)
         logger.warning('  container %s', source_container_name)
-        logger.warning('      total %d', len(source_blobs))
+        logger.warning('      total %d', len(blobs_to_download))
         logger.warning(' operations')
-        for b in source_blobs:
+        for b in blobs_to_download:
             logger.warning('  - %s', b)
         return []
 
-    return list(_download_blob(client, source_container_name, destination, blob_normed, blobs_to_download[blob_normed])
-                for blob_normed in blobs_to_download)
+    # per-blob progress cannot be displayed for concurrent downloads, the aggregate progress is reported instead.
+    # The number of blobs is not known in advance as the downloads start while the container is still being listed.
+    progress = None
+    if max_workers > 1 and progress_callback:
+        progress = BatchTransferProgress(cmd.cli_ctx)
+        progress_callback = None
+
+    results = []
+    skipped = 0
+    for blob in run_batch(_download_blob, _collect_blobs_to_download(), max_workers):
+        if progress:
+            progress.add(blob.properties.content_length if blob else 0)
+        if blob:
+            results.append(blob.name)
+        else:
+            skipped += 1
+    if progress:
+        progress.end()
+
+    if skip_unchanged:
+        logger.warning('Skipped %d unchanged blob(s).', skipped)
+    return results
 
 
 def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  # pylint: disable=too-many-locals
@@ -157,7 +198,8 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
                               content_settings=None, metadata=None, validate_content=False,
                               maxsize_condition=None, max_connections=2, lease_id=None, progress_callback=None,
                               if_modified_since=None, if_unmodified_since=None, if_match=None,
-                              if_none_match=None, timeout=None, dryrun=False):
+                              if_none_match=None, timeout=None, dryrun=False, max_workers=1, skip_unchanged=False,
+                              check_md5=False):
     def _create_return_result(blob_name, blob_content_settings, upload_result=None):
         blob_name = normalize_blob_file_path(destination_path, blob_name)
         return {
@@ -166,9 +208,21 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
             'Last Modified': upload_result.last_modified if upload_result else None,
             'eTag': upload_result.etag if upload_result else None}
 
+    def _is_unchanged(src, dst):
+        return skip_unchanged and is_file_in_sync_with_blob(
+            src, destination_blob_properties.get(normalize_blob_file_path(destination_path, dst)),
+            blob_is_source=False, check_md5=check_md5)
+
     logger = get_logger(__name__)
     t_content_settings = cmd.get_models('blob.models#ContentSettings')
 
+    destination_blob_properties = {}
+    if skip_unchanged:
+        # list the destination once to find the blobs which already hold the content of the local files
+        prefix = normalize_blob_file_path(None, destination_path) if destination_path else None
+        destination_blob_properties = {blob.name: blob.properties for blob in
+                                       client.list_blobs(destination_container_name, prefix=prefix)}
+
     results = []
     if dryrun:
         logger.info('upload action: from %s to %s', source, destination)
@@ -178,15 +232,37 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
         logger.info('      total %d', len(source_files))
         results = []
         for src, dst in source_files or []:
-            results.append(_create_return_result(dst, guess_content_type(src, content_settings, t_content_settings)))
+            if not _is_unchanged(src, dst):
+                results.append(_create_return_result(dst, guess_content_type(src, content_settings,
+                                                                             t_content_settings)))
     else:
         @check_precondition_success
         def _upload_blob(*args, **kwargs):
             return upload_blob(*args, **kwargs)
 
-        for src, dst in source_files or []:
+        # per-file progress cannot be displayed for concurrent uploads, the aggregate progress is reported instead
+        progress = None
+        if max_workers > 1 and progress_callback:
+            progress = BatchTransferProgress(cmd.cli_ctx, len(source_files or []),
+                                             sum(os.path.getsize(src) for src, _ in source_files or []))
+            progress_callback = None
+
+        def _upload_file(source_file):
+            src, dst = source_file
+            if _is_unchanged(src, dst):
+                return src, dst, None, False, None
+
             logger.warning('uploading %s', src)
             guessed_content_settings = guess_content_type(src, content_settings, t_content_settings)
+            if check_md5:
+                # store the MD5 of the file so that the content can be compared by later runs
+                guessed_content_settings = t_content_settings(
+                    content_type=guessed_content_settings.content_type,
+                    content_encoding=guessed_content_settings.content_encoding,
+                    content_disposition=guessed_content_settings.content_disposition,
+                    content_language=guessed_content_settings.content_language,
+                    content_md5=get_file_md5(src),
+                    cache_control=guessed_content_settings.cache_control)
 
             include, result = _upload_blob(cmd, client, destination_container_name,
                                            normalize_blob_file_path(destination_path, dst), src,
@@ -197,8 +273,22 @@ def storage_blob_upload_batch(cmd, client, source, destination, pattern=None,  #
                                            if_modified_since=if_modified_since,
                                            if_unmodified_since=if_unmodified_since, if_match=if_match,
                                            if_none_match=if_none_match, timeout=timeout)
-            if include:
+            return src, dst, guessed_content_settings, include, result
+
+        skipped = 0
+        for src, dst, guessed_content_settings, include, result in run_batch(_upload_file, source_files or [],
+                                                                             max_workers):
+            if progress:
+                progress.add(os.path.getsize(src))
+            if guessed_content_settings is None:
+                skipped += 1
+            elif include:
                 results.append(_create_return_result(dst, guessed_content_settings, result))
+        if progress:
+            progress.end()
+
+        if skip_unchanged:
+            logger.warning('Skipped %d unchanged file(s).', skipped)
 
     return results
 
@@ -304,7 +394,7 @@ def show_blob(cmd, client, container_name, blob_name, snapshot=None, lease_id=No
 
 def storage_blob_delete_batch(client, source, source_container_name, pattern=None, lease_id=None,
                               delete_snapshots=None, if_modified_since=None, if_unmodified_since=None, if_match=None,
-                              if_none_match=None, timeout=None, dryrun=False):
+                              if_none_match=None, timeout=None, dryrun=False, max_workers=1):
     @check_precondition_success
     def _delete_blob(blob_name):
         delete_blob_args = {
@@ -320,9 +410,10 @@ def storage_blob_delete_batch(client, source, source_container_name, pattern=Non
         }
         return client.delete_blob(**delete_blob_args)
 
-    source_blobs = list(collect_blobs(client, source_container_name, pattern))
+    source_blobs = collect_blobs(client, source_container_name, pattern)
 
     if dryrun:
+        source_blobs = list(source_blobs)
         logger = get_logger(__name__)
         logger.warning('delete action: from %s', source)
         logger.warning('    pattern %s', pattern)
@@ -333,7 +424,8 @@ def storage_blob_delete_batch(client, source, source_container_name, pattern=Non
             logger.warning('  - %s', blob)
         return []
 
-    return [result for include, result in (_delete_blob(blob) for blob in source_blobs) if include]
+    results = run_batch_with_failure_report(_delete_blob, source_blobs, max_workers, action='delete blob')
+    return [result for include, result in results if include]
 
 
 def _copy_blob_to_blob_container(blob_service, source_blob_service, destination_container, destination_path,
@@ -345,10 +437,10 @@ def _copy_blob_to_blob_container(blob_service, source_blob_service, destination_
     try:
         blob_service.copy_blob(destination_container, destination_blob_name, source_blob_url)
         return blob_service.make_blob_url(destination_container, destination_blob_name)
-    except AzureException:
+    except AzureException as ex:
         from knack.util import CLIError
-        error_template = 'Failed to copy blob {} to container {}.'
-        raise CLIError(error_template.format(source_blob_name, destination_container))
+        error_template = 'Failed to copy blob {} to container {}. {}'
+        raise CLIError(error_template.format(source_blob_name, destination_container, ex))
 
 
 def _copy_file_to_blob_container(blob_service, source_file_service, destination_container, destination_path,
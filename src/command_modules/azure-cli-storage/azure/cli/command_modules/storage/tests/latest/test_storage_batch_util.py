@@ -0,0 +1,179 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import threading
+import time
+import unittest
+
+import mock
+from knack.util import CLIError
+
+from azure.cli.command_modules.storage.util import (run_batch, run_batch_with_failure_report, BatchTransferProgress,
+                                                    get_file_md5, is_file_in_sync_with_blob, collect_blobs,
+                                                    _get_pattern_prefix)
+
+
+class TestStorageBatchUtil(unittest.TestCase):
+
+    def test_run_batch_serial(self):
+        self.assertEqual(list(run_batch(lambda x: x * 2, [3, 1, 2])), [6, 2, 4])
+
+    def test_run_batch_preserves_order(self):
+        def _operation(x):
+            time.sleep(0.01 * (5 - x))
+            return x
+
+        self.assertEqual(list(run_batch(_operation, range(5), max_workers=5)), list(range(5)))
+
+    def test_run_batch_bounds_concurrency(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def _operation(x):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.01)
+            with lock:
+                state['active'] -= 1
+            return x
+
+        self.assertEqual(list(run_batch(_operation, range(20), max_workers=3)), list(range(20)))
+        self.assertLessEqual(state['peak'], 3)
+        self.assertGreater(state['peak'], 1)
+
+    def test_run_batch_consumes_items_lazily(self):
+        consumed = []
+
+        def _items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        results = run_batch(lambda x: x, _items(), max_workers=2)
+        self.assertEqual(next(results), 0)
+        self.assertLess(len(consumed), 100)
+        self.assertEqual(list(results), list(range(1, 100)))
+
+    def test_run_batch_raises_operation_error(self):
+        def _operation(x):
+            if x == 3:
+                raise ValueError('failed')
+            return x
+
+        with self.assertRaises(ValueError):
+            list(run_batch(_operation, range(10), max_workers=4))
+
+    def test_run_batch_with_failure_report(self):
+        processed = []
+
+        def _operation(x):
+            processed.append(x)
+            if x % 4 == 0:
+                raise ValueError('failed')
+            return x
+
+        self.assertEqual(run_batch_with_failure_report(_operation, range(1, 4), max_workers=2), [1, 2, 3])
+
+        with self.assertRaises(CLIError) as cm:
+            run_batch_with_failure_report(_operation, range(1, 10), max_workers=3, action='delete blob',
+                                          describe=lambda x: 'blob{}'.format(x))
+        self.assertIn('2 of 9 item(s) failed and 7 succeeded', str(cm.exception))
+        self.assertIn('blob4, blob8', str(cm.exception))
+        # the failures do not stop the remaining items from being processed
+        self.assertEqual(sorted(processed[3:]), list(range(1, 10)))
+
+    def test_batch_transfer_progress(self):
+        cli_ctx = mock.MagicMock()
+        hook = cli_ctx.get_progress_controller.return_value
+
+        progress = BatchTransferProgress(cli_ctx, total_count=2, total_bytes=300)
+        progress.add(100)
+        self.assertEqual(hook.add.call_args[1]['value'], 100)
+        self.assertEqual(hook.add.call_args[1]['total_val'], 300)
+        self.assertTrue(hook.add.call_args[1]['message'].startswith('1/2 '))
+        progress.add(200)
+        progress.end()
+        self.assertEqual(progress.bytes, 300)
+        hook.end.assert_called_once_with()
+
+        # falls back to counting items when the size is unknown
+        progress = BatchTransferProgress(cli_ctx, total_count=4)
+        progress.add()
+        self.assertEqual(hook.add.call_args[1]['value'], 1)
+        self.assertEqual(hook.add.call_args[1]['total_val'], 4)
+
+    def test_is_file_in_sync_with_blob(self):
+        import os
+        import tempfile
+        from datetime import datetime, timedelta
+
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(b'hello world')
+        self.addCleanup(os.remove, f.name)
+
+        file_mtime = datetime.utcfromtimestamp(int(os.path.getmtime(f.name)))
+        properties = mock.MagicMock(content_length=11, last_modified=file_mtime + timedelta(seconds=10))
+        properties.content_settings.content_md5 = None
+
+        # the blob was uploaded after the file was last modified
+        self.assertTrue(is_file_in_sync_with_blob(f.name, properties, blob_is_source=False))
+        self.assertFalse(is_file_in_sync_with_blob(f.name, properties, blob_is_source=True))
+
+        # the blob was modified after the file was downloaded
+        properties.last_modified = file_mtime - timedelta(seconds=10)
+        self.assertFalse(is_file_in_sync_with_blob(f.name, properties, blob_is_source=False))
+        self.assertTrue(is_file_in_sync_with_blob(f.name, properties, blob_is_source=True))
+
+        # sizes differ
+        properties.content_length = 12
+        self.assertFalse(is_file_in_sync_with_blob(f.name, properties, blob_is_source=True))
+
+        # the content hash takes precedence over the modification time
+        properties.content_length = 11
+        properties.content_settings.content_md5 = get_file_md5(f.name)
+        self.assertTrue(is_file_in_sync_with_blob(f.name, properties, blob_is_source=False, check_md5=True))
+        properties.content_settings.content_md5 = '1B2M2Y8AsgTpgAmY7PhCfg=='
+        self.assertFalse(is_file_in_sync_with_blob(f.name, properties, blob_is_source=True, check_md5=True))
+
+        # missing file or blob
+        self.assertFalse(is_file_in_sync_with_blob(f.name, None, blob_is_source=True))
+        self.assertFalse(is_file_in_sync_with_blob(f.name + '.missing', properties, blob_is_source=True))
+
+    def test_get_file_md5(self):
+        import os
+        import tempfile
+
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(b'hello world')
+        self.addCleanup(os.remove, f.name)
+        self.assertEqual(get_file_md5(f.name), 'XrY7u+Ae7tCTyyK7j1rNww==')
+
+    def test_get_pattern_prefix(self):
+        self.assertEqual(_get_pattern_prefix('logs/2018/07/*'), 'logs/2018/07/')
+        self.assertEqual(_get_pattern_prefix('logs/2018/0?/*.txt'), 'logs/2018/0')
+        self.assertEqual(_get_pattern_prefix('logs/[0-9]*'), 'logs/')
+        self.assertEqual(_get_pattern_prefix('/*'), '/')
+        self.assertIsNone(_get_pattern_prefix('*/file_0'))
+        self.assertIsNone(_get_pattern_prefix(None))
+
+    def test_collect_blobs_streams_listing_with_prefix(self):
+        def _list_blobs(container, prefix=None):
+            for name in ['logs/2018/07/a', 'logs/2018/07/b/c', 'logs/2018/070']:
+                blob = mock.MagicMock()
+                blob.name = name
+                yield blob
+
+        blob_service = mock.MagicMock()
+        blob_service.list_blobs.side_effect = _list_blobs
+
+        blobs = collect_blobs(blob_service, 'container', 'logs/2018/07/*')
+        self.assertFalse(isinstance(blobs, list))
+        self.assertEqual(list(blobs), ['logs/2018/07/a', 'logs/2018/07/b/c'])
+        blob_service.list_blobs.assert_called_once_with('container', prefix='logs/2018/07/')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,6 +10,7 @@ import os
 def collect_blobs(blob_service, container, pattern=None):
     """
     List the blobs in the given blob container, filter the blob by comparing their path to the given pattern.
+    Returns an iterable of the blob names, which is consumed while the listing is still in progress.
     """
     if not blob_service:
         raise ValueError('missing parameter blob_service')
@@ -20,17 +21,80 @@ def collect_blobs(blob_service, container, pattern=None):
     if not _pattern_has_wildcards(pattern):
         return [pattern] if blob_service.exists(container, pattern) else []
 
-    results = []
-    for blob in blob_service.list_blobs(container):
+    return (blob_name for blob_name, _ in _list_blobs_matching(blob_service, container, pattern))
+
+
+def collect_blob_properties(blob_service, container, pattern=None):
+    """
+    List the blobs in the given blob container which match the given pattern. Returns an iterable of tuple
+    (name, properties) with the blob properties returned by the listing.
+    """
+    if not blob_service:
+        raise ValueError('missing parameter blob_service')
+
+    if not container:
+        raise ValueError('missing parameter container')
+
+    if not _pattern_has_wildcards(pattern):
+        from azure.common import AzureMissingResourceHttpError
+        try:
+            return [(pattern, blob_service.get_blob_properties(container, pattern).properties)]
+        except AzureMissingResourceHttpError:
+            return []
+
+    return ((blob_name, blob.properties) for blob_name, blob in _list_blobs_matching(blob_service, container, pattern))
+
+
+def _list_blobs_matching(blob_service, container, pattern):
+    # only the blobs starting with the literal part of the pattern can match it, let the service filter them
+    for blob in blob_service.list_blobs(container, prefix=_get_pattern_prefix(pattern)):
         try:
             blob_name = blob.name.encode('utf-8') if isinstance(blob.name, unicode) else blob.name
         except NameError:
             blob_name = blob.name
 
         if not pattern or _match_path(blob_name, pattern):
-            results.append(blob_name)
+            yield blob_name, blob
 
-    return results
+
+def get_file_md5(file_path):
+    """Compute the base64 encoded MD5 hash of a local file, in the format used by the Content-MD5 property."""
+    import base64
+    import hashlib
+
+    md5 = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(4 * 1024 * 1024), b''):
+            md5.update(chunk)
+    return base64.b64encode(md5.digest()).decode('utf-8')
+
+
+def is_file_in_sync_with_blob(file_path, blob_properties, blob_is_source, check_md5=False):
+    """
+    Check whether a local file holds the same content as a blob, so that transferring it can be skipped.
+    The file and the blob are considered in sync when their sizes match and the destination was modified after the
+    source. When `check_md5` is set and the blob has a Content-MD5, the content hashes are compared instead.
+    """
+    import calendar
+
+    if blob_properties is None:
+        return False
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return False
+    if file_stat.st_size != blob_properties.content_length:
+        return False
+
+    blob_md5 = blob_properties.content_settings.content_md5 if blob_properties.content_settings else None
+    if check_md5 and blob_md5:
+        return get_file_md5(file_path) == blob_md5
+
+    if not blob_properties.last_modified:
+        return False
+    blob_mtime = calendar.timegm(blob_properties.last_modified.utctimetuple())
+    file_mtime = int(file_stat.st_mtime)
+    return file_mtime >= blob_mtime if blob_is_source else blob_mtime >= file_mtime
 
 
 def collect_files(cmd, file_service, share, pattern=None):
@@ -163,10 +227,140 @@ def mkdir_p(path):
             raise
 
 
+def run_batch(operation, items, max_workers=1):
+    """
+    Apply the operation to every item, running up to `max_workers` operations at the same time on a pool of threads.
+    Items are consumed lazily and the results are yielded in the same order as the items. An exception raised by the
+    operation is re-raised when its result is reached.
+    """
+    if not max_workers or max_workers <= 1:
+        for item in items:
+            yield operation(item)
+        return
+
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    # bound the number of items taken from the iterable so that slow or huge listings are not fully materialized
+    max_pending = max_workers * 4
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for item in items:
+            pending.append(executor.submit(operation, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_batch_with_failure_report(operation, items, max_workers=1, action='process', describe=str):
+    """
+    Apply the operation to every item like `run_batch`, but continue with the remaining items when the operation fails
+    for one of them. Each failure is logged as it happens and, once all the items are processed, a CLIError
+    summarizing the failures, and counting the items which succeeded nonetheless, is raised. Returns the list of
+    results of the successful operations otherwise.
+
+    :param str action: the verb used to report a failed item, e.g. 'delete blob'
+    :param describe: a callable returning the name an item is reported by
+    """
+    from knack.log import get_logger
+    from knack.util import CLIError
+    logger = get_logger(__name__)
+
+    def _operation(item):
+        try:
+            return item, True, operation(item)
+        except Exception as ex:  # pylint: disable=broad-except
+            return item, False, ex
+
+    results = []
+    failures = []
+    for item, succeeded, result in run_batch(_operation, items, max_workers):
+        if succeeded:
+            results.append(result)
+        else:
+            logger.warning('Failed to %s %s: %s', action, describe(item), result)
+            failures.append(describe(item))
+
+    logger.info('%s: %d succeeded, %d failed.', action, len(results), len(failures))
+    if failures:
+        # the items which succeeded were processed all the same, e.g. deleted or copied
+        raise CLIError('Failed to {} {}. {} of {} item(s) failed and {} succeeded.'.format(
+            action, ', '.join(failures[:10]) + (', ...' if len(failures) > 10 else ''),
+            len(failures), len(results) + len(failures), len(results)))
+    return results
+
+
+class BatchTransferProgress(object):
+    """
+    Report the aggregate progress and throughput of a batch transfer to the progress controller.
+    The progress is measured in bytes when the total size is known, otherwise in number of items. When the number of
+    items is not known either, e.g. while the source is still being listed, only the running totals are reported.
+    """
+
+    def __init__(self, cli_ctx, total_count=None, total_bytes=None):
+        import timeit
+        self.cli_ctx = cli_ctx
+        self.total_count = total_count
+        self.total_bytes = total_bytes
+        self.count = 0
+        self.bytes = 0
+        self._timer = timeit.default_timer
+        self._start = self._timer()
+
+    @property
+    def elapsed(self):
+        return self._timer() - self._start
+
+    @property
+    def throughput(self):
+        elapsed = self.elapsed
+        return self.bytes / elapsed if elapsed > 0 else 0
+
+    def add(self, size=0):
+        self.count += 1
+        self.bytes += size or 0
+        if self.total_bytes:
+            value, total = self.bytes, self.total_bytes
+        else:
+            value, total = self.count, self.total_count
+
+        if total:
+            message = '{}/{} {}/s'.format(self.count, self.total_count, _format_size(self.throughput))
+            self.cli_ctx.get_progress_controller(det=True).add(message=message, value=min(value, total),
+                                                               total_val=total)
+        else:
+            message = '{} {}/s'.format(self.count, _format_size(self.throughput))
+            self.cli_ctx.get_progress_controller().add(message=message)
+
+    def end(self):
+        from knack.log import get_logger
+        if self.count:
+            self.cli_ctx.get_progress_controller(det=bool(self.total_bytes or self.total_count)).end()
+        get_logger(__name__).info('Transferred %d item(s), %s in %.2f seconds (%s/s).', self.count,
+                                  _format_size(self.bytes), self.elapsed, _format_size(self.throughput))
+
+
+def _format_size(num_bytes):
+    for unit in ['B', 'KiB', 'MiB', 'GiB']:
+        if num_bytes < 1024:
+            return '{:.1f} {}'.format(num_bytes, unit)
+        num_bytes /= 1024.0
+    return '{:.1f} TiB'.format(num_bytes)
+
+
 def _pattern_has_wildcards(p):
     return not p or p.find('*') != -1 or p.find('?') != -1 or p.find('[') != -1
 
 
+def _get_pattern_prefix(p):
+    """Get the literal part of the pattern preceding the first wildcard, or None if there is no such part."""
+    if not p:
+        return None
+    prefix_len = min(i for i in (p.find('*'), p.find('?'), p.find('['), len(p)) if i != -1)
+    return p[:prefix_len] or None
+
+
 def _match_path(path, pattern):
     from fnmatch import fnmatch
     return fnmatch(path, pattern)
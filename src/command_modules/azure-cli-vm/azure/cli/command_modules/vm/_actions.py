@@ -30,43 +30,10 @@ def _get_thread_count():
 
 
 def load_images_thru_services(cli_ctx, publisher, offer, sku, location):
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    all_images = []
-    client = _compute_client_factory(cli_ctx)
+    from ._image_catalog import ImageCatalog
     if location is None:
         location = get_one_of_subscription_locations(cli_ctx)
-
-    def _load_images_from_publisher(publisher):
-        offers = client.virtual_machine_images.list_offers(location, publisher)
-        if offer:
-            offers = [o for o in offers if _matched(offer, o.name)]
-        for o in offers:
-            skus = client.virtual_machine_images.list_skus(location, publisher, o.name)
-            if sku:
-                skus = [s for s in skus if _matched(sku, s.name)]
-            for s in skus:
-                images = client.virtual_machine_images.list(location, publisher, o.name, s.name)
-                for i in images:
-                    all_images.append({
-                        'publisher': publisher,
-                        'offer': o.name,
-                        'sku': s.name,
-                        'version': i.name})
-
-    publishers = client.virtual_machine_images.list_publishers(location)
-    if publisher:
-        publishers = [p for p in publishers if _matched(publisher, p.name)]
-
-    publisher_num = len(publishers)
-    if publisher_num > 1:
-        with ThreadPoolExecutor(max_workers=_get_thread_count()) as executor:
-            tasks = [executor.submit(_load_images_from_publisher, p.name) for p in publishers]
-            for t in as_completed(tasks):
-                t.result()  # don't use the result but expose exceptions from the threads
-    elif publisher_num == 1:
-        _load_images_from_publisher(publishers[0].name)
-
-    return all_images
+    return ImageCatalog(cli_ctx, location, _compute_client_factory(cli_ctx)).list_images(publisher, offer, sku)
 
 
 def load_images_from_aliases_doc(cli_ctx, publisher=None, offer=None, sku=None):
@@ -180,12 +147,5 @@ def _create_image_instance(publisher, offer, sku, version):
 
 
 def _get_latest_image_version(cli_ctx, location, publisher, offer, sku):
-    top_one = _compute_client_factory(cli_ctx).virtual_machine_images.list(location,
-                                                                           publisher,
-                                                                           offer,
-                                                                           sku,
-                                                                           top=1,
-                                                                           orderby='name desc')
-    if not top_one:
-        raise CLIError("Can't resolve the vesion of '{}:{}:{}'".format(publisher, offer, sku))
-    return top_one[0].name
+    from ._image_catalog import ImageCatalog
+    return ImageCatalog(cli_ctx, location, _compute_client_factory(cli_ctx)).get_latest_version(publisher, offer, sku)
@@ -11,12 +11,14 @@ def _compute_client_factory(cli_ctx, **kwargs):
 
 
 def cf_ni(cli_ctx, _):
+    import copy
     from azure.cli.core.profiles import ResourceType
     from azure.cli.core.commands.client_factory import get_mgmt_service_client
     # TODO: Remove hard coded api-version once
     # https://github.com/Azure/azure-rest-api-specs/issues/570
     # is fixed.
-    ni = get_mgmt_service_client(cli_ctx, ResourceType.MGMT_NETWORK).network_interfaces
+    # The network client is shared by the whole command, so only change the api-version of a copy.
+    ni = copy.copy(get_mgmt_service_client(cli_ctx, ResourceType.MGMT_NETWORK).network_interfaces)
     ni.api_version = '2016-03-30'
     return ni
 
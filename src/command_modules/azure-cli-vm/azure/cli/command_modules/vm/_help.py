@@ -1119,6 +1119,8 @@ helps['vm list-skus'] = """
     examples:
         - name: List all SKUs in the West US region.
           text: az vm list-skus -l westus
+        - name: List the sizes of virtual machines in the West US region.
+          text: az vm list-skus -l westus --resource-type virtualMachines
 """
 
 helps['vm open-port'] = """
@@ -0,0 +1,140 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import time
+
+from knack.log import get_logger
+from knack.util import CLIError
+
+logger = get_logger(__name__)
+
+IMAGE_CATALOG_DIR_NAME = 'vmImageCatalog'
+IMAGE_CATALOG_MAX_AGE = 24 * 60 * 60  # seconds
+
+
+class ImageCatalog(object):
+    """ The VM images of a location, stored in the configuration directory.
+
+    The offers of a publisher, and the skus and versions of an offer, are loaded the first time they are listed and
+    refreshed once they are older than IMAGE_CATALOG_MAX_AGE. Listing and filtering the images therefore only goes to
+    the service for the publishers and matching offers which are not in the catalog yet. The file holds:
+
+        publishers: {timestamp, names}
+        offers: {lower case publisher: {timestamp, names}}
+        images: {lower case publisher:offer: {timestamp, skus: {sku: [version]}}}
+        latest: {lower case publisher:offer:sku: {timestamp, version}}
+    """
+
+    def __init__(self, cli_ctx, location, client):
+        from azure.cli.core._session import Session
+        self.location = location
+        self._client = client
+        self._data = Session()
+        catalog_dir = os.path.join(cli_ctx.config.config_dir, IMAGE_CATALOG_DIR_NAME)
+        if not os.path.isdir(catalog_dir):
+            os.makedirs(catalog_dir)
+        self._data.load(os.path.join(catalog_dir, '{}-{}.json'.format(cli_ctx.cloud.name, location).lower()))
+
+    @staticmethod
+    def _is_fresh(entry, now):
+        return entry is not None and now - entry.get('timestamp', 0) < IMAGE_CATALOG_MAX_AGE
+
+    def list_publishers(self):
+        now = time.time()
+        entry = self._data.get('publishers')
+        if not self._is_fresh(entry, now):
+            names = [p.name for p in self._client.virtual_machine_images.list_publishers(self.location)]
+            entry = {'timestamp': now, 'names': names}
+            self._data['publishers'] = entry
+        return entry['names']
+
+    def list_images(self, publisher=None, offer=None, sku=None):
+        """ Returns the images whose publisher, offer and sku contain the given names. """
+        from ._actions import _matched, _create_image_instance
+        publishers = [p for p in self.list_publishers() if _matched(publisher, p)]
+        offers = [(p, o) for p, names in zip(publishers, self._get_offer_names(publishers))
+                  for o in names if _matched(offer, o)]
+        images = self._get_offer_images(offers)
+        all_images = []
+        for p, o in offers:
+            for s, versions in images[_get_offer_key(p, o)]['skus'].items():
+                if _matched(sku, s):
+                    all_images.extend(_create_image_instance(p, o, s, v) for v in versions)
+        return all_images
+
+    def get_latest_version(self, publisher, offer, sku):
+        from distutils.version import LooseVersion  # pylint: disable=no-name-in-module,import-error
+        now = time.time()
+        entry = (self._data.get('images') or {}).get(_get_offer_key(publisher, offer))
+        if self._is_fresh(entry, now):
+            versions = next((v for k, v in entry['skus'].items() if k.lower() == sku.lower()), None)
+            if versions:
+                return max(versions, key=LooseVersion)
+
+        key = ':'.join([publisher, offer, sku]).lower()
+        latest = self._data.get('latest') or {}
+        if not self._is_fresh(latest.get(key), now):
+            top_one = self._client.virtual_machine_images.list(self.location, publisher, offer, sku, top=1,
+                                                               orderby='name desc')
+            if not top_one:
+                raise CLIError("Can't resolve the vesion of '{}:{}:{}'".format(publisher, offer, sku))
+            with self._data.transaction():
+                latest = {k: v for k, v in latest.items() if self._is_fresh(v, now)}
+                latest[key] = {'timestamp': now, 'version': top_one[0].name}
+                self._data['latest'] = latest
+        return latest[key]['version']
+
+    def _get_offer_names(self, publishers):
+        """ Returns the offer names of each publisher, after loading the ones which are missing or expired. """
+        from concurrent.futures import ThreadPoolExecutor
+        from ._actions import _get_thread_count
+
+        now = time.time()
+        entries = self._data.get('offers') or {}
+        stale = [p for p in publishers if not self._is_fresh(entries.get(p.lower()), now)]
+        if stale:
+            client = self._client.virtual_machine_images
+            with ThreadPoolExecutor(max_workers=_get_thread_count()) as executor:
+                loaded = {p.lower(): {'timestamp': now, 'names': [o.name for o in result]} for p, result in zip(
+                    stale, executor.map(lambda p: client.list_offers(self.location, p), stale))}
+            with self._data.transaction():
+                entries = {k: v for k, v in entries.items() if self._is_fresh(v, now)}
+                entries.update(loaded)
+                self._data['offers'] = entries
+        return [entries[p.lower()]['names'] for p in publishers]
+
+    def _get_offer_images(self, offers):
+        """ Returns the images of the catalog, after loading the given offers which are missing or expired. """
+        from concurrent.futures import ThreadPoolExecutor
+        from ._actions import _get_thread_count
+
+        now = time.time()
+        images = self._data.get('images') or {}
+        stale = [(p, o) for p, o in offers if not self._is_fresh(images.get(_get_offer_key(p, o)), now)]
+        if not stale:
+            return images
+        logger.info('Loading the images of %d offers in %s.', len(stale), self.location)
+
+        # Walk skus and versions level by level, so that every request of a level runs concurrently.
+        client = self._client.virtual_machine_images
+        with ThreadPoolExecutor(max_workers=_get_thread_count()) as executor:
+            skus = [(p, o, s.name) for (p, o), result in zip(stale, executor.map(
+                lambda po: client.list_skus(self.location, *po), stale)) for s in result]
+            versions = executor.map(lambda pos: client.list(self.location, *pos), skus)
+
+            loaded = {_get_offer_key(p, o): {'timestamp': now, 'skus': {}} for p, o in stale}
+            for (p, o, s), result in zip(skus, versions):
+                loaded[_get_offer_key(p, o)]['skus'][s] = [i.name for i in result]
+
+        with self._data.transaction():
+            images = {k: v for k, v in images.items() if self._is_fresh(v, now)}
+            images.update(loaded)
+            self._data['images'] = images
+        return images
+
+
+def _get_offer_key(publisher, offer):
+    return '{}:{}'.format(publisher, offer).lower()
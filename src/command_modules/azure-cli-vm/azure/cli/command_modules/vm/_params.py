@@ -224,6 +224,9 @@ def load_arguments(self, _):
     with self.argument_context('vm image show') as c:
         c.argument('skus', options_list=['--sku', '-s'])
 
+    with self.argument_context('vm list-skus') as c:
+        c.argument('resource_type', help='Only list the SKUs of this resource type, e.g. virtualMachines or disks.')
+
     with self.argument_context('vm nic') as c:
         c.argument('vm_name', existing_vm_name, options_list=['--vm-name'], id_part=None)
         c.argument('nics', nargs='+', help='Names or IDs of NICs.', validator=validate_vm_nics)
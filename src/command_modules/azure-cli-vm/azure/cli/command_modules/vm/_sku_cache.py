@@ -0,0 +1,80 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+import os
+import time
+
+SKU_CACHE_DIR_NAME = 'vmSkuCache'
+SKU_CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+_GLOBAL_LOCATION_FILE = 'global'
+
+
+class SkuCache(object):
+    """ The compute resource SKUs of a subscription, stored in the configuration directory.
+
+    The SKUs are retrieved at once, since the service cannot filter them, and stored in one file per location in
+    which they are indexed by lower case resource type, so that looking up the SKUs of a location only reads the
+    SKUs of that location. An index file lists the locations and the time the SKUs were retrieved.
+    """
+
+    def __init__(self, cli_ctx, client):
+        from azure.cli.core.profiles import ResourceType, get_sdk
+        self._client = client
+        self._dir = os.path.join(cli_ctx.config.config_dir, SKU_CACHE_DIR_NAME,
+                                 '{}-{}'.format(cli_ctx.cloud.name, client.config.subscription_id).lower())
+        self._model = get_sdk(cli_ctx, ResourceType.MGMT_COMPUTE, 'ResourceSku', mod='models')
+
+    def _load(self, name):
+        from azure.cli.core._session import Session
+        if not os.path.isdir(self._dir):
+            os.makedirs(self._dir)
+        session = Session()
+        session.load(os.path.join(self._dir, name + '.json'))
+        return session
+
+    def list_skus(self, location=None, resource_type=None):
+        index = self._load('index')
+        if time.time() - index.get('timestamp', 0) >= SKU_CACHE_MAX_AGE:
+            return self._refresh(index, location, resource_type)
+
+        if location:
+            locations = [location.lower()] if location.lower() in index['locations'] else []
+        else:
+            locations = index['locations']
+        result = []
+        for l in locations:
+            for t, skus in self._load(l or _GLOBAL_LOCATION_FILE).items():
+                if resource_type and t != resource_type.lower():
+                    continue
+                # without a location, a SKU of several locations is only listed for the first one
+                result.extend(self._model.deserialize(s) for s in skus
+                              if location or (s.get('locations') or [''])[0].lower() == l)
+        return result
+
+    def _refresh(self, index, location, resource_type):
+        skus = list(self._client.resource_skus.list())
+        by_location = {}
+        for sku in skus:
+            serialized = sku.serialize(keep_readonly=True)
+            for l in set(x.lower() for x in sku.locations or ['']):
+                by_location.setdefault(l, {}).setdefault((sku.resource_type or '').lower(), []).append(serialized)
+
+        for l, skus_by_type in by_location.items():
+            session = self._load(l or _GLOBAL_LOCATION_FILE)
+            with session.transaction():
+                for key in list(session):
+                    del session[key]
+                for t, serialized_skus in skus_by_type.items():
+                    session[t] = serialized_skus
+        # the index is written last, so that it never refers to SKUs which were not stored
+        with index.transaction():
+            index['locations'] = sorted(by_location)
+            index['timestamp'] = time.time()
+
+        if location:
+            skus = [s for s in skus if location.lower() in [x.lower() for x in s.locations or []]]
+        if resource_type:
+            skus = [s for s in skus if (s.resource_type or '').lower() == resource_type.lower()]
+        return skus
@@ -301,7 +301,7 @@ def _validate_location(cmd, namespace, zone_info, size_info):
     if not namespace.location:
         get_default_location_from_resource_group(cmd, namespace)
         if zone_info:
-            sku_infos = list_sku_info(cmd.cli_ctx, namespace.location)
+            sku_infos = list_sku_info(cmd.cli_ctx, namespace.location, 'virtualMachines')
             temp = next((x for x in sku_infos if x.name.lower() == size_info.lower()), None)
             if not temp or not [x for x in (temp.location_info or []) if x.zones]:
                 raise CLIError("{}'s location can't be used to create the VM/VMSS because availablity zone is not yet "
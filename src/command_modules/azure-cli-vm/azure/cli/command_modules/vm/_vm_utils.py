@@ -40,25 +40,11 @@ def read_content_if_is_file(string_or_file):
 
 
 def _resolve_api_version(cli_ctx, provider_namespace, resource_type, parent_path):
+    from azure.cli.core.commands.arm import resolve_api_version
     from azure.cli.core.commands.client_factory import get_mgmt_service_client
     from azure.cli.core.profiles import ResourceType
     client = get_mgmt_service_client(cli_ctx, ResourceType.MGMT_RESOURCE_RESOURCES)
-    provider = client.providers.get(provider_namespace)
-
-    # If available, we will use parent resource's api-version
-    resource_type_str = (parent_path.split('/')[0] if parent_path else resource_type)
-
-    rt = [t for t in provider.resource_types  # pylint: disable=no-member
-          if t.resource_type.lower() == resource_type_str.lower()]
-    if not rt:
-        raise CLIError('Resource type {} not found.'.format(resource_type_str))
-    if len(rt) == 1 and rt[0].api_versions:
-        npv = [v for v in rt[0].api_versions if 'preview' not in v.lower()]
-        return npv[0] if npv else rt[0].api_versions[0]
-    else:
-        raise CLIError(
-            'API version is required and could not be resolved for resource {}'
-            .format(resource_type))
+    return resolve_api_version(cli_ctx, client, provider_namespace, resource_type, parent_path)
 
 
 def log_pprint_template(template):
@@ -113,17 +99,10 @@ def get_key_vault_base_url(cli_ctx, vault_name):
     return 'https://{}{}'.format(vault_name, suffix)
 
 
-def list_sku_info(cli_ctx, location=None):
+def list_sku_info(cli_ctx, location=None, resource_type=None):
     from ._client_factory import _compute_client_factory
-
-    def _match_location(l, locations):
-        return next((x for x in locations if x.lower() == l.lower()), None)
-
-    client = _compute_client_factory(cli_ctx)
-    result = client.resource_skus.list()
-    if location:
-        result = [r for r in result if _match_location(location, r.locations)]
-    return result
+    from ._sku_cache import SkuCache
+    return SkuCache(cli_ctx, _compute_client_factory(cli_ctx)).list_skus(location, resource_type)
 
 
 def normalize_disk_info(image_data_disks=None, data_disk_sizes_gb=None, attach_data_disks=None, storage_sku=None,
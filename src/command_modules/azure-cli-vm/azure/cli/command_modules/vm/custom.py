@@ -688,41 +688,102 @@ def get_vm_details(cmd, resource_group_name, vm_name):
     result = get_instance_view(cmd, resource_group_name, vm_name)
     network_client = get_mgmt_service_client(
         cmd.cli_ctx, ResourceType.MGMT_NETWORK, api_version=get_target_network_api(cmd.cli_ctx))
+
+    def _get_nic(nic_id):
+        nic_parts = parse_resource_id(nic_id)
+        return network_client.network_interfaces.get(nic_parts['resource_group'], nic_parts['name'])
+
+    def _get_public_ip(public_ip_id):
+        res = parse_resource_id(public_ip_id)
+        return network_client.public_ip_addresses.get(res['resource_group'], res['name'])
+
+    return _set_vm_details(result, _get_nic, _get_public_ip)
+
+
+def _set_vm_details(vm, get_nic, get_public_ip):
+    """ Adds the power state and the network addresses to a VM retrieved with its instance view. """
     public_ips = []
     fqdns = []
     private_ips = []
     mac_addresses = []
     # pylint: disable=line-too-long,no-member
-    for nic_ref in result.network_profile.network_interfaces:
-        nic_parts = parse_resource_id(nic_ref.id)
-        nic = network_client.network_interfaces.get(nic_parts['resource_group'], nic_parts['name'])
+    for nic_ref in vm.network_profile.network_interfaces:
+        nic = get_nic(nic_ref.id)
         if nic.mac_address:
             mac_addresses.append(nic.mac_address)
         for ip_configuration in nic.ip_configurations:
             if ip_configuration.private_ip_address:
                 private_ips.append(ip_configuration.private_ip_address)
             if ip_configuration.public_ip_address:
-                res = parse_resource_id(ip_configuration.public_ip_address.id)
-                public_ip_info = network_client.public_ip_addresses.get(res['resource_group'],
-                                                                        res['name'])
+                public_ip_info = get_public_ip(ip_configuration.public_ip_address.id)
                 if public_ip_info.ip_address:
                     public_ips.append(public_ip_info.ip_address)
                 if public_ip_info.dns_settings:
                     fqdns.append(public_ip_info.dns_settings.fqdn)
 
-    setattr(result, 'power_state',
-            ','.join([s.display_status for s in result.instance_view.statuses if s.code.startswith('PowerState/')]))
-    setattr(result, 'public_ips', ','.join(public_ips))
-    setattr(result, 'fqdns', ','.join(fqdns))
-    setattr(result, 'private_ips', ','.join(private_ips))
-    setattr(result, 'mac_addresses', ','.join(mac_addresses))
-    del result.instance_view  # we don't need other instance_view info as people won't care
-    return result
+    setattr(vm, 'power_state',
+            ','.join([s.display_status for s in vm.instance_view.statuses if s.code.startswith('PowerState/')]))
+    setattr(vm, 'public_ips', ','.join(public_ips))
+    setattr(vm, 'fqdns', ','.join(fqdns))
+    setattr(vm, 'private_ips', ','.join(private_ips))
+    setattr(vm, 'mac_addresses', ','.join(mac_addresses))
+    del vm.instance_view  # we don't need other instance_view info as people won't care
+    return vm
 
 
-def list_skus(cmd, location=None):
+def _list_vm_details(cmd, vm_list, resource_group_name=None):
+    """ Gets the details of many VMs: the instance views are retrieved concurrently, and unless there are only a few
+    VMs, the NICs and public IPs of the resource group, or else of the subscription, are listed once instead of being
+    retrieved VM by VM. """
+    from concurrent.futures import ThreadPoolExecutor
+    from msrestazure.tools import parse_resource_id
+    from azure.cli.command_modules.vm._actions import _get_thread_count
+    from azure.cli.command_modules.vm._vm_utils import get_target_network_api
+
+    vm_list = list(vm_list)
+    if not vm_list:
+        return []
+
+    network_client = get_mgmt_service_client(
+        cmd.cli_ctx, ResourceType.MGMT_NETWORK, api_version=get_target_network_api(cmd.cli_ctx))
+    nics = {}
+    public_ips = {}
+    thread_count = _get_thread_count()
+    if len(vm_list) > thread_count:
+        if resource_group_name:
+            nic_list = network_client.network_interfaces.list(resource_group_name)
+            public_ip_list = network_client.public_ip_addresses.list(resource_group_name)
+        else:
+            nic_list = network_client.network_interfaces.list_all()
+            public_ip_list = network_client.public_ip_addresses.list_all()
+        nics = {nic.id.lower(): nic for nic in nic_list}
+        public_ips = {pip.id.lower(): pip for pip in public_ip_list}
+
+    def _get_nic(nic_id):
+        nic = nics.get(nic_id.lower())
+        if nic is None:
+            # not listed: in another resource group, created meanwhile, or few VMs
+            nic_parts = parse_resource_id(nic_id)
+            nic = network_client.network_interfaces.get(nic_parts['resource_group'], nic_parts['name'])
+        return nic
+
+    def _get_public_ip(public_ip_id):
+        public_ip = public_ips.get(public_ip_id.lower())
+        if public_ip is None:
+            res = parse_resource_id(public_ip_id)
+            public_ip = network_client.public_ip_addresses.get(res['resource_group'], res['name'])
+        return public_ip
+
+    def _get_vm_details(vm):
+        return _set_vm_details(get_instance_view(cmd, _parse_rg_name(vm.id)[0], vm.name), _get_nic, _get_public_ip)
+
+    with ThreadPoolExecutor(max_workers=thread_count) as executor:
+        return list(executor.map(_get_vm_details, vm_list))
+
+
+def list_skus(cmd, location=None, resource_type=None):
     from ._vm_utils import list_sku_info
-    return list_sku_info(cmd.cli_ctx, location)
+    return list_sku_info(cmd.cli_ctx, location, resource_type)
 
 
 def list_vm(cmd, resource_group_name=None, show_details=False):
@@ -730,7 +791,7 @@ def list_vm(cmd, resource_group_name=None, show_details=False):
     vm_list = ccf.virtual_machines.list(resource_group_name=resource_group_name) \
         if resource_group_name else ccf.virtual_machines.list_all()
     if show_details:
-        return [get_vm_details(cmd, _parse_rg_name(v.id)[0], v.name) for v in vm_list]
+        return _list_vm_details(cmd, vm_list, resource_group_name)
 
     return list(vm_list)
 
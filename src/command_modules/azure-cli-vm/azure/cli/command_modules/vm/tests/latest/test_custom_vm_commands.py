@@ -16,7 +16,7 @@ from azure.cli.command_modules.vm.custom import (enable_boot_diagnostics, disabl
                                                  _get_extension_instance_name,
                                                  get_boot_log)
 from azure.cli.command_modules.vm.custom import \
-    (attach_unmanaged_data_disk, detach_data_disk, get_vmss_instance_view)
+    (attach_unmanaged_data_disk, detach_data_disk, get_vmss_instance_view, list_vm)
 
 from azure.cli.core import AzCommandsLoader
 from azure.cli.core.commands import AzCliCommand
@@ -238,6 +238,80 @@ class TestVmCustom(unittest.TestCase):
         vm_client.virtual_machine_scale_set_vms.list.assert_called_once_with('rg1', 'vmss1', expand='instanceView',
                                                                              select='instanceView')
 
+    def _mock_vms_with_details(self, compute_client, network_client, count):
+        vm_id = '/subscriptions/sub1/resourceGroups/RG1/providers/Microsoft.Compute/virtualMachines/vm{}'
+        nic_id = '/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Network/networkInterfaces/nic{}'
+        pip_id = '/subscriptions/sub1/resourceGroups/rg1/providers/Microsoft.Network/publicIPAddresses/pip{}'
+
+        def _get_vm(resource_group_name, vm_name, expand=None):
+            self.assertEqual((resource_group_name, expand), ('RG1', 'instanceView'))
+            index = vm_name[2:]
+            vm = mock.MagicMock(id=vm_id.format(index))
+            vm.network_profile.network_interfaces = [mock.MagicMock(id=nic_id.format(index).upper())]
+            vm.instance_view.statuses = [InstanceViewStatus(code='PowerState/running', display_status='VM running')]
+            return vm
+
+        vms = [mock.MagicMock(id=vm_id.format(i)) for i in range(count)]
+        for i, vm in enumerate(vms):
+            vm.name = 'vm{}'.format(i)
+        compute_client.virtual_machines.list.return_value = iter(vms)
+        compute_client.virtual_machines.get.side_effect = _get_vm
+
+        nics = []
+        for i in range(count):
+            ip_configuration = mock.MagicMock(private_ip_address='10.0.0.{}'.format(i))
+            ip_configuration.public_ip_address.id = pip_id.format(i)
+            nics.append(mock.MagicMock(id=nic_id.format(i), mac_address='mac{}'.format(i),
+                                       ip_configurations=[ip_configuration]))
+        public_ips = [mock.MagicMock(id=pip_id.format(i), ip_address='1.1.1.{}'.format(i), dns_settings=None)
+                      for i in range(count)]
+        network_client.network_interfaces.list.return_value = iter(nics)
+        network_client.network_interfaces.get.side_effect = lambda _, name: nics[int(name[3:])]
+        network_client.public_ip_addresses.list.return_value = iter(public_ips)
+        network_client.public_ip_addresses.get.side_effect = lambda _, name: public_ips[int(name[3:])]
+        return [('VM running', '10.0.0.{}'.format(i), '1.1.1.{}'.format(i), 'mac{}'.format(i)) for i in range(count)]
+
+    @mock.patch('azure.cli.command_modules.vm.custom.get_mgmt_service_client', autospec=True)
+    @mock.patch('azure.cli.command_modules.vm.custom._compute_client_factory', autospec=True)
+    def test_list_vm_show_details(self, mock_compute_client_factory, mock_network_client_factory):
+        compute_client = mock_compute_client_factory.return_value
+        network_client = mock_network_client_factory.return_value
+        expected = self._mock_vms_with_details(compute_client, network_client, 8)
+
+        # execute
+        result = list_vm(_get_test_cmd(), 'rg1', show_details=True)
+
+        # assert
+        self.assertEqual([(vm.power_state, vm.private_ips, vm.public_ips, vm.mac_addresses) for vm in result],
+                         expected)
+        self.assertEqual(compute_client.virtual_machines.get.call_count, 8)
+        # the NICs and public IPs of the resource group are listed once rather than retrieved one by one
+        network_client.network_interfaces.list.assert_called_once_with('rg1')
+        network_client.public_ip_addresses.list.assert_called_once_with('rg1')
+        self.assertFalse(network_client.network_interfaces.list_all.called)
+        self.assertFalse(network_client.public_ip_addresses.list_all.called)
+        self.assertFalse(network_client.network_interfaces.get.called)
+        self.assertFalse(network_client.public_ip_addresses.get.called)
+
+    @mock.patch('azure.cli.command_modules.vm.custom.get_mgmt_service_client', autospec=True)
+    @mock.patch('azure.cli.command_modules.vm.custom._compute_client_factory', autospec=True)
+    def test_list_few_vms_show_details(self, mock_compute_client_factory, mock_network_client_factory):
+        compute_client = mock_compute_client_factory.return_value
+        network_client = mock_network_client_factory.return_value
+        expected = self._mock_vms_with_details(compute_client, network_client, 2)
+
+        # execute
+        result = list_vm(_get_test_cmd(), 'rg1', show_details=True)
+
+        # assert
+        self.assertEqual([(vm.power_state, vm.private_ips, vm.public_ips, vm.mac_addresses) for vm in result],
+                         expected)
+        # with few VMs, their NICs and public IPs are retrieved rather than listed
+        self.assertEqual(network_client.network_interfaces.get.call_count, 2)
+        self.assertEqual(network_client.public_ip_addresses.get.call_count, 2)
+        self.assertFalse(network_client.network_interfaces.list.called)
+        self.assertFalse(network_client.public_ip_addresses.list.called)
+
     # pylint: disable=line-too-long
     @mock.patch('azure.cli.command_modules.vm.disk_encryption._compute_client_factory', autospec=True)
     @mock.patch('azure.cli.command_modules.vm.disk_encryption._get_keyvault_key_url', autospec=True)
@@ -406,5 +406,61 @@ class TestBigVMSSDefaults(unittest.TestCase):
         self.assertRaises(CLIError, _validate_vmss_create_load_balancer_or_app_gateway, cmd, ns)
 
 
+class _FakeSku(object):
+    def __init__(self, name, resource_type, locations):
+        self.name = name
+        self.resource_type = resource_type
+        self.locations = locations
+
+    def serialize(self, keep_readonly=False):
+        return {'name': self.name, 'resourceType': self.resource_type, 'locations': self.locations}
+
+    @classmethod
+    def deserialize(cls, data):
+        return cls(data['name'], data['resourceType'], data['locations'])
+
+
+class TestVMSkuCache(unittest.TestCase):
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.cli_ctx = mock.MagicMock()
+        self.cli_ctx.config.config_dir = self.temp_dir
+        self.cli_ctx.cloud.name = 'AzureCloud'
+
+    @mock.patch('azure.cli.core.profiles.get_sdk', autospec=True)
+    def test_sku_cache_indexes_skus_by_location_and_type(self, get_sdk_mock):
+        from azure.cli.command_modules.vm import _sku_cache
+        get_sdk_mock.return_value = _FakeSku
+        client = mock.MagicMock()
+        client.config.subscription_id = 'sub1'
+        client.resource_skus.list.return_value = [_FakeSku('Standard_DS1_v2', 'virtualMachines', ['westus']),
+                                                  _FakeSku('Premium_LRS', 'disks', ['westus']),
+                                                  _FakeSku('Standard_DS1_v2', 'virtualMachines', ['EastUS']),
+                                                  _FakeSku('Aligned', 'availabilitySets', ['eastus', 'westus'])]
+
+        def _list(location=None, resource_type=None):
+            skus = _sku_cache.SkuCache(self.cli_ctx, client).list_skus(location, resource_type)
+            return sorted((s.name, s.resource_type, s.locations[0]) for s in skus)
+
+        # the first lookup retrieves the SKUs, the others are answered from the cache
+        for _ in range(2):
+            self.assertEqual(_list('WestUS', 'virtualMachines'), [('Standard_DS1_v2', 'virtualMachines', 'westus')])
+            self.assertEqual(len(_list('westus')), 3)
+            self.assertEqual(len(_list()), 4)
+            self.assertEqual(_list('northeurope'), [])
+        client.resource_skus.list.assert_called_once_with()
+
+        # other subscriptions have their own cache, and expired SKUs are retrieved again
+        client.config.subscription_id = 'sub2'
+        _list()
+        with mock.patch.object(_sku_cache, 'SKU_CACHE_MAX_AGE', 0):
+            _list()
+        self.assertEqual(client.resource_skus.list.call_count, 3)
+
+
 if __name__ == '__main__':
     unittest.main()
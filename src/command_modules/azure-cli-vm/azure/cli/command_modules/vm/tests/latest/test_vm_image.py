@@ -70,5 +70,93 @@ class TestVMImage(unittest.TestCase):
             load_images_from_aliases_doc(cli_ctx)
 
 
+class TestImageCatalog(unittest.TestCase):
+
+    def setUp(self):
+        import shutil
+        import tempfile
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.cli_ctx = mock.MagicMock()
+        self.cli_ctx.config.config_dir = self.temp_dir
+        self.cli_ctx.cloud.name = 'AzureCloud'
+
+    @staticmethod
+    def _named(*names):
+        result = []
+        for name in names:
+            item = mock.MagicMock()
+            item.name = name
+            result.append(item)
+        return result
+
+    def _get_client(self):
+        client = mock.MagicMock()
+        images = client.virtual_machine_images
+        images.list_publishers.return_value = self._named('Canonical', 'OpenLogic')
+        offers = {'Canonical': ['UbuntuServer'], 'OpenLogic': ['CentOS']}
+        images.list_offers.side_effect = lambda _, p: self._named(*offers[p])
+        images.list_skus.side_effect = lambda _, p, o: self._named('16.04-LTS', '18.04-LTS') if o == 'UbuntuServer' \
+            else self._named('7.5')
+        images.list.side_effect = lambda _, p, o, s, **kwargs: self._named('{}.0.9'.format(s), '{}.0.10'.format(s))
+        return client
+
+    def test_image_catalog_lists_images_locally(self):
+        from azure.cli.command_modules.vm._image_catalog import ImageCatalog
+        client = self._get_client()
+
+        images = ImageCatalog(self.cli_ctx, 'westus', client).list_images('canonical', sku='18.04')
+        self.assertEqual([i['version'] for i in images], ['18.04-LTS.0.9', '18.04-LTS.0.10'])
+        self.assertEqual(images[0], {'publisher': 'Canonical', 'offer': 'UbuntuServer', 'sku': '18.04-LTS',
+                                     'version': '18.04-LTS.0.9'})
+        # only the matching publisher was loaded
+        self.assertEqual(client.virtual_machine_images.list_offers.call_count, 1)
+
+        # another process finds the images in the catalog, and only loads the missing publisher
+        catalog = ImageCatalog(self.cli_ctx, 'westus', client)
+        self.assertEqual(len(catalog.list_images()), 6)
+        self.assertEqual(client.virtual_machine_images.list_offers.call_count, 2)
+        self.assertEqual(catalog.get_latest_version('canonical', 'ubuntuserver', '16.04-lts'), '16.04-LTS.0.10')
+        self.assertEqual(client.virtual_machine_images.list_publishers.call_count, 1)
+        self.assertEqual(client.virtual_machine_images.list.call_count, 3)
+
+    def test_image_catalog_only_loads_matching_offers(self):
+        from azure.cli.command_modules.vm._image_catalog import ImageCatalog
+        client = self._get_client()
+        client.virtual_machine_images.list_offers.side_effect = lambda _, p: self._named('UbuntuServer',
+                                                                                         'Ubuntu_Core')
+
+        catalog = ImageCatalog(self.cli_ctx, 'westus', client)
+        self.assertEqual(len(catalog.list_images('Canonical', offer='UbuntuServer')), 4)
+        self.assertEqual([c[0][2] for c in client.virtual_machine_images.list_skus.call_args_list], ['UbuntuServer'])
+
+        # the offers which were not loaded yet are loaded for an unfiltered listing
+        self.assertEqual(len(catalog.list_images('Canonical')), 6)
+        self.assertEqual([c[0][2] for c in client.virtual_machine_images.list_skus.call_args_list],
+                         ['UbuntuServer', 'Ubuntu_Core'])
+        self.assertEqual(client.virtual_machine_images.list_offers.call_count, 1)
+
+    def test_image_catalog_latest_version(self):
+        from azure.cli.command_modules.vm import _image_catalog
+        client = self._get_client()
+        client.virtual_machine_images.list.side_effect = None
+        client.virtual_machine_images.list.return_value = self._named('1.0.1')
+
+        catalog = _image_catalog.ImageCatalog(self.cli_ctx, 'westus', client)
+        self.assertEqual(catalog.get_latest_version('Canonical', 'UbuntuServer', '18.04-LTS'), '1.0.1')
+        self.assertEqual(catalog.get_latest_version('Canonical', 'UbuntuServer', '18.04-LTS'), '1.0.1')
+        client.virtual_machine_images.list.assert_called_once_with('westus', 'Canonical', 'UbuntuServer',
+                                                                   '18.04-LTS', top=1, orderby='name desc')
+
+        # expired entries are retrieved again
+        with mock.patch.object(_image_catalog, 'IMAGE_CATALOG_MAX_AGE', 0):
+            catalog.get_latest_version('Canonical', 'UbuntuServer', '18.04-LTS')
+        self.assertEqual(client.virtual_machine_images.list.call_count, 2)
+
+        client.virtual_machine_images.list.return_value = []
+        with self.assertRaises(CLIError):
+            catalog.get_latest_version('Canonical', 'UbuntuServer', '19.04')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -10,6 +10,7 @@ import automation.verify.verify_packages
 import automation.verify.verify_commands
 import automation.verify.verify_dependencies
 import automation.verify.verify_module_load_times
+import automation.verify.verify_startup_perf
 import automation.verify.verify_load_all
 
 
@@ -65,4 +66,5 @@ def init_args(root):
     automation.verify.verify_commands.init(sub_parser)
     automation.verify.verify_dependencies.init(sub_parser)
     automation.verify.verify_module_load_times.init(sub_parser)
+    automation.verify.verify_startup_perf.init(sub_parser)
     automation.verify.verify_load_all.init(sub_parser)
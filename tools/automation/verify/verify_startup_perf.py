@@ -0,0 +1,134 @@
+# --------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for license information.
+# --------------------------------------------------------------------------------------------
+
+from __future__ import print_function
+
+from collections import OrderedDict
+import json
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+
+
+PROFILE_ENV_NAME = 'AZURE_CLI_PROFILE_STARTUP'
+NUM_RUNS = 5
+DEFAULT_TOLERANCE = 0.25
+# differences below this many milliseconds are noise
+MIN_REGRESSION = 10
+TOTAL = 'total'
+# commands which complete without reaching the service
+DEFAULT_COMMANDS = [
+    '-h',
+    'vm -h',
+    'vm create -h',
+    'network vnet create -h',
+    'storage account create -h',
+    'cloud list',
+    'cloud show'
+]
+
+
+def init(root):
+    parser = root.add_parser('startup-perf', help='Verify that the startup phases of commands do not regress.')
+    parser.add_argument('--command', dest='commands', action='append',
+                        help="A command to benchmark, without the leading az, e.g. --command='vm create -h'. Can be "
+                             "repeated. Defaults to a set of commands which run offline.")
+    parser.add_argument('--runs', type=int, default=NUM_RUNS, help='The number of timed runs of each command.')
+    parser.add_argument('--baseline', help='A file written by --save-baseline to compare the timings to.')
+    parser.add_argument('--save-baseline', help='Write the timings to this file.')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='The fraction by which a phase may be slower than the baseline.')
+    parser.set_defaults(func=run_verifications)
+
+
+def median(data):
+    data = sorted(data)
+    n = len(data)
+    if n < 1:
+        raise ValueError('len < 1')
+    return data[n // 2] if n % 2 else (data[n // 2 - 1] + data[n // 2]) / 2.0
+
+
+def profile_command(command):
+    """ Runs the command once and returns the milliseconds spent in each phase, including the total. """
+    fd, report_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        env = dict(os.environ)
+        env[PROFILE_ENV_NAME] = report_path
+        with open(os.devnull, 'w') as devnull:
+            exit_code = subprocess.call([sys.executable, '-m', 'azure.cli'] + shlex.split(command), env=env,
+                                        stdout=devnull, stderr=devnull)
+        if exit_code:
+            print("WARNING: 'az {}' exited with {}.".format(command, exit_code), file=sys.stderr)
+        with open(report_path) as f:
+            report = json.load(f)
+    finally:
+        os.remove(report_path)
+
+    timings = OrderedDict([(TOTAL, report['total'] * 1000)])
+    for phase in report['phases']:
+        if phase['duration'] is not None:
+            timings[phase['name']] = timings.get(phase['name'], 0) + phase['duration'] * 1000
+    return timings
+
+
+def benchmark_command(command, runs):
+    """ Returns the median milliseconds spent in each phase of the command. """
+    # Ignore the first run since it can be longer due to *.pyc file compilation
+    profile_command(command)
+    values = OrderedDict()
+    for _ in range(runs):
+        for phase, value in profile_command(command).items():
+            values.setdefault(phase, []).append(value)
+    return OrderedDict((phase, median(val)) for phase, val in values.items())
+
+
+def find_regressions(results, baseline, tolerance):
+    regressions = []
+    for command, timings in results.items():
+        for phase, value in timings.items():
+            base_value = baseline.get(command, {}).get(phase)
+            if base_value is not None and value - base_value > max(base_value * tolerance, MIN_REGRESSION):
+                regressions.append((command, phase, base_value, value))
+    return regressions
+
+
+def print_values(results, baseline):
+    print('{:<60} {:>12} {:>12}'.format('Phase', 'Median (ms)', 'Baseline'))
+    for command, timings in results.items():
+        print("\naz {}".format(command))
+        for phase, value in timings.items():
+            base_value = baseline.get(command, {}).get(phase)
+            print('  {:<58} {:>12.0f} {:>12}'.format(
+                phase, value, '{:.0f}'.format(base_value) if base_value is not None else '-'))
+
+
+def run_verifications(args):
+    results = OrderedDict()
+    for command in args.commands or DEFAULT_COMMANDS:
+        results[command] = benchmark_command(command, args.runs)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_values(results, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print('\nSaved the timings to {}'.format(args.save_baseline))
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print('\nFAILED: these phases are slower than the baseline')
+        for command, phase, base_value, value in regressions:
+            print("  az {}: {} took {:.0f} ms instead of {:.0f} ms".format(command, phase, value, base_value))
+        sys.exit(1)
+    print('\nPASSED')
+    sys.exit(0)